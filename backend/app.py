@@ -1,17 +1,29 @@
 # app.py 전체 코드
 from flask import (
     Blueprint, request, jsonify, render_template,
-    session, redirect, url_for
+    session, redirect, url_for, Response, stream_with_context, g
 )
 from flask_cors import CORS
-import re
 import os
+import json
+import time
 from functools import wraps
-from backend.youtube_api import get_comments  # 👈 이 줄이 반드시 있어야 합니다!
 
 # 커스텀 로직 임포트
-from backend.youtube_api import get_comments
-from backend.database import save_video_with_comments, get_dashboard_stats
+from backend.youtube_api import get_comments, iter_comment_pages, get_youtube_usage, extract_video_id
+from backend.youtube_quota import quota, QuotaExceeded
+from backend.database import (
+    get_pool_stats, add_watch, remove_watch, get_watchlist,
+    get_blacklist_page, get_risky_authors, get_author_profile, rebuild_author_profiles
+)
+from backend.blacklist import blacklist
+from backend import dashboard
+from backend.scan_jobs import scan_manager, ScanQueueFull
+from backend.bulk_scan import start_bulk_scan, get_bulk_scan
+from backend.watch_scheduler import watch_scheduler, WATCH_DEFAULT_INTERVAL
+from backend.openai_service import rule_store, reload_rules
+from backend.local_model import reload_local_model, LOCAL_MODEL_PATH
+from backend import metrics
 
 api = Blueprint("api", __name__)
 CORS(api)
@@ -30,6 +42,38 @@ def admin_required(func):
         return func(*args, **kwargs)
     return wrapper
 
+# ==============================
+# ⏱️ 요청별 처리 시간 (지표 + 로그)
+# ==============================
+# 스트리밍 응답은 첫 응답을 만들 때까지만 잼
+REQUEST_LOG = os.getenv("REQUEST_LOG", "1") == "1"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")      # 설정하면 /metrics는 Bearer 토큰 또는 관리자 세션 필요
+
+@api.before_request
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+@api.after_request
+def _record_timing(response):
+    started = g.pop("request_started", None)
+    if started is None or request.endpoint == "api.metrics_endpoint":
+        return response
+    elapsed = time.perf_counter() - started
+    endpoint = request.url_rule.rule if request.url_rule else "(unmatched)"
+    metrics.HTTP_SECONDS.observe(elapsed, method=request.method, endpoint=endpoint,
+                                 status=response.status_code)
+    if REQUEST_LOG:
+        print(f"⏱️ {request.method} {request.path} {response.status_code} {elapsed * 1000:.1f}ms")
+    return response
+
+@api.route("/metrics")
+def metrics_endpoint():
+    # Prometheus 수집용 (텍스트 형식)
+    if METRICS_TOKEN and not session.get("is_admin") \
+            and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+        return jsonify({"error": "인증이 필요합니다."}), 401
+    return Response(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
 @api.route("/")
 def public_monitor():
     return render_template("public_monitor.html")
@@ -39,10 +83,38 @@ def public_monitor():
 def admin_dashboard():
     return render_template("admin_dashboard.html")
 
+def _blacklist_item(row: dict) -> dict:
+    """author_profiles 행 → 블랙리스트 화면 / API 형식"""
+    def fmt(value):
+        return value.strftime("%Y-%m-%d %H:%M") if value else None
+    return {
+        "authorId": row["user_id"],
+        "authorName": row["username"] or row["user_id"],
+        "reason": row["blacklist_reason"] or "위험 댓글 반복",
+        "addedAt": fmt(row["blacklisted_at"]),
+        "total": row["total_count"],
+        "danger": row["danger_count"],
+        "spam": row["spam_count"],
+        "videos": row["video_count"],
+        "riskScore": round(row["risk_score"] or 0, 3),
+        "lastOffenseAt": fmt(row["last_offense_at"]),
+        "blacklisted": bool(row["blacklisted"])
+    }
+
+def _page_response(page: dict) -> dict:
+    return {**page, "items": [_blacklist_item(row) for row in page["items"]]}
+
 @api.route("/admin/blacklist")
 @admin_required
 def admin_blacklist():
-    return render_template("admin_blacklist.html")
+    # ?page=N: 차단 목록 페이지, ?cpage=N: 차단 후보(위험도 순) 페이지
+    blacklist_page = _page_response(get_blacklist_page(request.args.get("page", 1, type=int)))
+    candidate_page = _page_response(get_risky_authors(request.args.get("cpage", 1, type=int)))
+    return render_template(
+        "admin_blacklist.html",
+        blacklist_data=blacklist_page["items"], blacklist_page=blacklist_page,
+        candidate_data=candidate_page["items"], candidate_page=candidate_page
+    )
 
 @api.route("/admin/login", methods=["GET", "POST"])
 def admin_login():
@@ -58,12 +130,51 @@ def admin_login():
 
     return render_template("admin_login.html", error="관리자 정보가 올바르지 않습니다.")
 
-def extract_video_id(youtube_url):
-    patterns = [r"v=([^&]+)", r"youtu\.be/([^?]+)", r"shorts/([^?]+)"]
-    for pattern in patterns:
-        match = re.search(pattern, youtube_url)
-        if match: return match.group(1)
-    return None
+@api.route("/api/admin/db-pool")
+@admin_required
+def admin_db_pool():
+    # DB 커넥션 풀 상태 (크기 / 대기 / 타임아웃 지표)
+    return jsonify(get_pool_stats())
+
+@api.route("/api/admin/youtube-quota")
+@admin_required
+def admin_youtube_quota():
+    # YouTube API 할당량 사용량 (메서드별) / 응답 캐시 적중 지표
+    return jsonify(get_youtube_usage())
+
+@api.route("/api/admin/rules", methods=["GET"])
+@admin_required
+def admin_rules():
+    # 현재 로컬 필터 규칙 버전 / 규칙 수 / 마지막 로드 시각
+    return jsonify(rule_store.stats())
+
+@api.route("/api/admin/rules/reload", methods=["POST"])
+@admin_required
+def admin_rules_reload():
+    # 규칙 파일을 즉시 다시 읽어 교체 (실패하면 기존 규칙 유지)
+    try:
+        reload_rules()
+    except Exception as e:
+        return jsonify({"error": f"규칙 로드 실패: {e}", **rule_store.stats()}), 400
+    return jsonify(rule_store.stats())
+
+@api.route("/api/admin/local-model/reload", methods=["POST"])
+@admin_required
+def admin_local_model_reload():
+    # 재학습(python -m backend.local_model train)으로 바뀐 모델 파일을 서버 재시작 없이 다시 읽음
+    model = reload_local_model()
+    if model is None:
+        return jsonify({"loaded": False, "path": LOCAL_MODEL_PATH}), 400
+    return jsonify({"loaded": True, "path": LOCAL_MODEL_PATH, "version": model.version})
+
+# 한 번에 요청할 수 있는 최대 댓글 수
+MAX_SCAN_RESULTS = 1000
+
+def _replies_flag(value):
+    """replies 파라미터 → True / False (없으면 None: 서버 기본값 YT_INCLUDE_REPLIES)"""
+    if value is None or value == "":
+        return None
+    return str(value).lower() in ("1", "true", "yes", "on")
 
 # API 엔드포인트 유지
 @api.route("/api/comments", methods=["GET"])
@@ -75,22 +186,271 @@ def comments():
         return jsonify({"error": "유효한 YouTube URL이 아닙니다."}), 400
 
     try:
-        # 1. 유튜브 API를 통해 댓글 및 영상 정보 가져오기
-        result_data = get_comments(video_id) 
-        
-        # 2. DB 저장 시도 (데이터 구조 확인 필수)
-        # result_data 안에 'video_info'와 'comments' 키가 정확히 있어야 합니다.
-        if "video_info" in result_data and "comments" in result_data:
-            try:
-                # database.py의 저장 함수 호출
-                db_res = save_video_with_comments(result_data['video_info'], result_data['comments'])
-                print(f"✅ DB 저장 성공: {db_res}")
-            except Exception as db_err:
-                print(f"❌ DB 저장 중 상세 에러: {db_err}")
-                # DB 저장이 실패해도 사용자에게 댓글은 보여주기 위해 pass 하거나 에러 기록
-        
+        # 유튜브 댓글 수집 + 분석
+        # (DB 저장은 get_comments 안에서 백그라운드 큐로 넘어가므로 여기서 다시 저장하지 않음)
+        result_data = get_comments(video_id, include_replies=_replies_flag(request.args.get("replies")))
         return jsonify(result_data)
 
+    except QuotaExceeded as e:
+        return jsonify({"error": str(e)}), 429
     except Exception as e:
         print(f"❌ API 호출 에러: {e}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+# ==============================
+# 스트리밍 API (NDJSON: 한 줄에 JSON 하나)
+# ==============================
+@api.route("/api/comments/stream", methods=["GET"])
+def comments_stream():
+    youtube_url = request.args.get("url") or ""
+    video_id = extract_video_id(youtube_url)
+
+    if not video_id:
+        return jsonify({"error": "유효한 YouTube URL이 아닙니다."}), 400
+
+    max_results = min(request.args.get("max_results", 50, type=int), MAX_SCAN_RESULTS)
+    include_replies = _replies_flag(request.args.get("replies"))
+
+    def generate():
+        # 줄 순서: video_info → comments(페이지마다) → done / error
+        total = danger = 0
+        try:
+            for event in iter_comment_pages(video_id, max_results, include_replies=include_replies):
+                if event["type"] == "comments":
+                    total += len(event["comments"])
+                    danger += sum(1 for c in event["comments"] if c["category"] == "위험")
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+            yield json.dumps({"type": "done", "summary": {"total": total, "danger": danger}}, ensure_ascii=False) + "\n"
+        except Exception as e:
+            print(f"❌ 스트리밍 API 에러: {e}")
+            yield json.dumps({"type": "error", "error": str(e)}, ensure_ascii=False) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ==============================
+# 비동기 스캔 작업 API
+# ==============================
+
+@api.route("/api/scans", methods=["POST"])
+def create_scan():
+    payload = request.get_json(silent=True) or request.form
+    youtube_url = payload.get("url") or ""
+    video_id = extract_video_id(youtube_url)
+
+    if not video_id:
+        return jsonify({"error": "유효한 YouTube URL이 아닙니다."}), 400
+
+    try:
+        max_results = min(int(payload.get("max_results", 50)), MAX_SCAN_RESULTS)
+    except (TypeError, ValueError):
+        return jsonify({"error": "max_results는 숫자여야 합니다."}), 400
+
+    # 영상 정보 + 댓글 1페이지도 못 받는 상태면 대기열에 넣지 않음
+    if quota.affordable_pages(1, overhead=1) == 0:
+        return jsonify({"error": "오늘 YouTube API 할당량을 모두 사용했습니다."}), 429
+
+    try:
+        job, created = scan_manager.submit(video_id, max_results, _replies_flag(payload.get("replies")))
+    except ScanQueueFull as e:
+        return jsonify({"error": str(e)}), 503
+
+    # 새 작업이면 202, 같은 영상의 진행 중 작업을 돌려주면 200
+    return jsonify(job.to_dict()), 202 if created else 200
+
+@api.route("/api/scans/<job_id>", methods=["GET"])
+def scan_status(job_id):
+    job = scan_manager.get(job_id)
+    if not job:
+        return jsonify({"error": "스캔 작업을 찾을 수 없습니다."}), 404
+    return jsonify(job.to_dict())
+
+@api.route("/api/scans/<job_id>/results", methods=["GET"])
+def scan_results(job_id):
+    job = scan_manager.get(job_id)
+    if not job:
+        return jsonify({"error": "스캔 작업을 찾을 수 없습니다."}), 404
+
+    offset = request.args.get("offset", 0, type=int)
+    comments = job.results_since(offset)
+    data = job.to_dict()
+    data["comments"] = comments
+    data["next_offset"] = offset + len(comments)
+    return jsonify(data)
+
+# ==============================
+# 채널 / 재생목록 일괄 스캔 API (관리자)
+# ==============================
+
+def _as_list(value):
+    if not value:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+@api.route("/api/admin/bulk-scans", methods=["POST"])
+@admin_required
+def create_bulk_scan():
+    # {"channel_id": "UC..." 또는 [...], "playlist_id": ..., "urls": [...], "limit", "max_results", "replies"}
+    # 같은 대상으로 다시 요청하면 체크포인트에서 이어서 진행
+    payload = request.get_json(silent=True) or {}
+    videos = [extract_video_id(u) or u for u in _as_list(payload.get("urls"))]
+    channels = _as_list(payload.get("channel_id"))
+    playlists = _as_list(payload.get("playlist_id"))
+    if not (channels or playlists or videos):
+        return jsonify({"error": "channel_id / playlist_id / urls 중 하나는 필요합니다."}), 400
+
+    try:
+        limit = int(payload["limit"]) if payload.get("limit") else None
+        max_results = min(int(payload.get("max_results", 100)), MAX_SCAN_RESULTS)
+    except (TypeError, ValueError):
+        return jsonify({"error": "limit / max_results는 숫자여야 합니다."}), 400
+
+    if quota.affordable_pages(1, overhead=1) == 0:
+        return jsonify({"error": "오늘 YouTube API 할당량을 모두 사용했습니다."}), 429
+
+    scan, created = start_bulk_scan(
+        channels=channels, playlists=playlists, videos=videos, limit=limit,
+        max_results=max_results, include_replies=_replies_flag(payload.get("replies"))
+    )
+    return jsonify(scan.report()), 202 if created else 200
+
+@api.route("/api/admin/bulk-scans/<run_id>", methods=["GET"])
+@admin_required
+def bulk_scan_status(run_id):
+    scan = get_bulk_scan(run_id)
+    if not scan:
+        return jsonify({"error": "일괄 스캔을 찾을 수 없습니다."}), 404
+    return jsonify(scan.report())
+
+@api.route("/api/admin/bulk-scans/<run_id>/stop", methods=["POST"])
+@admin_required
+def bulk_scan_stop(run_id):
+    # 진행 중인 영상까지만 처리하고 멈춤 (같은 대상으로 다시 시작하면 이어서 진행)
+    scan = get_bulk_scan(run_id)
+    if not scan:
+        return jsonify({"error": "일괄 스캔을 찾을 수 없습니다."}), 404
+    scan.stop()
+    return jsonify(scan.report())
+
+# ==============================
+# 새 댓글 감시 목록 API (관리자)
+# ==============================
+
+@api.route("/api/admin/watchlist", methods=["GET"])
+@admin_required
+def admin_watchlist():
+    # 감시 영상 목록 + 스케줄러 상태
+    return jsonify({"videos": get_watchlist(), "scheduler": watch_scheduler.stats()})
+
+@api.route("/api/admin/watchlist", methods=["POST"])
+@admin_required
+def admin_watchlist_add():
+    payload = request.get_json(silent=True) or request.form
+    youtube_url = payload.get("url") or ""
+    video_id = extract_video_id(youtube_url) or payload.get("video_id")
+    if not video_id:
+        return jsonify({"error": "유효한 YouTube URL이 아닙니다."}), 400
+    try:
+        interval = int(payload.get("interval", WATCH_DEFAULT_INTERVAL))
+    except (TypeError, ValueError):
+        return jsonify({"error": "interval은 숫자(초)여야 합니다."}), 400
+
+    if not add_watch(video_id, interval):
+        return jsonify({"error": "감시 목록에 추가하지 못했습니다."}), 500
+    return jsonify({"video_id": video_id, "poll_interval": interval}), 201
+
+@api.route("/api/admin/watchlist/<video_id>", methods=["DELETE"])
+@admin_required
+def admin_watchlist_remove(video_id):
+    if not remove_watch(video_id):
+        return jsonify({"error": "감시 중인 영상이 아닙니다."}), 404
+    return jsonify({"video_id": video_id, "active": False})
+
+# ==============================
+# 대시보드 집계 API (관리자, 짧은 TTL 캐시)
+# ==============================
+# ?days=N: 최근 N일 분석 결과만 (없으면 전체)
+
+@api.route("/api/dashboard/stats", methods=["GET"])
+@admin_required
+def dashboard_stats():
+    # 카테고리별 건수 {"total", "normal", "abuse", "spam"}
+    return jsonify(dashboard.category_stats(request.args.get("days", type=int)))
+
+@api.route("/api/dashboard/videos", methods=["GET"])
+@admin_required
+def dashboard_videos():
+    return jsonify(dashboard.video_stats(request.args.get("days", type=int),
+                                         request.args.get("limit", 20, type=int)))
+
+@api.route("/api/dashboard/videos/<video_id>", methods=["GET"])
+@admin_required
+def dashboard_video(video_id):
+    summary = dashboard.video_summary(video_id)
+    if not summary:
+        return jsonify({"error": "분석된 댓글이 없는 영상입니다."}), 404
+    return jsonify(summary)
+
+@api.route("/api/dashboard/channels", methods=["GET"])
+@admin_required
+def dashboard_channels():
+    return jsonify(dashboard.channel_stats(request.args.get("days", type=int),
+                                           request.args.get("limit", 20, type=int)))
+
+@api.route("/api/dashboard/timeline", methods=["GET"])
+@admin_required
+def dashboard_timeline():
+    # bucket=day(기본) / hour
+    return jsonify(dashboard.timeline_stats(request.args.get("days", 7, type=int),
+                                            request.args.get("bucket", "day")))
+
+# ==============================
+# 작성자 위험도 / 블랙리스트 API (관리자)
+# ==============================
+# 목록은 ?page=N&per_page=N (최대 100), has_next로 다음 페이지 여부 표시
+
+@api.route("/api/blacklist", methods=["GET"])
+@admin_required
+def blacklist_list():
+    return jsonify(_page_response(get_blacklist_page(
+        request.args.get("page", 1, type=int), request.args.get("per_page", 50, type=int))))
+
+@api.route("/api/blacklist/candidates", methods=["GET"])
+@admin_required
+def blacklist_candidates():
+    # 아직 차단되지 않은 작성자를 위험도 순으로 (min_comments: 최소 댓글 수)
+    return jsonify(_page_response(get_risky_authors(
+        request.args.get("page", 1, type=int), request.args.get("per_page", 50, type=int),
+        request.args.get("min_comments", 3, type=int))))
+
+@api.route("/api/authors/<user_id>", methods=["GET"])
+@admin_required
+def author_profile(user_id):
+    row = get_author_profile(user_id)
+    if not row:
+        return jsonify({"error": "작성자 기록이 없습니다."}), 404
+    return jsonify(_blacklist_item(row))
+
+@api.route("/api/blacklist/add/<user_id>", methods=["POST"])
+@admin_required
+def blacklist_add(user_id):
+    payload = request.get_json(silent=True) or {}
+    if not blacklist.add(user_id, payload.get("reason")):
+        return jsonify({"error": "차단하지 못했습니다."}), 500
+    return jsonify({"authorId": user_id, "blacklisted": True})
+
+@api.route("/api/blacklist/remove/<user_id>", methods=["POST"])
+@admin_required
+def blacklist_remove(user_id):
+    if not blacklist.remove(user_id):
+        return jsonify({"error": "차단된 작성자가 아닙니다."}), 404
+    return jsonify({"authorId": user_id, "blacklisted": False})
+
+@api.route("/api/admin/author-profiles/rebuild", methods=["POST"])
+@admin_required
+def admin_rebuild_author_profiles():
+    # 작성자 집계를 저장된 댓글 전체에서 다시 계산 (도입 직후 / 복구용)
+    return jsonify({"rows": rebuild_author_profiles(), "blacklist": blacklist.stats()})
@@ -0,0 +1,71 @@
+# ==============================
+# 블랙리스트 작성자 (메모리 조회)
+# ==============================
+# - author_profiles.blacklisted 작성자를 {user_id: 카테고리} dict로 들고 있음
+# - 댓글 분류 전에 dict 조회 한 번으로 판정 → 로컬 필터 / 캐시 / GPT 모두 건너뜀
+# - BLACKLIST_REFRESH초마다 DB에서 다시 읽음 (다른 프로세스에서 바꾼 내용 반영)
+#   이 프로세스의 API로 차단 / 해제하면 바로 반영
+import os
+import threading
+import time
+
+from backend.database import get_blacklisted_authors, set_blacklisted, BLACKLIST_MODEL_VERSION
+
+BLACKLIST_ENABLED = os.getenv("BLACKLIST_ENABLED", "1") == "1"
+BLACKLIST_REFRESH = float(os.getenv("BLACKLIST_REFRESH", "60"))
+
+
+class Blacklist:
+
+    def __init__(self, refresh: float = BLACKLIST_REFRESH):
+        self.refresh = refresh
+        self._authors = {}
+        self._loaded_at = None      # monotonic
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def _current(self) -> dict:
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at >= self.refresh:
+            with self._lock:
+                if self._loaded_at is None or now - self._loaded_at >= self.refresh:
+                    authors = get_blacklisted_authors()
+                    if authors is not None:     # DB 오류면 기존 목록 유지
+                        self._authors = authors
+                    self._loaded_at = now
+        return self._authors
+
+    def verdict(self, user_id: str):
+        """차단된 작성자면 분석 결과 dict, 아니면 None"""
+        if not BLACKLIST_ENABLED:
+            return None
+        category = self._current().get(user_id)
+        if category is None:
+            return None
+        self.hits += 1
+        return {
+            "category": category,
+            "reason": "블랙리스트 작성자",
+            "confidence_score": 1.0,
+            "model_version": BLACKLIST_MODEL_VERSION
+        }
+
+    def add(self, user_id: str, reason: str = None) -> bool:
+        if not set_blacklisted(user_id, True, reason):
+            return False
+        with self._lock:
+            self._loaded_at = None      # 카테고리(주된 위반 유형)는 DB에서 다시 읽음
+        return True
+
+    def remove(self, user_id: str) -> bool:
+        if not set_blacklisted(user_id, False):
+            return False
+        with self._lock:
+            self._authors = {k: v for k, v in self._authors.items() if k != user_id}
+        return True
+
+    def stats(self) -> dict:
+        return {"enabled": BLACKLIST_ENABLED, "authors": len(self._authors), "hits": self.hits}
+
+
+blacklist = Blacklist()
@@ -0,0 +1,312 @@
+# ==============================
+# 채널 / 재생목록 / URL 목록 일괄 스캔
+# ==============================
+# - 대상: 채널 ID(UC...) → 업로드 재생목록, 재생목록 ID(PL... 등), 영상 URL / ID 목록 파일
+# - 영상마다 get_comments 실행 (스레드 풀)
+#   같은 프로세스 안의 스레드라서 YouTube 할당량(quota) / OpenAI RPM·TPM 예산을 그대로 공유
+#   (프로세스를 나누면 예산도 프로세스마다 따로 계산되므로 스레드만 사용)
+# - 영상 하나가 끝날 때마다 체크포인트(JSON) 기록 → 중단 후 같은 명령으로 다시 실행하면 이어서 진행
+#   (할당량 때문에 댓글을 끝까지 못 받은 영상은 partial로 기록 → 다음 실행에서 다시 스캔)
+# - 진행률 / 시간당 처리 영상 수(videos/hour) 보고
+#
+#   python -m backend.bulk_scan --channel UCxxxx --limit 200
+#   python -m backend.bulk_scan --playlist PLxxxx --file urls.txt --workers 4
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.youtube_api import (
+    get_comments, get_uploads_playlist_id, iter_playlist_video_ids, extract_video_id, YT_INCLUDE_REPLIES
+)
+from backend.youtube_quota import quota, QuotaExceeded
+from backend.write_behind import writer
+
+BULK_SCAN_WORKERS = int(os.getenv("BULK_SCAN_WORKERS", "4"))
+BULK_SCAN_MAX_RESULTS = int(os.getenv("BULK_SCAN_MAX_RESULTS", "100"))     # 영상당 댓글 수
+BULK_SCAN_DIR = os.getenv(
+    "BULK_SCAN_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "bulk_scans")
+)
+
+
+def read_url_file(path: str) -> list:
+    """한 줄에 URL / 영상 ID 하나 (빈 줄, # 주석 무시)"""
+    video_ids = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            video_ids.append(extract_video_id(line) or line)
+    return video_ids
+
+
+def run_key(channels=(), playlists=(), videos=(), max_results=BULK_SCAN_MAX_RESULTS,
+            limit: int = None, include_replies: bool = False) -> str:
+    """대상 목록 + 스캔 설정으로 만든 실행 ID (같은 대상 / 설정이면 같은 체크포인트를 이어서 사용)"""
+    raw = json.dumps([sorted(channels), sorted(playlists), sorted(videos), max_results,
+                      limit, bool(include_replies)])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+class BulkScan:
+    """
+    일괄 스캔 1회
+
+    체크포인트: {"videos": {영상 ID: {"status": "done" / "partial" / "failed", ...}}}
+    done 영상은 다시 실행해도 건너뜀, partial(할당량 때문에 일부만 스캔) / failed 영상은 다시 시도
+    """
+
+    def __init__(self, channels=(), playlists=(), videos=(), limit: int = None,
+                 max_results: int = BULK_SCAN_MAX_RESULTS, workers: int = BULK_SCAN_WORKERS,
+                 include_replies: bool = None, checkpoint_path: str = None):
+        self.channels = list(channels)
+        self.playlists = list(playlists)
+        self.videos = list(videos)
+        self.limit = limit
+        self.max_results = max_results
+        self.workers = max(1, workers)
+        self.include_replies = YT_INCLUDE_REPLIES if include_replies is None else include_replies
+        self.run_id = run_key(self.channels, self.playlists, self.videos, max_results,
+                              limit, self.include_replies)
+        self.checkpoint_path = checkpoint_path or os.path.join(BULK_SCAN_DIR, f"{self.run_id}.json")
+
+        self.status = "queued"          # queued → enumerating → running → done / stopped / failed
+        self.error = None
+        self.total = 0                  # 이번 실행 대상 영상 수
+        self.skipped = 0                # 체크포인트에 done으로 기록돼 건너뛴 영상
+        self.scanned = 0
+        self.partial = 0                # 할당량 때문에 일부만 스캔 (다음 실행에서 다시 스캔)
+        self.failed = 0
+        self.comments = 0
+        self.danger = 0
+        self.started_at = None
+        self.finished_at = None
+        self._checkpoint = self._load_checkpoint()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    # ==============================
+    # 체크포인트
+    # ==============================
+    def _load_checkpoint(self) -> dict:
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                data = json.load(f)
+            print(f"♻️ 체크포인트에서 이어서 진행: {self.checkpoint_path}")
+            return data
+        except FileNotFoundError:
+            return {"videos": {}}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 체크포인트 읽기 실패 (처음부터 진행): {e}")
+            return {"videos": {}}
+
+    def _save_checkpoint(self):
+        """임시 파일에 쓴 뒤 교체 (_lock 안에서 호출)"""
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        tmp = f"{self.checkpoint_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._checkpoint, f, ensure_ascii=False)
+        os.replace(tmp, self.checkpoint_path)
+
+    def _record(self, video_id: str, entry: dict):
+        with self._lock:
+            self._checkpoint["videos"][video_id] = entry
+            self._save_checkpoint()
+
+    # ==============================
+    # 대상 영상 목록
+    # ==============================
+    def enumerate_videos(self) -> list:
+        """채널 → 업로드 재생목록 → 영상 ID, 중복 제거 후 limit개까지"""
+        seen, video_ids = set(), []
+
+        def add(video_id):
+            if video_id and video_id not in seen:
+                seen.add(video_id)
+                video_ids.append(video_id)
+            return self.limit and len(video_ids) >= self.limit
+
+        for video_id in self.videos:
+            if add(video_id):
+                return video_ids
+        playlists = [get_uploads_playlist_id(c) for c in self.channels] + self.playlists
+        for playlist_id in playlists:
+            for video_id in iter_playlist_video_ids(playlist_id):
+                if add(video_id):
+                    return video_ids
+        return video_ids
+
+    # ==============================
+    # 실행
+    # ==============================
+    def _scan_one(self, video_id: str):
+        if self._stop.is_set():
+            return
+        started = time.time()
+        try:
+            result = get_comments(video_id, self.max_results, include_replies=self.include_replies)
+        except QuotaExceeded as e:
+            # 할당량이 바닥나면 남은 영상은 시작하지 않음 (체크포인트에 안 남아 다음 실행에서 진행)
+            print(f"⚠️ 할당량 부족으로 일괄 스캔 중단: {e}")
+            self._stop.set()
+            return
+        except Exception as e:
+            print(f"❌ 영상 스캔 실패 ({video_id}): {e}")
+            with self._lock:
+                self.failed += 1
+            self._record(video_id, {"status": "failed", "error": str(e), "at": time.time()})
+            return
+
+        # DB 저장 큐가 비워진 뒤에 done 기록 (중단돼도 done 영상은 저장까지 끝난 상태)
+        writer.flush()
+        summary = result["summary"]
+        truncated = result.get("truncated")
+        if truncated:
+            # 할당량 때문에 일부만 받음 → done으로 남기면 다음 실행에서 나머지를 영영 건너뜀
+            print(f"⚠️ 일부만 스캔 ({video_id}, 댓글 {summary['total']}개): {truncated} → 일괄 스캔 중단")
+            self._stop.set()
+        with self._lock:
+            if truncated:
+                self.partial += 1
+            else:
+                self.scanned += 1
+            self.comments += summary["total"]
+            self.danger += summary["danger"]
+        entry = {
+            "status": "partial" if truncated else "done",
+            "comments": summary["total"],
+            "danger": summary["danger"],
+            "seconds": round(time.time() - started, 2),
+            "at": time.time()
+        }
+        if truncated:
+            entry["reason"] = truncated
+        self._record(video_id, entry)
+
+    def run(self):
+        """끝날 때까지 실행 (stop() 호출 / 할당량 부족이면 진행 중인 영상까지만)"""
+        self.started_at = time.time()
+        try:
+            self.status = "enumerating"
+            video_ids = self.enumerate_videos()
+            done = self._checkpoint["videos"]
+            pending = [v for v in video_ids if done.get(v, {}).get("status") != "done"]
+            self.total = len(video_ids)
+            self.skipped = self.total - len(pending)
+            print(f"📋 일괄 스캔 {self.run_id}: 영상 {self.total}개 (완료 {self.skipped}개 건너뜀), "
+                  f"워커 {self.workers}개")
+
+            self.status = "running"
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bulk-scan") as pool:
+                list(pool.map(self._scan_one, pending))
+            self.status = "stopped" if self._stop.is_set() else "done"
+        except Exception as e:
+            print(f"❌ 일괄 스캔 실패: {e}")
+            self.error = str(e)
+            self.status = "failed"
+        finally:
+            self.finished_at = time.time()
+        return self.report()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "enumerating", "running")
+
+    def report(self) -> dict:
+        elapsed = ((self.finished_at or time.time()) - self.started_at) if self.started_at else 0.0
+        hours = elapsed / 3600 if elapsed else 0.0
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "status": self.status,
+                "error": self.error,
+                "videos": {
+                    "total": self.total,
+                    "skipped": self.skipped,
+                    "scanned": self.scanned,
+                    "partial": self.partial,
+                    "failed": self.failed,
+                    "remaining": max(0, self.total - self.skipped - self.scanned - self.partial - self.failed)
+                },
+                "comments": self.comments,
+                "danger": self.danger,
+                "elapsed_seconds": round(elapsed, 1),
+                "videos_per_hour": round(self.scanned / hours, 1) if hours else 0.0,
+                "comments_per_hour": round(self.comments / hours, 1) if hours else 0.0,
+                "quota_remaining": quota.stats()["remaining"],
+                "checkpoint": self.checkpoint_path
+            }
+
+
+# ==============================
+# API용 실행 관리 (실행 ID = 대상 목록 해시 → 같은 요청은 같은 실행 / 체크포인트)
+# ==============================
+_runs = {}
+_runs_lock = threading.Lock()
+
+
+def start_bulk_scan(**kwargs):
+    """백그라운드 스레드로 시작. (BulkScan, created) 반환 — 같은 대상이 진행 중이면 그 실행을 반환"""
+    scan = BulkScan(**kwargs)
+    with _runs_lock:
+        current = _runs.get(scan.run_id)
+        if current and current.active:
+            return current, False
+        _runs[scan.run_id] = scan
+    threading.Thread(target=scan.run, name=f"bulk-scan-{scan.run_id}", daemon=True).start()
+    return scan, True
+
+
+def get_bulk_scan(run_id: str):
+    return _runs.get(run_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="채널 / 재생목록 / URL 목록 일괄 스캔")
+    parser.add_argument("--channel", action="append", default=[], help="채널 ID (UC...), 여러 번 지정 가능")
+    parser.add_argument("--playlist", action="append", default=[], help="재생목록 ID, 여러 번 지정 가능")
+    parser.add_argument("--file", help="영상 URL / ID 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--limit", type=int, default=None, help="최대 영상 수")
+    parser.add_argument("--max-results", type=int, default=BULK_SCAN_MAX_RESULTS, help="영상당 댓글 수")
+    parser.add_argument("--workers", type=int, default=BULK_SCAN_WORKERS)
+    parser.add_argument("--replies", action="store_true", help="답글도 수집")
+    parser.add_argument("--checkpoint", default=None, help="체크포인트 파일 (기본: 대상 목록별 자동)")
+    args = parser.parse_args(argv)
+
+    videos = read_url_file(args.file) if args.file else []
+    if not (args.channel or args.playlist or videos):
+        parser.error("--channel / --playlist / --file 중 하나는 필요합니다")
+
+    scan = BulkScan(args.channel, args.playlist, videos, limit=args.limit,
+                    max_results=args.max_results, workers=args.workers,
+                    include_replies=args.replies or None, checkpoint_path=args.checkpoint)
+
+    # 진행 상황을 주기적으로 출력
+    runner = threading.Thread(target=scan.run, daemon=True)
+    runner.start()
+    try:
+        while runner.is_alive():
+            runner.join(timeout=30)
+            if runner.is_alive():
+                r = scan.report()
+                print(f"⏳ {r['videos']['scanned'] + r['videos']['partial'] + r['videos']['failed']}/{r['videos']['total'] - r['videos']['skipped']} "
+                      f"영상 | {r['videos_per_hour']} videos/hour | 할당량 남음 {r['quota_remaining']}")
+    except KeyboardInterrupt:
+        print("⏹️ 중단 요청: 진행 중인 영상까지만 처리합니다 (다시 실행하면 이어서 진행)")
+        scan.stop()
+        runner.join()
+
+    print(json.dumps(scan.report(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
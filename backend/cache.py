@@ -0,0 +1,212 @@
+# ==============================
+# 캐시 모듈
+# ==============================
+# 1. LRUCache: 스레드 안전 in-process LRU + TTL 캐시 (범용)
+# 2. ClassificationCache: 댓글 분류 결과 캐시
+#    - 1단계: 메모리 LRU
+#    - 2단계: 로컬 SQLite 파일 (프로세스 재시작 / 여러 영상 간 공유)
+#    - 키: 정규화된 댓글 텍스트 + 모델/프롬프트/필터 버전
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+CLASSIFY_CACHE_SIZE = int(os.getenv("CLASSIFY_CACHE_SIZE", "10000"))
+CLASSIFY_CACHE_TTL = int(os.getenv("CLASSIFY_CACHE_TTL", str(7 * 24 * 3600)))
+CLASSIFY_CACHE_DISK_ROWS = int(os.getenv("CLASSIFY_CACHE_DISK_ROWS", "200000"))
+# 빈 문자열이면 디스크 캐시를 쓰지 않음
+CLASSIFY_CACHE_PATH = os.getenv(
+    "CLASSIFY_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "classify_cache.sqlite3")
+)
+
+
+class LRUCache:
+    """
+    스레드 안전 LRU 캐시
+    - maxsize 초과 시 가장 오래 안 쓴 항목부터 제거
+    - ttl(초)이 지난 항목은 조회 시 만료 처리 (ttl=None이면 만료 없음)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+
+def normalize_cache_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (공백 통일 + 소문자)"""
+    return " ".join(text.split()).lower()
+
+
+class ClassificationCache:
+    """
+    댓글 분류 결과 캐시 (메모리 LRU → SQLite 2단계)
+
+    값은 {"category": ..., "reason": ...} 형태의 분석 결과 dict
+    """
+
+    def __init__(self, version: str, maxsize: int = CLASSIFY_CACHE_SIZE, ttl: int = CLASSIFY_CACHE_TTL,
+                 path: str = CLASSIFY_CACHE_PATH, max_rows: int = CLASSIFY_CACHE_DISK_ROWS):
+        self.version = version
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.memory = LRUCache(maxsize, ttl)
+        self.disk_hits = 0
+        self.misses = 0
+        self._disk = None
+        self._disk_lock = threading.Lock()
+        self._writes_since_trim = 0
+        if path:
+            try:
+                self._disk = self._open_disk(path)
+            except sqlite3.Error as e:
+                print(f"⚠️ 분류 캐시 파일 열기 실패 (메모리 캐시만 사용): {e}")
+
+    @staticmethod
+    def _open_disk(path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS classify_cache (
+                cache_key TEXT PRIMARY KEY,
+                analysis TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON classify_cache (created_at)")
+        return conn
+
+    def key(self, text: str, rules_version: str = "") -> str:
+        """rules_version: 로컬 필터 규칙 버전 (규칙이 바뀌면 다른 키)"""
+        raw = f"{self.version}\x00{rules_version}\x00{normalize_cache_text(text)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: list[str]) -> list:
+        """키 목록을 조회해 같은 순서로 결과(없으면 None)를 반환"""
+        found = [self.memory.get(k) for k in keys]
+        missing = [k for k, v in zip(keys, found) if v is None]
+
+        if missing and self._disk is not None:
+            disk_rows = self._load_disk(missing)
+            for i, k in enumerate(keys):
+                if found[i] is None and k in disk_rows:
+                    found[i] = disk_rows[k]
+                    self.memory.set(k, found[i])
+                    self.disk_hits += 1
+
+        self.misses += sum(1 for v in found if v is None)
+        return [dict(v) if v is not None else None for v in found]
+
+    def _load_disk(self, keys: list[str]) -> dict:
+        min_created = time.time() - self.ttl
+        rows = {}
+        with self._disk_lock:
+            # SQLite 변수 개수 제한(999)을 넘지 않도록 나눠서 조회
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = self._disk.execute(
+                    f"SELECT cache_key, analysis FROM classify_cache "
+                    f"WHERE cache_key IN ({placeholders}) AND created_at >= ?",
+                    (*chunk, min_created)
+                )
+                for cache_key, analysis in cursor:
+                    rows[cache_key] = json.loads(analysis)
+        return rows
+
+    def set_many(self, items: list[tuple]):
+        """(key, analysis) 목록 저장"""
+        if not items:
+            return
+        for k, analysis in items:
+            self.memory.set(k, dict(analysis))
+
+        if self._disk is None:
+            return
+        now = time.time()
+        with self._disk_lock:
+            self._disk.executemany(
+                "INSERT OR REPLACE INTO classify_cache (cache_key, analysis, created_at) VALUES (?, ?, ?)",
+                [(k, json.dumps(a, ensure_ascii=False), now) for k, a in items]
+            )
+            self._writes_since_trim += len(items)
+            if self._writes_since_trim >= 1000:
+                self._trim_disk()
+
+    def _trim_disk(self):
+        """만료 항목 삭제 + max_rows 초과분은 오래된 것부터 삭제 (_disk_lock 안에서 호출)"""
+        self._writes_since_trim = 0
+        self._disk.execute("DELETE FROM classify_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        (count,) = self._disk.execute("SELECT COUNT(*) FROM classify_cache").fetchone()
+        if count > self.max_rows:
+            self._disk.execute(
+                "DELETE FROM classify_cache WHERE cache_key IN "
+                "(SELECT cache_key FROM classify_cache ORDER BY created_at LIMIT ?)",
+                (count - self.max_rows,)
+            )
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        return {
+            "version": self.version,
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_size": memory["size"],
+            "memory_evictions": memory["evictions"],
+            "disk_enabled": self._disk is not None
+        }
@@ -0,0 +1,104 @@
+# ==============================
+# 댓글 레코드 (분석 결과 포함) — 페이지 분석 → API 응답 / DB 저장 공용
+# ==============================
+# - 댓글 하나당 CommentRecord 객체 하나 (__slots__, 중첩 dict 없음)
+# - API 응답 형식은 to_api(), DB 행은 database.py의 _comment_row / _analysis_row 에서 만듦
+# - 시간 변환: YouTube publishedAt("2024-01-02T03:04:05Z")은 문자열 자르기만으로
+#   DB 형식("2024-01-02 03:04:05", UTC)으로 바꿈 → 형식이 다를 때만 dateutil 사용
+from dataclasses import dataclass
+from datetime import datetime
+
+from dateutil import parser as date_parser
+
+# GPT 호출 실패 / API 키 없음으로 분류하지 못한 댓글의 카테고리
+# → 응답에는 그대로 보여주지만 분석 행은 저장하지 않음 (다음 스캔에서 다시 분류)
+UNCLASSIFIED_CATEGORY = "미분류"
+
+
+def to_db_datetime(value) -> str:
+    """ISO-8601 / datetime → 'YYYY-MM-DD HH:MM:SS' (시간대 표기는 버림, 기존 dateutil 처리와 같은 결과)"""
+    if isinstance(value, str):
+        # 2024-01-02T03:04:05Z / 2024-01-02T03:04:05.123Z
+        if len(value) >= 20 and value[10] == "T" and value[-1] == "Z" and value[4] == "-" and value[13] == ":":
+            return f"{value[:10]} {value[11:19]}"
+        # 이미 DB 형식
+        if len(value) == 19 and value[10] == " " and value[4] == "-":
+            return value
+    elif isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return date_parser.parse(str(value)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+@dataclass(slots=True)
+class CommentRecord:
+    comment_id: str                 # YouTube 댓글 ID
+    author_id: str
+    author_name: str
+    text: str
+    like_count: int
+    published_at: str               # API 원본 문자열 (ISO-8601)
+    parent_id: str = None           # 답글이면 부모 댓글 ID
+    reply_count: int = None         # 답글을 모두 받은 스레드만 (None이면 DB 값 유지)
+    cluster_id: str = None          # 유사 댓글 묶음 ID
+    category: str = "정상"
+    reason: str = None              # None: 분석 결과에 이유가 없음
+    confidence_score: float = 0.8
+    model_version: str = None
+    stored: bool = False            # DB에 저장된 분석 결과를 재사용 (분석 행 다시 쓰지 않음)
+
+    @property
+    def is_reply(self) -> bool:
+        return self.parent_id is not None
+
+    @property
+    def persist_analysis(self) -> bool:
+        """분석 행을 새로 써야 하는지 (재사용한 결과 / 미분류는 쓰지 않음)"""
+        return not self.stored and self.category != UNCLASSIFIED_CATEGORY
+
+    def to_api(self) -> dict:
+        """프론트엔드용 간단한 형식 (기존 호환성 유지)"""
+        return {
+            "author": self.author_name,
+            "text": self.text,
+            "likeCount": self.like_count,
+            "publishedAt": self.published_at,
+            "category": self.category,
+            "reason": self.reason if self.reason is not None else "분석 실패 또는 기본 처리",
+            "isReply": self.parent_id is not None,
+            "parentId": self.parent_id
+        }
+
+    @classmethod
+    def from_legacy(cls, item: dict) -> "CommentRecord":
+        """
+        예전 dict 형식을 레코드로 변환 (스크립트 / test_db.py 호환용)
+        - {'user': {...}, 'comment': {...}, 'analysis': {...}}
+        - 프론트엔드 형식 {'author', 'text', ...} 처럼 한 단계짜리 dict
+        """
+        u_part = item.get('user', item)
+        c_part = item.get('comment', item)
+        a_part = item.get('analysis', item)
+
+        author_id = c_part.get('user_id') or c_part.get('author') or u_part.get('author') or u_part.get('user_id')
+        published_at = c_part.get('published_at') or c_part.get('publishedAt') \
+            or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # 댓글 ID가 없으면 임시 ID (작성 시각 + 작성자)
+        comment_id = c_part.get('comment_id') or c_part.get('youtube_comment_id') \
+            or (to_db_datetime(published_at) + str(author_id))
+        return cls(
+            comment_id=comment_id,
+            author_id=author_id,
+            author_name=u_part.get('author') or u_part.get('username') or "Unknown",
+            # [해결] comment_text null 에러 방지: 다양한 키값 대응
+            text=c_part.get('text') or c_part.get('comment_text') or c_part.get('content') or "내용 없음",
+            like_count=c_part.get('like_count', 0),
+            published_at=published_at,
+            parent_id=c_part.get('parent_comment_id'),
+            reply_count=c_part.get('reply_count'),
+            cluster_id=c_part.get('cluster_id'),
+            category=a_part.get('category'),
+            reason=a_part.get('reason', ''),
+            confidence_score=a_part.get('confidence_score', 0.8),
+            model_version=a_part.get('model_version'),
+            stored=bool(a_part.get('stored'))
+        )
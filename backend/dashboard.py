@@ -0,0 +1,93 @@
+# ==============================
+# 관리자 대시보드 집계 (짧은 TTL 메모리 캐시)
+# ==============================
+# - 집계 쿼리는 database.py (카테고리 / 비디오 / 채널 / 기간별)
+# - 같은 조건의 결과는 DASHBOARD_CACHE_TTL초 동안 재사용
+#   → 대시보드를 여러 번 열어도 테이블 크기와 상관없이 바로 응답
+# - 캐시가 비었을 때 동시에 들어온 요청은 한 번만 조회 (키별 잠금)
+# - DB 오류로 실패한 조회는 빈 값으로 응답하고 캐시하지 않음
+import os
+import threading
+import time
+
+from backend.cache import LRUCache
+from backend.database import (
+    get_dashboard_stats, get_video_stats, get_video_summary, get_channel_stats, get_timeline_stats
+)
+
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+DASHBOARD_MAX_DAYS = int(os.getenv("DASHBOARD_MAX_DAYS", "365"))
+DASHBOARD_MAX_LIMIT = 100
+
+_cache = LRUCache(maxsize=512, ttl=DASHBOARD_CACHE_TTL)
+_key_locks = {}
+_key_locks_lock = threading.Lock()
+
+
+def _cached(key, compute, fallback):
+    """
+    (값, 계산 시각) 반환 — 캐시에 없으면 키별로 한 번만 계산
+    조회에 실패하면 fallback을 반환하고 캐시하지 않음 (DB가 돌아오면 다음 요청부터 바로 정상 값)
+    """
+    entry = _cache.get(key)
+    if entry is not None:
+        return entry
+    with _key_locks_lock:
+        lock = _key_locks.setdefault(key, threading.Lock())
+    try:
+        with lock:
+            entry = _cache.get(key)
+            if entry is None:
+                try:
+                    entry = (compute(), time.time())
+                except Exception as e:
+                    print(f"⚠️ 대시보드 집계 실패 ({key[0]}, 캐시 안 함): {e}")
+                    return fallback, time.time()
+                _cache.set(key, entry)
+    finally:
+        with _key_locks_lock:
+            _key_locks.pop(key, None)
+    return entry
+
+
+def _clamp_days(days):
+    return min(int(days), DASHBOARD_MAX_DAYS) if days else None
+
+
+def _clamp_limit(limit):
+    return max(1, min(int(limit), DASHBOARD_MAX_LIMIT))
+
+
+def category_stats(days: int = None) -> dict:
+    days = _clamp_days(days)
+    stats, at = _cached(("stats", days), lambda: get_dashboard_stats(days),
+                        {"total": 0, "normal": 0, "abuse": 0, "spam": 0})
+    return {**stats, "days": days, "generated_at": at}
+
+
+def video_stats(days: int = None, limit: int = 20) -> dict:
+    days, limit = _clamp_days(days), _clamp_limit(limit)
+    rows, at = _cached(("videos", days, limit), lambda: get_video_stats(days, limit), [])
+    return {"videos": rows, "days": days, "generated_at": at}
+
+
+def video_summary(video_id: str):
+    row, at = _cached(("video", video_id), lambda: get_video_summary(video_id), None)
+    return {**row, "generated_at": at} if row else None
+
+
+def channel_stats(days: int = None, limit: int = 20) -> dict:
+    days, limit = _clamp_days(days), _clamp_limit(limit)
+    rows, at = _cached(("channels", days, limit), lambda: get_channel_stats(days, limit), [])
+    return {"channels": rows, "days": days, "generated_at": at}
+
+
+def timeline_stats(days: int = 7, bucket: str = "day") -> dict:
+    days = _clamp_days(days) or 7
+    bucket = "hour" if bucket == "hour" else "day"
+    rows, at = _cached(("timeline", days, bucket), lambda: get_timeline_stats(days, bucket), [])
+    return {"timeline": rows, "days": days, "bucket": bucket, "generated_at": at}
+
+
+def cache_stats() -> dict:
+    return {**_cache.stats(), "ttl": DASHBOARD_CACHE_TTL}
@@ -1,210 +1,946 @@
-import pymysql
-from datetime import datetime
-from dateutil import parser as date_parser
+import os
+from contextlib import contextmanager
 from pymysql.cursors import DictCursor
 
+from backend.db_pool import ConnectionPool
+from backend.comment_record import CommentRecord, to_db_datetime
+from backend.metrics import Gauge
+
 # ==============================
 # 1. DB 연결 설정
 # ==============================
 DB_CONFIG = {
-    "host": "localhost",
-    "port": 3306,
-    "user": "root",
-    "password": "1234",
-    "database": "youtube",
+    "host": os.getenv("DB_HOST", "localhost"),
+    "port": int(os.getenv("DB_PORT", "3306")),
+    "user": os.getenv("DB_USER", "root"),
+    "password": os.getenv("DB_PASSWORD", "1234"),
+    "database": os.getenv("DB_NAME", "youtube"),
     "charset": "utf8mb4",
     "cursorclass": DictCursor
 }
 
 
-def get_db_connection():
+# 블랙리스트 작성자 판정의 model_version (학습 데이터 / 작성자 누적 집계에서 제외)
+BLACKLIST_MODEL_VERSION = "blacklist"
+
+# 분석 카테고리 ↔ categories.category_id 매핑
+CATEGORY_IDS = {'정상': 1, '위험': 2, '욕설': 2, '비하': 2, '스팸': 3, '광고': 3}
+CATEGORY_NAMES = {1: '정상', 2: '위험', 3: '스팸'}
+
+
+# ==============================
+# 커넥션 풀 설정 (환경변수로 조정)
+# ==============================
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+DB_POOL_RECYCLE = float(os.getenv("DB_POOL_RECYCLE", "3600"))
+
+pool = ConnectionPool(
+    DB_CONFIG,
+    min_size=DB_POOL_MIN,
+    max_size=DB_POOL_MAX,
+    timeout=DB_POOL_TIMEOUT,
+    recycle=DB_POOL_RECYCLE
+)
+
+
+@contextmanager
+def db_connection():
+    """
+    풀에서 커넥션을 빌려 쓰고 블록이 끝나면 반납한다.
+    연결에 실패하면 None을 넘겨주므로 호출부에서 `if not conn:`으로 처리한다.
+
+        with db_connection() as conn:
+            if not conn:
+                return ...
+    """
     try:
-        return pymysql.connect(**DB_CONFIG)
+        conn = pool.acquire()
     except Exception as e:
         print(f"❌ DB 연결 실패: {e}")
-        return None
+        yield None
+        return
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def get_pool_stats() -> dict:
+    """커넥션 풀 지표 (크기 / 대기 / 타임아웃 등)"""
+    return pool.stats()
+
+
+Gauge("db_pool_in_use", "대여 중인 DB 커넥션 수", lambda: get_pool_stats().get("in_use"))
 
 # ==============================
 # 2. 기초 저장 함수들
 # ==============================
 
+SQL_UPSERT_VIDEO = """
+INSERT INTO videos (video_id, title, channel_name, channel_id, view_count, published_at, description, thumbnail_url)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE title=VALUES(title), view_count=VALUES(view_count)
+"""
+
+SQL_UPSERT_USER = "INSERT INTO users (user_id, username, profile_image_url) VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE username=VALUES(username)"
+
+SQL_UPSERT_COMMENT = """
+INSERT INTO comments (youtube_comment_id, video_id, user_id, comment_text, like_count, published_at, cluster_id,
+reply_count, parent_comment_id, is_reply)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE like_count=VALUES(like_count), comment_text=VALUES(comment_text),
+cluster_id=COALESCE(VALUES(cluster_id), cluster_id), reply_count=COALESCE(VALUES(reply_count), reply_count)
+"""
+
+SQL_INSERT_ANALYSIS = """
+INSERT INTO comment_analysis (comment_id, category_id, confidence_score, analysis_result, model_version) 
+VALUES (%s, %s, %s, %s, %s) 
+ON DUPLICATE KEY UPDATE category_id=VALUES(category_id)
+"""
+
+
+# 작성자 누적 집계: 새로 저장된 댓글만큼 더하고 위험도 재계산
+# (MySQL은 SET 왼쪽부터 차례로 적용하므로 risk_score는 갱신된 건수로 계산됨)
+SQL_UPSERT_AUTHOR = """
+INSERT INTO author_profiles (user_id, username, total_count, normal_count, danger_count, spam_count,
+last_offense_at, last_comment_at, risk_score)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE username=VALUES(username),
+total_count=total_count + VALUES(total_count), normal_count=normal_count + VALUES(normal_count),
+danger_count=danger_count + VALUES(danger_count), spam_count=spam_count + VALUES(spam_count),
+last_offense_at=GREATEST(COALESCE(last_offense_at, VALUES(last_offense_at)), COALESCE(VALUES(last_offense_at), last_offense_at)),
+last_comment_at=GREATEST(COALESCE(last_comment_at, VALUES(last_comment_at)), COALESCE(VALUES(last_comment_at), last_comment_at)),
+risk_score=(danger_count + 0.5 * spam_count) / (total_count + 3)
+"""
+
+SQL_INSERT_AUTHOR_VIDEO = "INSERT IGNORE INTO author_videos (user_id, video_id) VALUES (%s, %s)"
+
+
+def risk_score(danger: int, spam: int, total: int) -> float:
+    """SQL_UPSERT_AUTHOR와 같은 식 (댓글 몇 개로 점수가 튀지 않도록 분모에 3을 더함)"""
+    return (danger + 0.5 * spam) / (total + 3)
+
+
+def _video_row(video_data: dict) -> tuple:
+    raw_date = video_data.get(
+        'published_at') or video_data.get('publishedAt')
+    return (
+        video_data.get('video_id'), video_data.get('title'),
+        video_data.get('channel_name'), video_data.get('channel_id'),
+        video_data.get('view_count', 0), to_db_datetime(raw_date),
+        video_data.get('description', ''), video_data.get(
+            'thumbnail_url', '')
+    )
+
+
+def _comment_row(video_id: str, record: CommentRecord) -> tuple:
+    # reply_count: 답글을 실제로 받은 경우에만 기록 (None이면 기존 값 유지 → 다음 스캔의 변경 감지 기준)
+    return (record.comment_id, video_id, record.author_id, record.text,
+            record.like_count, to_db_datetime(record.published_at), record.cluster_id,
+            record.reply_count, record.parent_id, record.parent_id is not None)
+
+
+def _analysis_row(comment_pk: int, record: CommentRecord) -> tuple:
+    cat_id = CATEGORY_IDS.get(record.category, 1)
+    return (comment_pk, cat_id, record.confidence_score,
+            record.reason if record.reason is not None else '', record.model_version)
+
 
 def save_video(video_data: dict) -> bool:
-    conn = get_db_connection()
-    if not conn:
-        return False
-    try:
-        raw_date = video_data.get(
-            'published_at') or video_data.get('publishedAt')
-        formatted_date = date_parser.parse(
-            raw_date).strftime('%Y-%m-%d %H:%M:%S')
-        with conn.cursor() as cursor:
-            sql = """
-            INSERT INTO videos (video_id, title, channel_name, channel_id, view_count, published_at, description, thumbnail_url)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE title=VALUES(title), view_count=VALUES(view_count)
-            """
-            cursor.execute(sql, (
-                video_data.get('video_id'), video_data.get('title'),
-                video_data.get('channel_name'), video_data.get('channel_id'),
-                video_data.get('view_count', 0), formatted_date,
-                video_data.get('description', ''), video_data.get(
-                    'thumbnail_url', '')
-            ))
-        conn.commit()
-        return True
-    except Exception as e:
-        print(f"❌ 비디오 저장 에러: {e}")
-        return False
-    finally:
-        conn.close()
+    with db_connection() as conn:
+        if not conn:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(SQL_UPSERT_VIDEO, _video_row(video_data))
+            conn.commit()
+            return True
+        except Exception as e:
+            print(f"❌ 비디오 저장 에러: {e}")
+            return False
 
 
 def save_user(user_data: dict) -> bool:
-    conn = get_db_connection()
-    if not conn:
-        return False
-    try:
-        with conn.cursor() as cursor:
-            sql = "INSERT INTO users (user_id, username, profile_image_url) VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE username=VALUES(username)"
-            cursor.execute(sql, (user_data.get('user_id'), user_data.get(
-                'username'), user_data.get('profile_image_url', '')))
-        conn.commit()
-        return True
-    except Exception as e:
-        print(f"❌ 유저 저장 에러: {e}")
-        return False
-    finally:
-        conn.close()
+    with db_connection() as conn:
+        if not conn:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(SQL_UPSERT_USER, (user_data.get('user_id'), user_data.get(
+                    'username'), user_data.get('profile_image_url', '')))
+            conn.commit()
+            return True
+        except Exception as e:
+            print(f"❌ 유저 저장 에러: {e}")
+            return False
 
 
 def save_comment_and_analysis(video_id: str, comment_data: dict, analysis_data: dict):
-    conn = get_db_connection()
-    if not conn:
-        return None
-    try:
-        raw_date = comment_data.get('published_at') or comment_data.get(
-            'publishedAt') or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        formatted_date = date_parser.parse(
-            str(raw_date)).strftime('%Y-%m-%d %H:%M:%S')
-
-        user_id = comment_data.get('user_id') or comment_data.get('author')
-        comment_id = comment_data.get('comment_id') or comment_data.get(
-            'youtube_comment_id') or (str(formatted_date) + str(user_id))
-
-        # [해결] comment_text null 에러 방지: 다양한 키값 대응
-        comment_text = comment_data.get('text') or comment_data.get(
-            'comment_text') or comment_data.get('content') or "내용 없음"
-
-        with conn.cursor() as cursor:
-            sql_comment = """
-            INSERT INTO comments (youtube_comment_id, video_id, user_id, comment_text, like_count, published_at)
-            VALUES (%s, %s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE like_count=VALUES(like_count), comment_text=VALUES(comment_text)
-            """
-            cursor.execute(sql_comment, (comment_id, video_id, user_id,
-                           comment_text, comment_data.get('like_count', 0), formatted_date))
-
-            cursor.execute(
-                "SELECT comment_id FROM comments WHERE youtube_comment_id = %s", (comment_id,))
-            row = cursor.fetchone()
-            if not row:
-                return None
-
-            cat_map = {'정상': 1, '위험': 2, '욕설': 2, '비하': 2, '스팸': 3, '광고': 3}
-            cat_id = cat_map.get(analysis_data.get('category'), 1)
-
-            sql_analysis = """
-            INSERT INTO comment_analysis (comment_id, category_id, confidence_score, analysis_result) 
-            VALUES (%s, %s, %s, %s) 
-            ON DUPLICATE KEY UPDATE category_id=VALUES(category_id)
-            """
-            cursor.execute(sql_analysis, (row['comment_id'], cat_id, analysis_data.get(
-                'confidence_score', 0.8), analysis_data.get('reason', '')))
-
-            conn.commit()
-            return row['comment_id']
-    except Exception as e:
-        print(f"❌ 댓글 저장 에러: {e}")
-        return None
-    finally:
-        conn.close()
+    record = CommentRecord.from_legacy({"user": comment_data, "comment": comment_data, "analysis": analysis_data})
+    with db_connection() as conn:
+        if not conn:
+            return None
+        try:
+            comment_row = _comment_row(video_id, record)
+            comment_id = comment_row[0]
+
+            with conn.cursor() as cursor:
+                cursor.execute(SQL_UPSERT_COMMENT, comment_row)
+
+                cursor.execute(
+                    "SELECT comment_id FROM comments WHERE youtube_comment_id = %s", (comment_id,))
+                row = cursor.fetchone()
+                if not row:
+                    return None
+
+                # 이미 저장된 분석 결과를 재사용한 댓글 / 미분류 댓글은 분석 행을 쓰지 않음
+                if record.persist_analysis:
+                    cursor.execute(SQL_INSERT_ANALYSIS, _analysis_row(
+                        row['comment_id'], record))
+
+                conn.commit()
+                return row['comment_id']
+        except Exception as e:
+            print(f"❌ 댓글 저장 에러: {e}")
+            return None
+
+
+def get_stored_analyses(youtube_comment_ids: list, model_versions: list) -> dict:
+    """
+    이미 분석되어 저장된 댓글 조회 (증분 분석용)
+
+    youtube_comment_id 목록 중 model_versions 버전으로 분석 결과가 있는 댓글을
+    한 번의 IN (...) 쿼리로 찾아 {youtube_comment_id: {...}} 형태로 반환한다.
+    같은 댓글에 분석 행이 여러 개면 가장 최근 행을 사용한다.
+    """
+    if not youtube_comment_ids or not model_versions:
+        return {}
+    with db_connection() as conn:
+        if not conn:
+            return {}
+        try:
+            with conn.cursor() as cursor:
+                id_marks = ", ".join(["%s"] * len(youtube_comment_ids))
+                version_marks = ", ".join(["%s"] * len(model_versions))
+                sql = f"""
+                SELECT c.youtube_comment_id, c.comment_text, c.reply_count,
+                       ca.category_id, ca.confidence_score, ca.analysis_result, ca.model_version
+                FROM comments c
+                JOIN comment_analysis ca ON ca.comment_id = c.comment_id
+                WHERE c.youtube_comment_id IN ({id_marks}) AND ca.model_version IN ({version_marks})
+                ORDER BY ca.analysis_id
+                """
+                cursor.execute(sql, (*youtube_comment_ids, *model_versions))
+                stored = {}
+                for row in cursor.fetchall():
+                    stored[row['youtube_comment_id']] = {
+                        "comment_text": row['comment_text'],
+                        "reply_count": row['reply_count'],
+                        "category": CATEGORY_NAMES.get(row['category_id'], '정상'),
+                        "reason": row['analysis_result'] or "",
+                        "confidence_score": row['confidence_score'],
+                        "model_version": row['model_version']
+                    }
+                return stored
+        except Exception as e:
+            print(f"❌ 저장된 분석 조회 에러: {e}")
+            return {}
+
+
+def get_reply_counts(youtube_comment_ids: list) -> dict:
+    """
+    지난 스캔에서 답글까지 수집한 댓글의 {youtube_comment_id: reply_count}
+    (답글 수가 그대로인 스레드는 다시 받지 않기 위해 사용)
+    """
+    if not youtube_comment_ids:
+        return {}
+    with db_connection() as conn:
+        if not conn:
+            return {}
+        try:
+            with conn.cursor() as cursor:
+                marks = ", ".join(["%s"] * len(youtube_comment_ids))
+                cursor.execute(
+                    f"SELECT youtube_comment_id, reply_count FROM comments WHERE youtube_comment_id IN ({marks})",
+                    tuple(youtube_comment_ids))
+                return {row['youtube_comment_id']: row['reply_count'] for row in cursor.fetchall()}
+        except Exception as e:
+            print(f"❌ 답글 수 조회 에러: {e}")
+            return {}
+
+
+def get_training_samples(limit: int = 200000, exclude_version_prefix: str = None) -> list:
+    """
+    로컬 모델 학습용 [(댓글 텍스트, 카테고리), ...] 목록
+    - 댓글마다 가장 최근 분석 행만 사용
+    - 버전이 없거나 분석 오류로 저장된 행은 제외
+    - exclude_version_prefix로 시작하는 버전(모델 자신의 판정)은 제외
+    - 블랙리스트 판정은 댓글 내용이 아니라 작성자 기준이므로 제외
+    """
+    with db_connection() as conn:
+        if not conn:
+            return []
+        try:
+            with conn.cursor() as cursor:
+                where = ""
+                params = []
+                if exclude_version_prefix:
+                    where = "AND ca.model_version NOT LIKE %s"
+                    params.append(f"{exclude_version_prefix}%")
+                sql = f"""
+                SELECT ca.comment_id, c.comment_text, ca.category_id
+                FROM comment_analysis ca
+                JOIN comments c ON c.comment_id = ca.comment_id
+                WHERE ca.model_version IS NOT NULL AND ca.model_version <> %s {where}
+                  AND COALESCE(ca.analysis_result, '') NOT IN ('분석 오류', '분석 실패')
+                ORDER BY ca.analysis_id DESC
+                LIMIT %s
+                """
+                cursor.execute(sql, (BLACKLIST_MODEL_VERSION, *params, limit))
+                samples = {}
+                for row in cursor.fetchall():
+                    if row['comment_id'] not in samples and row['category_id'] in CATEGORY_NAMES:
+                        samples[row['comment_id']] = (row['comment_text'], CATEGORY_NAMES[row['category_id']])
+                return list(samples.values())
+        except Exception as e:
+            print(f"❌ 학습 데이터 조회 에러: {e}")
+            return []
 
 # ==============================
 # 3. 통합 저장 및 통계 함수
 # ==============================
 
 
+def _fetch_comment_pks(cursor, youtube_comment_ids: list) -> dict:
+    """youtube_comment_id → comments.comment_id 를 IN (...) 쿼리로 한 번에 조회"""
+    pks = {}
+    for start in range(0, len(youtube_comment_ids), 1000):
+        chunk = youtube_comment_ids[start:start + 1000]
+        marks = ", ".join(["%s"] * len(chunk))
+        cursor.execute(
+            f"SELECT comment_id, youtube_comment_id FROM comments WHERE youtube_comment_id IN ({marks})", chunk)
+        for row in cursor.fetchall():
+            pks[row['youtube_comment_id']] = row['comment_id']
+    return pks
+
+
+def _fetch_counted_comments(cursor, youtube_comment_ids: list) -> set:
+    """
+    작성자 집계에 이미 들어간 댓글 (youtube_comment_id 집합)
+    = 버전이 있고 블랙리스트 판정이 아닌 분석 행이 있는 댓글
+    (미분류 댓글은 분석 행이 없으므로 나중에 분류되면 그때 집계됨)
+    """
+    counted = set()
+    for start in range(0, len(youtube_comment_ids), 1000):
+        chunk = youtube_comment_ids[start:start + 1000]
+        marks = ", ".join(["%s"] * len(chunk))
+        cursor.execute(
+            f"SELECT DISTINCT c.youtube_comment_id FROM comments c "
+            f"JOIN comment_analysis ca ON ca.comment_id = c.comment_id "
+            f"WHERE c.youtube_comment_id IN ({marks}) "
+            f"AND ca.model_version IS NOT NULL AND ca.model_version <> %s",
+            (*chunk, BLACKLIST_MODEL_VERSION))
+        counted.update(row['youtube_comment_id'] for row in cursor.fetchall())
+    return counted
+
+
+def _update_author_profiles(cursor, video_id: str, users: dict, comment_rows: dict,
+                            analyses: dict, counted: set):
+    """
+    작성자 누적 집계 갱신 (save_video_with_comments 트랜잭션 안에서 호출)
+    - 아직 집계되지 않은 댓글의 판정만 더함 (재분석 / 재스캔된 댓글은 다시 세지 않음)
+      counted: 분석 행을 쓰기 전에 _fetch_counted_comments로 조회한 결과
+    - 블랙리스트 판정은 작성자 때문에 붙은 판정이므로 세지 않음
+    - 영상 수는 author_videos (작성자, 영상) 기본키로 중복 없이 계산
+    """
+    deltas = {}     # user_id → [전체, 정상, 위험, 스팸, 마지막 위반, 마지막 댓글]
+    for cid, record in analyses.items():
+        if cid in counted or record.model_version == BLACKLIST_MODEL_VERSION:
+            continue
+        row = comment_rows[cid]
+        user_id, published_at = row[2], row[5]
+        d = deltas.setdefault(user_id, [0, 0, 0, 0, None, None])
+        cat_id = CATEGORY_IDS.get(record.category, 1)
+        d[0] += 1
+        d[cat_id] += 1
+        if cat_id != 1:
+            d[4] = max(d[4] or published_at, published_at)
+        d[5] = max(d[5] or published_at, published_at)
+    if not deltas:
+        return
+
+    cursor.executemany(SQL_UPSERT_AUTHOR, [
+        (user_id, users.get(user_id, (None, None))[1], *d[:4], d[4], d[5], risk_score(d[2], d[3], d[0]))
+        for user_id, d in deltas.items()
+    ])
+    cursor.executemany(SQL_INSERT_AUTHOR_VIDEO, [(user_id, video_id) for user_id in deltas])
+    marks = ", ".join(["%s"] * len(deltas))
+    cursor.execute(
+        f"UPDATE author_profiles ap SET video_count = "
+        f"(SELECT COUNT(*) FROM author_videos av WHERE av.user_id = ap.user_id) "
+        f"WHERE ap.user_id IN ({marks})", tuple(deltas))
+
+
 def save_video_with_comments(video_data: dict, comments: list) -> dict:
+    """
+    비디오 + 댓글 목록을 커넥션 1개 / 트랜잭션 1개로 저장
+
+    ✔ 입력 형식: youtube_api._classify_page가 만드는 CommentRecord 목록
+    ❗ 예전 dict 형식({'user', 'comment', 'analysis'} / 프론트엔드 author·text ...)은
+      CommentRecord.from_legacy로 바꿔서 저장 (스크립트 호환용, 댓글 ID가 없으면 임시 ID)
+      실제 저장 경로는 write_behind.persist_scan 하나뿐.
+
+    - users / comments / comment_analysis 는 executemany 다중 행 upsert
+    - 댓글 PK는 IN (...) 쿼리로 한 번에 조회
+    - 중간에 실패하면 전체 롤백
+    """
     stats = {'videos': 0, 'users': 0, 'comments': 0, 'analyses': 0}
-    if save_video(video_data):
-        stats['videos'] = 1
+    video_id = video_data.get('video_id')
 
+    users = {}
+    comment_rows = {}
+    analyses = {}
     for item in comments:
-        # 데이터 구조 유연하게 처리
-        u_part = item.get('user', item)
-        c_part = item.get('comment', item)
-        a_part = item.get('analysis', item)
-
-        user_info = {
-            "user_id": u_part.get('author') or u_part.get('user_id'),
-            "username": u_part.get('author') or u_part.get('username') or "Unknown",
-            "profile_image_url": ""
-        }
-
-        if save_user(user_info):
-            stats['users'] += 1
+        record = item if isinstance(item, CommentRecord) else CommentRecord.from_legacy(item)
+        users[record.author_id] = (record.author_id, record.author_name, "")
+        comment_rows[record.comment_id] = _comment_row(video_id, record)
+        # 이미 저장된 분석 결과를 재사용한 댓글 / 미분류 댓글은 분석 행을 쓰지 않음
+        if record.persist_analysis:
+            analyses[record.comment_id] = record
+        else:
+            analyses.pop(record.comment_id, None)
+
+    with db_connection() as conn:
+        if not conn:
+            return stats
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(SQL_UPSERT_VIDEO, _video_row(video_data))
+                if users:
+                    cursor.executemany(SQL_UPSERT_USER, list(users.values()))
+                # 작성자 집계에 이미 들어간 댓글 (집계는 댓글당 한 번만, 분석 행을 쓰기 전에 조회)
+                counted = _fetch_counted_comments(cursor, [
+                    cid for cid, record in analyses.items() if record.model_version != BLACKLIST_MODEL_VERSION
+                ])
+                if comment_rows:
+                    cursor.executemany(SQL_UPSERT_COMMENT, list(comment_rows.values()))
+
+                pks = _fetch_comment_pks(cursor, list(analyses))
+                analysis_rows = [
+                    _analysis_row(pks[cid], record)
+                    for cid, record in analyses.items() if cid in pks
+                ]
+                if analysis_rows:
+                    cursor.executemany(SQL_INSERT_ANALYSIS, analysis_rows)
+
+                _update_author_profiles(cursor, video_id, users, comment_rows, analyses, counted)
 
-        if save_comment_and_analysis(video_data.get('video_id'), c_part, a_part):
-            stats['comments'] += 1
-            stats['analyses'] += 1
+            conn.commit()
+            stats = {'videos': 1, 'users': len(users),
+                     'comments': len(comment_rows), 'analyses': len(analysis_rows)}
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ 일괄 저장 에러 (롤백): {e}")
 
     print(f"📊 DB 저장 결과: {stats}")
     return stats
 
 
-def get_dashboard_stats():
-    conn = get_db_connection()
-    if not conn:
-        return {"total": 0, "normal": 0, "abuse": 0, "spam": 0}
-    try:
-        with conn.cursor() as cursor:
-            sql = "SELECT COUNT(*) as total, SUM(CASE WHEN category_id = 1 THEN 1 ELSE 0 END) as normal, SUM(CASE WHEN category_id = 2 THEN 1 ELSE 0 END) as abuse, SUM(CASE WHEN category_id = 3 THEN 1 ELSE 0 END) as spam FROM comment_analysis"
-            cursor.execute(sql)
-            res = cursor.fetchone()
-            return {"total": res['total'] or 0, "normal": int(res['normal'] or 0), "abuse": int(res['abuse'] or 0), "spam": int(res['spam'] or 0)}
-    finally:
-        conn.close()
+def _window_clause(days, column: str = "ca.analyzed_at"):
+    """최근 days일 조건 (idx_analyzed_at 범위 검색), days가 없으면 전체"""
+    if not days:
+        return "", ()
+    return f"WHERE {column} >= NOW() - INTERVAL %s DAY", (int(days),)
+
+
+def _category_totals(rows) -> dict:
+    """category_id별 행 → 대시보드 카드 형식 {"total", "normal", "abuse", "spam"}"""
+    counts = {row['category_id']: int(row['cnt']) for row in rows}
+    return {
+        "total": sum(counts.values()),
+        "normal": counts.get(1, 0),
+        "abuse": counts.get(2, 0),
+        "spam": counts.get(3, 0)
+    }
+
+
+# 대시보드 집계 조회 (get_*_stats / get_video_summary)
+# ❗ 다른 조회 함수와 달리 DB 연결 / 쿼리에 실패하면 빈 값 대신 예외를 냄
+#   → dashboard.py가 빈 화면용 값을 돌려주되 캐시하지 않음 (빈 결과가 TTL 동안 남지 않도록)
+
+# 카테고리별 합계 컬럼 (비디오 / 채널 집계 공용)
+_CATEGORY_SUMS = """
+    COUNT(*) AS total,
+    SUM(ca.category_id = 1) AS normal,
+    SUM(ca.category_id = 2) AS abuse,
+    SUM(ca.category_id = 3) AS spam
+"""
+
+
+def _int_counts(row: dict) -> dict:
+    for key in ("total", "normal", "abuse", "spam"):
+        row[key] = int(row.get(key) or 0)
+    return row
+
+
+def get_dashboard_stats(days: int = None):
+    """
+    카테고리별 분석 건수
+    GROUP BY category_id → idx_category_id 인덱스만 읽음 (기간 지정 시 idx_analyzed_at 범위)
+    """
+    with db_connection() as conn:
+        if not conn:
+            raise ConnectionError("DB 연결 실패")
+        try:
+            with conn.cursor() as cursor:
+                where, params = _window_clause(days)
+                cursor.execute(
+                    f"SELECT ca.category_id, COUNT(*) AS cnt FROM comment_analysis ca {where} GROUP BY ca.category_id",
+                    params)
+                return _category_totals(cursor.fetchall())
+        except Exception as e:
+            print(f"❌ 대시보드 통계 조회 에러: {e}")
+            raise
+
+
+def get_video_stats(days: int = None, limit: int = 20) -> list:
+    """비디오별 분석 건수 (위험 댓글이 많은 순)"""
+    with db_connection() as conn:
+        if not conn:
+            raise ConnectionError("DB 연결 실패")
+        try:
+            with conn.cursor() as cursor:
+                where, params = _window_clause(days)
+                cursor.execute(f"""
+                SELECT c.video_id, v.title, v.channel_name, {_CATEGORY_SUMS}
+                FROM comment_analysis ca
+                JOIN comments c ON c.comment_id = ca.comment_id
+                JOIN videos v ON v.video_id = c.video_id
+                {where}
+                GROUP BY c.video_id, v.title, v.channel_name
+                ORDER BY abuse DESC, total DESC
+                LIMIT %s
+                """, (*params, limit))
+                return [_int_counts(row) for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"❌ 비디오별 통계 조회 에러: {e}")
+            raise
+
+
+def get_video_summary(video_id: str) -> dict:
+    """비디오 하나의 카테고리별 건수 (idx_video_id)"""
+    with db_connection() as conn:
+        if not conn:
+            raise ConnectionError("DB 연결 실패")
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"""
+                SELECT v.video_id, v.title, v.channel_id, v.channel_name, {_CATEGORY_SUMS}
+                FROM videos v
+                JOIN comments c ON c.video_id = v.video_id
+                JOIN comment_analysis ca ON ca.comment_id = c.comment_id
+                WHERE v.video_id = %s
+                GROUP BY v.video_id, v.title, v.channel_id, v.channel_name
+                """, (video_id,))
+                row = cursor.fetchone()
+                return _int_counts(row) if row else None
+        except Exception as e:
+            print(f"❌ 비디오 통계 조회 에러: {e}")
+            raise
+
+
+def get_channel_stats(days: int = None, limit: int = 20) -> list:
+    """채널별 분석 건수 (위험 댓글이 많은 순)"""
+    with db_connection() as conn:
+        if not conn:
+            raise ConnectionError("DB 연결 실패")
+        try:
+            with conn.cursor() as cursor:
+                where, params = _window_clause(days)
+                cursor.execute(f"""
+                SELECT v.channel_id, MAX(v.channel_name) AS channel_name,
+                       COUNT(DISTINCT v.video_id) AS videos, {_CATEGORY_SUMS}
+                FROM comment_analysis ca
+                JOIN comments c ON c.comment_id = ca.comment_id
+                JOIN videos v ON v.video_id = c.video_id
+                {where}
+                GROUP BY v.channel_id
+                ORDER BY abuse DESC, total DESC
+                LIMIT %s
+                """, (*params, limit))
+                rows = cursor.fetchall()
+                for row in rows:
+                    row['videos'] = int(row['videos'] or 0)
+                return [_int_counts(row) for row in rows]
+        except Exception as e:
+            print(f"❌ 채널별 통계 조회 에러: {e}")
+            raise
+
+
+def get_timeline_stats(days: int = 7, bucket: str = "day") -> list:
+    """기간별 카테고리 건수 [{"bucket": "2024-01-01", "total", "normal", "abuse", "spam"}, ...]"""
+    fmt = "%%Y-%%m-%%d %%H:00" if bucket == "hour" else "%%Y-%%m-%%d"
+    with db_connection() as conn:
+        if not conn:
+            raise ConnectionError("DB 연결 실패")
+        try:
+            with conn.cursor() as cursor:
+                where, params = _window_clause(days)
+                cursor.execute(f"""
+                SELECT DATE_FORMAT(ca.analyzed_at, '{fmt}') AS bucket, {_CATEGORY_SUMS}
+                FROM comment_analysis ca
+                {where}
+                GROUP BY bucket
+                ORDER BY bucket
+                """, params)
+                return [_int_counts(row) for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"❌ 기간별 통계 조회 에러: {e}")
+            raise
+
+
+# ==============================
+# 감시 목록 (watchlist): 새 댓글 주기 확인
+# ==============================
+SQL_CREATE_WATCHLIST = """
+CREATE TABLE IF NOT EXISTS watchlist (
+    video_id VARCHAR(20) PRIMARY KEY,
+    active BOOLEAN DEFAULT TRUE,
+    high_water_mark VARCHAR(30),
+    poll_interval INT NOT NULL DEFAULT 1800,
+    next_poll_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_polled_at DATETIME,
+    last_new_count INT DEFAULT 0,
+    total_new_count INT DEFAULT 0,
+    last_error VARCHAR(500),
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_next_poll (active, next_poll_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+
+def add_watch(video_id: str, poll_interval: int) -> bool:
+    """
+    감시 목록에 추가 (이미 있으면 다시 활성화)
+    이미 수집한 댓글이 있으면 가장 최근 작성일시를 시작 기준(high_water_mark)으로 사용
+    → 첫 확인부터 그 이후 댓글만 받음
+    """
+    with db_connection() as conn:
+        if not conn:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT DATE_FORMAT(MAX(published_at), '%%Y-%%m-%%dT%%H:%%i:%%sZ') AS hwm "
+                    "FROM comments WHERE video_id = %s", (video_id,))
+                row = cursor.fetchone()
+                cursor.execute(
+                    "INSERT INTO watchlist (video_id, high_water_mark, poll_interval, next_poll_at) "
+                    "VALUES (%s, %s, %s, NOW()) "
+                    "ON DUPLICATE KEY UPDATE active=TRUE, next_poll_at=NOW(), "
+                    "high_water_mark=COALESCE(high_water_mark, VALUES(high_water_mark))",
+                    (video_id, row['hwm'] if row else None, poll_interval))
+            conn.commit()
+            return True
+        except Exception as e:
+            print(f"❌ 감시 목록 추가 에러: {e}")
+            return False
+
+
+def remove_watch(video_id: str) -> bool:
+    """감시 중지 (기록은 남김)"""
+    with db_connection() as conn:
+        if not conn:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("UPDATE watchlist SET active=FALSE WHERE video_id = %s", (video_id,))
+                changed = cursor.rowcount
+            conn.commit()
+            return bool(changed)
+        except Exception as e:
+            print(f"❌ 감시 목록 삭제 에러: {e}")
+            return False
+
+
+def get_watchlist() -> list:
+    with db_connection() as conn:
+        if not conn:
+            return []
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT * FROM watchlist ORDER BY active DESC, next_poll_at")
+                return cursor.fetchall()
+        except Exception as e:
+            print(f"❌ 감시 목록 조회 에러: {e}")
+            return []
+
+
+def get_due_watches(limit: int) -> list:
+    """
+    확인할 때가 된 영상 (next_poll_at이 지난 순서대로)
+    since_last_poll: 지난 확인 후 지난 초 (DB 시계 기준으로 계산 → 앱 / DB 시간대가 달라도 정확)
+    """
+    with db_connection() as conn:
+        if not conn:
+            return []
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT video_id, high_water_mark, poll_interval, last_polled_at, "
+                    "TIMESTAMPDIFF(SECOND, last_polled_at, NOW()) AS since_last_poll FROM watchlist "
+                    "WHERE active = TRUE AND next_poll_at <= NOW() ORDER BY next_poll_at LIMIT %s", (limit,))
+                return cursor.fetchall()
+        except Exception as e:
+            print(f"❌ 감시 대상 조회 에러: {e}")
+            return []
+
+
+def update_watch(video_id: str, high_water_mark: str, poll_interval: int, new_count: int, error: str = None):
+    """확인 결과 기록 + 다음 확인 시각 예약"""
+    with db_connection() as conn:
+        if not conn:
+            return
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE watchlist SET high_water_mark=%s, poll_interval=%s, "
+                    "next_poll_at=NOW() + INTERVAL %s SECOND, last_polled_at=NOW(), "
+                    "last_new_count=%s, total_new_count=total_new_count + %s, last_error=%s "
+                    "WHERE video_id = %s",
+                    (high_water_mark, poll_interval, poll_interval, new_count, new_count,
+                     error[:500] if error else None, video_id))
+            conn.commit()
+        except Exception as e:
+            print(f"❌ 감시 결과 기록 에러: {e}")
+
+
+# ==============================
+# 작성자 위험도 / 블랙리스트
+# ==============================
+SQL_CREATE_AUTHOR_PROFILES = """
+CREATE TABLE IF NOT EXISTS author_profiles (
+    user_id VARCHAR(50) PRIMARY KEY,
+    username VARCHAR(200),
+    total_count INT NOT NULL DEFAULT 0,
+    normal_count INT NOT NULL DEFAULT 0,
+    danger_count INT NOT NULL DEFAULT 0,
+    spam_count INT NOT NULL DEFAULT 0,
+    video_count INT NOT NULL DEFAULT 0,
+    last_offense_at DATETIME,
+    last_comment_at DATETIME,
+    risk_score FLOAT NOT NULL DEFAULT 0,
+    blacklisted BOOLEAN NOT NULL DEFAULT FALSE,
+    blacklist_reason VARCHAR(200),
+    blacklisted_at DATETIME,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_risk (blacklisted, risk_score),
+    INDEX idx_blacklisted_at (blacklisted, blacklisted_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+SQL_CREATE_AUTHOR_VIDEOS = """
+CREATE TABLE IF NOT EXISTS author_videos (
+    user_id VARCHAR(50) NOT NULL,
+    video_id VARCHAR(20) NOT NULL,
+    PRIMARY KEY (user_id, video_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+_AUTHOR_COLUMNS = """
+    user_id, username, total_count, normal_count, danger_count, spam_count, video_count,
+    last_offense_at, last_comment_at, risk_score, blacklisted, blacklist_reason, blacklisted_at
+"""
+
+
+def get_blacklisted_authors() -> dict:
+    """
+    블랙리스트 {user_id: 카테고리} (메모리 블랙리스트 로드용)
+    카테고리는 작성자의 주된 위반 유형 (스팸이 더 많으면 '스팸', 아니면 '위험')
+    """
+    with db_connection() as conn:
+        if not conn:
+            return None
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT user_id, spam_count > danger_count AS spammer FROM author_profiles WHERE blacklisted = TRUE")
+                return {row['user_id']: '스팸' if row['spammer'] else '위험' for row in cursor.fetchall()}
+        except Exception as e:
+            print(f"❌ 블랙리스트 조회 에러: {e}")
+            return None
+
+
+def get_blacklist_page(page: int = 1, per_page: int = 50) -> dict:
+    """차단된 작성자 목록 (최근 등록 순, idx_blacklisted_at)"""
+    return _author_page("WHERE blacklisted = TRUE ORDER BY blacklisted_at DESC", (), page, per_page)
+
+
+def get_risky_authors(page: int = 1, per_page: int = 50, min_comments: int = 3) -> dict:
+    """차단 후보: 아직 차단되지 않은 작성자를 위험도 순으로 (idx_risk)"""
+    return _author_page(
+        "WHERE blacklisted = FALSE AND risk_score > 0 AND total_count >= %s ORDER BY risk_score DESC",
+        (min_comments,), page, per_page)
+
+
+def _author_page(where_order: str, params: tuple, page: int, per_page: int) -> dict:
+    page, per_page = max(1, page), max(1, min(per_page, 100))
+    result = {"items": [], "page": page, "per_page": per_page, "has_next": False}
+    with db_connection() as conn:
+        if not conn:
+            return result
+        try:
+            with conn.cursor() as cursor:
+                # 한 개 더 읽어서 다음 페이지 여부 판단 (전체 COUNT 없음)
+                cursor.execute(
+                    f"SELECT {_AUTHOR_COLUMNS} FROM author_profiles {where_order} LIMIT %s OFFSET %s",
+                    (*params, per_page + 1, (page - 1) * per_page))
+                rows = cursor.fetchall()
+                result["has_next"] = len(rows) > per_page
+                result["items"] = rows[:per_page]
+                return result
+        except Exception as e:
+            print(f"❌ 작성자 목록 조회 에러: {e}")
+            return result
+
+
+def get_author_profile(user_id: str) -> dict:
+    with db_connection() as conn:
+        if not conn:
+            return None
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SELECT {_AUTHOR_COLUMNS} FROM author_profiles WHERE user_id = %s", (user_id,))
+                return cursor.fetchone()
+        except Exception as e:
+            print(f"❌ 작성자 조회 에러: {e}")
+            return None
+
+
+def set_blacklisted(user_id: str, blacklisted: bool, reason: str = None) -> bool:
+    """차단 / 해제 (집계 행이 없는 작성자도 차단할 수 있도록 upsert)"""
+    with db_connection() as conn:
+        if not conn:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                if blacklisted:
+                    cursor.execute(
+                        "INSERT INTO author_profiles (user_id, username, blacklisted, blacklist_reason, blacklisted_at) "
+                        "SELECT %s, (SELECT username FROM users WHERE user_id = %s), TRUE, %s, NOW() "
+                        "ON DUPLICATE KEY UPDATE blacklisted=TRUE, blacklist_reason=VALUES(blacklist_reason), "
+                        "blacklisted_at=NOW()",
+                        (user_id, user_id, reason))
+                    changed = True
+                else:
+                    cursor.execute(
+                        "UPDATE author_profiles SET blacklisted=FALSE, blacklist_reason=NULL, blacklisted_at=NULL "
+                        "WHERE user_id = %s AND blacklisted = TRUE", (user_id,))
+                    changed = cursor.rowcount > 0
+            conn.commit()
+            return changed
+        except Exception as e:
+            print(f"❌ 블랙리스트 변경 에러: {e}")
+            return False
+
+
+def rebuild_author_profiles() -> int:
+    """
+    작성자 집계를 comments / comment_analysis 전체에서 다시 계산 (최초 도입 / 복구용)
+    댓글마다 가장 최근 분석 행 기준, 블랙리스트 여부는 유지
+    (저장 시 집계와 같은 기준: 버전 없는 분석 행 / 블랙리스트 판정은 세지 않음)
+    """
+    with db_connection() as conn:
+        if not conn:
+            return 0
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("INSERT IGNORE INTO author_videos (user_id, video_id) "
+                               "SELECT DISTINCT user_id, video_id FROM comments")
+                cursor.execute("""
+                INSERT INTO author_profiles (user_id, username, total_count, normal_count, danger_count,
+                    spam_count, video_count, last_offense_at, last_comment_at, risk_score)
+                SELECT c.user_id, MAX(u.username), COUNT(*),
+                       SUM(ca.category_id = 1), SUM(ca.category_id = 2), SUM(ca.category_id = 3),
+                       COUNT(DISTINCT c.video_id),
+                       MAX(CASE WHEN ca.category_id <> 1 THEN c.published_at END), MAX(c.published_at),
+                       (SUM(ca.category_id = 2) + 0.5 * SUM(ca.category_id = 3)) / (COUNT(*) + 3)
+                FROM comments c
+                JOIN comment_analysis ca ON ca.analysis_id = (
+                    SELECT MAX(analysis_id) FROM comment_analysis WHERE comment_id = c.comment_id
+                      AND model_version IS NOT NULL AND model_version <> %s)
+                LEFT JOIN users u ON u.user_id = c.user_id
+                GROUP BY c.user_id
+                ON DUPLICATE KEY UPDATE username=VALUES(username), total_count=VALUES(total_count),
+                    normal_count=VALUES(normal_count), danger_count=VALUES(danger_count),
+                    spam_count=VALUES(spam_count), video_count=VALUES(video_count),
+                    last_offense_at=VALUES(last_offense_at), last_comment_at=VALUES(last_comment_at),
+                    risk_score=VALUES(risk_score)
+                """, (BLACKLIST_MODEL_VERSION,))
+                count = cursor.rowcount
+            conn.commit()
+            return count
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ 작성자 집계 재계산 에러: {e}")
+            return 0
+
 
 # ==============================
 # 4. DB 초기화 (컬럼명 오류 해결)
 # ==============================
 
 
-def init_database():
-    conn = get_db_connection()
-    if not conn:
+def _ensure_column(cursor, table: str, column: str, definition: str, index_name: str = None):
+    """컬럼이 없으면 추가 (init_db.sql 이전에 만든 DB용)"""
+    cursor.execute(
+        "SELECT COUNT(*) AS cnt FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+        (table, column)
+    )
+    if cursor.fetchone()['cnt']:
         return
-    try:
-        with conn.cursor() as cursor:
-            # [해결] 컬럼명을 알 수 없을 때를 대비해 display_name 등으로 시도
-            # 먼저 categories 테이블의 실제 컬럼명을 확인하는 것이 좋으나,
-            # 가장 흔한 'category_name'과 'name' 두 가지를 모두 시도하도록 수정
-            categories = [(1, '정상'), (2, '위험'), (3, '스팸')]
-
-            try:
-                cursor.executemany(
-                    "INSERT IGNORE INTO categories (category_id, name) VALUES (%s, %s)", categories)
-            except:
+    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    if index_name:
+        cursor.execute(f"CREATE INDEX {index_name} ON {table} ({column})")
+    print(f"✅ {table}.{column} 컬럼 추가")
+
+
+def init_database():
+    with db_connection() as conn:
+        if not conn:
+            return
+        try:
+            with conn.cursor() as cursor:
+                # [해결] 컬럼명을 알 수 없을 때를 대비해 display_name 등으로 시도
+                # 먼저 categories 테이블의 실제 컬럼명을 확인하는 것이 좋으나,
+                # 가장 흔한 'category_name'과 'name' 두 가지를 모두 시도하도록 수정
+                categories = [(1, '정상'), (2, '위험'), (3, '스팸')]
+
                 try:
                     cursor.executemany(
-                        "INSERT IGNORE INTO categories (category_id, display_name) VALUES (%s, %s)", categories)
+                        "INSERT IGNORE INTO categories (category_id, name) VALUES (%s, %s)", categories)
                 except:
-                    cursor.executemany(
-                        "INSERT IGNORE INTO categories (category_id, category_name) VALUES (%s, %s)", categories)
+                    try:
+                        cursor.executemany(
+                            "INSERT IGNORE INTO categories (category_id, display_name) VALUES (%s, %s)", categories)
+                    except:
+                        cursor.executemany(
+                            "INSERT IGNORE INTO categories (category_id, category_name) VALUES (%s, %s)", categories)
 
-        conn.commit()
-        print("✅ DB 카테고리 초기화 완료")
-    except Exception as e:
-        print(f"⚠️ 초기화 최종 실패: {e}")
-    finally:
-        conn.close()
+                # 유사 댓글 묶음 ID 컬럼 (기존 DB 마이그레이션)
+                _ensure_column(cursor, "comments", "cluster_id",
+                               "VARCHAR(100) NULL COMMENT '유사 댓글 묶음 ID (대표 댓글의 YouTube 댓글 ID)'",
+                               "idx_cluster_id")
+
+                # 새 댓글 감시 목록
+                cursor.execute(SQL_CREATE_WATCHLIST)
+
+                # 작성자 위험도 / 블랙리스트
+                cursor.execute(SQL_CREATE_AUTHOR_PROFILES)
+                cursor.execute(SQL_CREATE_AUTHOR_VIDEOS)
+
+            conn.commit()
+            print("✅ DB 카테고리 초기화 완료")
+        except Exception as e:
+            print(f"⚠️ 초기화 최종 실패: {e}")
@@ -0,0 +1,190 @@
+# ==============================
+# MySQL 커넥션 풀
+# ==============================
+# - 스레드 안전 (threading.Condition)
+# - min_size / max_size, 대기 타임아웃(timeout), 재사용 한도(recycle)
+# - 대여 시 ping으로 끊어진 연결 걸러냄
+# - with pool.connection() as conn: 형태로 사용
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pymysql
+from pymysql.constants import SERVER_STATUS
+
+
+class PoolTimeout(Exception):
+    """timeout 안에 커넥션을 빌리지 못했을 때"""
+
+
+class ConnectionPool:
+
+    def __init__(self, connect_kwargs: dict, min_size: int = 1, max_size: int = 10,
+                 timeout: float = 5.0, recycle: float = 3600.0):
+        self.connect_kwargs = connect_kwargs
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.recycle = recycle
+
+        self._idle = deque()        # (conn, created_at)
+        self._created_at = {}       # id(conn) → 생성 시각
+        self._size = 0              # 열려 있는 커넥션 수 (대여 중 포함)
+        self._cond = threading.Condition()
+        self._warmed = False
+
+        # 지표
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.created = 0
+        self.recycled = 0
+        self.ping_failures = 0
+        self.wait_seconds = 0.0
+
+    def _connect(self):
+        conn = pymysql.connect(**self.connect_kwargs)
+        self._created_at[id(conn)] = time.monotonic()
+        self.created += 1
+        return conn
+
+    def _discard(self, conn):
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _warmup(self):
+        """min_size 개수만큼 미리 연결 (첫 대여 시 1회)"""
+        self._warmed = True
+        for _ in range(self.min_size - 1):
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                return
+            with self._cond:
+                self._idle.append((conn, self._created_at[id(conn)]))
+                self._cond.notify()
+
+    def acquire(self, timeout: float = None):
+        """커넥션 대여 (idle 재사용 → 새로 생성 → 반납 대기 순)"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        started = time.monotonic()
+
+        while True:
+            conn = None
+            create = False
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeout(f"DB 커넥션 대기 시간 초과 ({timeout}s, max_size={self.max_size})")
+                    self.waits += 1
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, created_at = self._idle.pop()
+                else:
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                if not self._warmed:
+                    self._warmup()
+            else:
+                # 오래된 연결은 교체, 살아 있는지 ping으로 확인
+                if time.monotonic() - created_at > self.recycle:
+                    self.recycled += 1
+                    self._discard(conn)
+                    continue
+                try:
+                    conn.ping(reconnect=False)
+                except Exception:
+                    self.ping_failures += 1
+                    self._discard(conn)
+                    continue
+
+            self.checkouts += 1
+            self.wait_seconds += time.monotonic() - started
+            return conn
+
+    def release(self, conn, broken: bool = False):
+        """커넥션 반납 (broken=True면 닫고 버림)"""
+        if broken or not conn.open:
+            self._discard(conn)
+            return
+        # 커밋되지 않은 트랜잭션이 남아 있으면 다음 사용자에게 넘기기 전에 정리
+        if conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+            try:
+                conn.rollback()
+            except Exception:
+                self._discard(conn)
+                return
+        with self._cond:
+            self._idle.append((conn, self._created_at.get(id(conn), time.monotonic())))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        """
+        with pool.connection() as conn:
+            ...
+        블록에서 예외가 나면 롤백 후 반납한다.
+        """
+        conn = self.acquire(timeout)
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self.release(conn, broken)
+
+    def close_all(self):
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        with self._cond:
+            idle = len(self._idle)
+            size = self._size
+        return {
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "timeouts": self.timeouts,
+            "created": self.created,
+            "recycled": self.recycled,
+            "ping_failures": self.ping_failures,
+            "avg_wait_ms": round(self.wait_seconds * 1000 / self.checkouts, 3) if self.checkouts else 0.0
+        }
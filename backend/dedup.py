@@ -0,0 +1,164 @@
+# ==============================
+# 유사 댓글(도배 / 스팸 캠페인) 묶기
+# ==============================
+# - 정규화된 댓글의 글자 3-gram 집합으로 MinHash 서명 계산 (NumPy 벡터 연산)
+# - LSH(밴드 단위 버킷)로 후보만 비교 → 댓글 수에 거의 선형
+# - 서명 일치율(≈ Jaccard 유사도)이 DEDUP_THRESHOLD 이상이면 같은 묶음
+# - 묶음마다 대표 댓글 하나만 분류하고 나머지는 대표의 판정을 그대로 사용
+#   (판정은 model_version이 지금 분류기 버전 목록에 있을 때만 재사용
+#    → 규칙 / 정규화 / 모델이 바뀌면 채널 인덱스에 남은 이전 판정은 무시하고 새로 분류)
+# - 묶음 ID = 대표 댓글의 youtube_comment_id (comments.cluster_id 에 저장)
+# - 인덱스는 스캔마다 새로 만들거나, 채널 단위로 메모리에 보관해 다른 영상 스캔에서도 재사용
+import os
+import threading
+
+try:
+    import numpy as np
+except ImportError:     # NumPy가 없으면 유사 댓글 묶기 단계는 건너뜀
+    np = None
+
+from backend.cache import LRUCache
+
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1") == "1"
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.6"))
+# 이보다 짧은 댓글은 묶지 않음
+# (짧은 댓글은 한두 글자만 달라도 뜻이 바뀜: "정말 좋아요" / "정말 싫어요", 같은 텍스트는 캐시로 처리)
+DEDUP_MIN_LENGTH = int(os.getenv("DEDUP_MIN_LENGTH", "20"))
+DEDUP_MAX_ENTRIES = int(os.getenv("DEDUP_MAX_ENTRIES", "50000"))       # 인덱스 하나당 최대 댓글 수
+# 채널 단위 인덱스 보관 (0이면 스캔마다 새로 만듦)
+DEDUP_CHANNEL_INDEXES = int(os.getenv("DEDUP_CHANNEL_INDEXES", "100"))
+DEDUP_CHANNEL_TTL = int(os.getenv("DEDUP_CHANNEL_TTL", str(24 * 3600)))
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16                  # 16 밴드 x 4 행: 후보로 잡힐 확률 유사도 0.6 → 약 89%, 0.8 → 99.9%
+ROWS = NUM_PERM // BANDS
+
+_PRIME = 1000003
+_MOD = 4294967311           # 2^32 보다 큰 소수
+# x(3-gram 해시) < 2^32, a < 2^31, b < _MOD → a*x + b < 2^63 + 2^33 이라 uint64 안에서 넘치지 않음
+_rng = np.random.default_rng(20240101) if np is not None else None
+_PERM_A = _rng.integers(1, 2 ** 31, NUM_PERM, dtype=np.uint64) if np is not None else None
+_PERM_B = _rng.integers(0, _MOD, NUM_PERM, dtype=np.uint64) if np is not None else None
+
+
+def minhash_signatures(texts: list):
+    """
+    텍스트 목록 → (텍스트 수, NUM_PERM) MinHash 서명
+    모든 텍스트를 이어 붙여 3-gram 해시를 한 번에 계산하고,
+    텍스트별 최솟값은 np.minimum.reduceat으로 구한다. (텍스트 길이 >= SHINGLE_SIZE)
+    """
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    doc_of = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+
+    h = codes
+    for k in range(1, SHINGLE_SIZE):
+        h = h[:-1] * np.uint64(_PRIME) + codes[k:]
+    valid = doc_of[:len(h)] == doc_of[SHINGLE_SIZE - 1:]
+    shingles = (h[valid] >> np.uint64(32)) ^ (h[valid] & np.uint64(0xFFFFFFFF))
+
+    hashed = (shingles[:, None] * _PERM_A + _PERM_B) % np.uint64(_MOD)
+    starts = np.concatenate([[0], np.cumsum(lengths - (SHINGLE_SIZE - 1))[:-1]])
+    return np.minimum.reduceat(hashed, starts, axis=0)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash LSH 인덱스 (스레드 안전)
+
+    assign(ids, texts) → 텍스트마다 묶음 ID (짧아서 묶지 않은 텍스트는 None)
+    set_label / get_label 로 묶음 대표의 판정을 공유 (versions: 지금 유효한 model_version 목록)
+    """
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, max_entries: int = DEDUP_MAX_ENTRIES):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._buckets = {}          # (밴드, 서명 조각) → [항목 번호]
+        self._signatures = np.empty((1024, NUM_PERM), dtype=np.uint64)     # 항목 번호 → 서명
+        self._size = 0
+        self._clusters = []         # 항목 번호 → 묶음 ID
+        self._labels = {}           # 묶음 ID → 분석 결과
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def _append(self, sig, cluster_id, band_keys):
+        if self._size == len(self._signatures):
+            grown = np.empty((len(self._signatures) * 2, NUM_PERM), dtype=np.uint64)
+            grown[:self._size] = self._signatures
+            self._signatures = grown
+        entry = self._size
+        self._signatures[entry] = sig
+        self._size += 1
+        self._clusters.append(cluster_id)
+        for key in band_keys:
+            self._buckets.setdefault(key, []).append(entry)
+
+    def assign(self, ids: list, texts: list) -> list:
+        clusters = [None] * len(ids)
+        targets = [i for i, t in enumerate(texts) if len(t) >= max(DEDUP_MIN_LENGTH, SHINGLE_SIZE)]
+        if not targets:
+            return clusters
+        signatures = minhash_signatures([texts[i] for i in targets])
+
+        with self._lock:
+            for i, sig in zip(targets, signatures):
+                raw = sig.tobytes()
+                step = ROWS * sig.itemsize
+                band_keys = [(b, raw[b * step:(b + 1) * step]) for b in range(BANDS)]
+                candidates = list({entry for key in band_keys for entry in self._buckets.get(key, ())})
+
+                clusters[i] = ids[i]
+                exact = False
+                if candidates:
+                    # 후보 서명들과의 일치율을 한 번에 계산
+                    scores = (self._signatures[candidates] == sig).mean(axis=1)
+                    best = int(scores.argmax())
+                    if scores[best] >= self.threshold:
+                        clusters[i] = self._clusters[candidates[best]]
+                        exact = scores[best] == 1.0
+
+                # 서명까지 같은 항목이 이미 있으면 (재스캔 등) 인덱스를 키우지 않음
+                if not exact and self._size < self.max_entries:
+                    self._append(sig, clusters[i], band_keys)
+        return clusters
+
+    def get_label(self, cluster_id, versions: list = None):
+        """묶음 판정 (versions에 없는 버전으로 만든 판정은 None)"""
+        label = self._labels.get(cluster_id)
+        if label is not None and versions is not None and label.get("model_version") not in versions:
+            return None
+        return label
+
+    def set_label(self, cluster_id, analysis: dict, versions: list = None):
+        """처음 들어온 판정을 유지하되, 이전 버전 판정이면 새 판정으로 교체"""
+        if cluster_id is None:
+            return
+        with self._lock:
+            current = self._labels.get(cluster_id)
+            if current is None or (versions is not None and current.get("model_version") not in versions):
+                self._labels[cluster_id] = analysis
+
+
+# 채널 ID → NearDuplicateIndex
+_channel_indexes = LRUCache(maxsize=max(1, DEDUP_CHANNEL_INDEXES), ttl=DEDUP_CHANNEL_TTL)
+_channel_lock = threading.Lock()
+
+
+def get_dedup_index(channel_id: str = None):
+    """
+    스캔에 쓸 인덱스 반환 (NumPy가 없거나 꺼져 있으면 None)
+    channel_id가 있고 채널 단위 보관이 켜져 있으면 같은 채널의 이전 스캔 인덱스를 이어서 사용
+    """
+    if not DEDUP_ENABLED or np is None:
+        return None
+    if not channel_id or DEDUP_CHANNEL_INDEXES <= 0:
+        return NearDuplicateIndex()
+    with _channel_lock:
+        index = _channel_indexes.get(channel_id)
+        if index is None:
+            index = NearDuplicateIndex()
+            _channel_indexes.set(channel_id, index)
+        return index
@@ -0,0 +1,296 @@
+# ==============================
+# 로컬 필터 엔진 (정규식 1개로 한 번에 검사)
+# ==============================
+# - 욕설 / 광고 / 부정어 / 긍정어 규칙을 하나의 정규식으로 합쳐 미리 컴파일
+# - 댓글 텍스트를 한 번만 훑으면서 어떤 규칙이 걸렸는지 함께 알려줌
+# - 규칙에 걸린 위치 바로 다음 글자부터 다시 검사하므로 URL 안에 욕설이 있는 것처럼
+#   규칙끼리 겹쳐도 우선순위(욕설 → 광고 → 부정어 → 긍정어)가 유지됨
+#   ((?=...) 로 감싸면 정규식 엔진의 첫 글자 건너뛰기 최적화가 꺼져서 느려짐)
+# - 규칙들이 시작할 수 있는 글자를 모은 문자 클래스로 후보 위치만 골라서 검사
+# - 규칙은 버전이 붙은 JSON 파일(filter_rules.json)에서 읽고,
+#   파일이 바뀌면 새 RuleMatcher를 만들어 통째로 교체 (재시작 불필요)
+import json
+import os
+import re
+import threading
+import time
+
+try:
+    from re import _parser as _sre_parse, _constants as _sre
+except ImportError:     # Python 3.10 이하
+    import sre_parse as _sre_parse
+    import sre_constants as _sre
+
+# 규칙 종류 (그룹 이름 접두사) — 앞에 있을수록 우선순위가 높음
+KIND_BADWORD = "b"
+KIND_AD = "a"
+KIND_NEGATIVE = "n"
+KIND_POSITIVE = "p"
+
+# 규칙 파일 위치 / 변경 확인 주기(초, 음수면 자동 확인 끔)
+RULES_PATH = os.getenv(
+    "FILTER_RULES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "filter_rules.json")
+)
+RULES_CHECK_INTERVAL = float(os.getenv("FILTER_RULES_CHECK_INTERVAL", "5"))
+
+# 규칙 파일을 읽지 못했을 때 쓰는 빈 규칙의 버전 (모든 댓글이 GPT로 감)
+EMPTY_RULES_VERSION = "local-none"
+
+# 긍정어 통과 조건: 최소 글자 수 / 이모티콘 반응 최대 글자 수
+POSITIVE_MIN_LENGTH = 5
+EMOJI_MAX_LENGTH = 3
+
+
+def _check_pattern(pattern: str) -> str:
+    """규칙 정규식 검증 (캡처 그룹이 있으면 어떤 규칙이 걸렸는지 알 수 없으므로 거부)"""
+    compiled = re.compile(pattern)
+    if compiled.groups:
+        raise ValueError(f"규칙에는 캡처 그룹을 쓸 수 없습니다 ((?:...) 사용): {pattern}")
+    return pattern
+
+
+_CATEGORY_ESCAPES = {
+    _sre.CATEGORY_DIGIT: r"\d", _sre.CATEGORY_NOT_DIGIT: r"\D",
+    _sre.CATEGORY_SPACE: r"\s", _sre.CATEGORY_NOT_SPACE: r"\S",
+    _sre.CATEGORY_WORD: r"\w", _sre.CATEGORY_NOT_WORD: r"\W",
+}
+
+
+def _first_chars(items):
+    """
+    파싱된 정규식의 첫 글자가 될 수 있는 문자 클래스 항목 집합
+    (알아낼 수 없는 형태면 None → 후보 위치 필터 없이 전체 검사)
+    """
+    for op, av in items:
+        if op is _sre.LITERAL:
+            return {re.escape(chr(av))}
+        if op is _sre.IN:
+            out = set()
+            for item_op, item_av in av:
+                if item_op is _sre.LITERAL:
+                    out.add(re.escape(chr(item_av)))
+                elif item_op is _sre.RANGE:
+                    out.add(f"{re.escape(chr(item_av[0]))}-{re.escape(chr(item_av[1]))}")
+                elif item_op is _sre.CATEGORY and item_av in _CATEGORY_ESCAPES:
+                    out.add(_CATEGORY_ESCAPES[item_av])
+                else:
+                    return None
+            return out
+        if op is _sre.SUBPATTERN:
+            return _first_chars(av[-1])
+        if op in (_sre.MAX_REPEAT, _sre.MIN_REPEAT):
+            low, _, sub = av
+            return _first_chars(sub) if low > 0 else None
+        if op is _sre.BRANCH:
+            out = set()
+            for branch in av[1]:
+                chars = _first_chars(branch)
+                if chars is None:
+                    return None
+                out |= chars
+            return out
+        return None
+    return None
+
+
+class RuleMatcher:
+    """
+    컴파일된 로컬 필터 규칙 묶음 (생성 후 변경하지 않음)
+
+    match(text) → {"category", "reason", "rule"} 또는 None
+    """
+
+    def __init__(self, bad_word_patterns: list, ad_patterns: list,
+                 positive_words: list, negative_words: list, version: str = ""):
+        self.version = version
+        self.rules = {}         # 그룹 이름 → "종류:원본 규칙"
+        branches = []
+
+        def add(kind, label, pattern):
+            name = f"{kind}{len(self.rules)}"
+            self.rules[name] = f"{label}:{pattern}"
+            branches.append(f"(?P<{name}>{pattern})")
+
+        for pattern in bad_word_patterns:
+            add(KIND_BADWORD, "badword", _check_pattern(pattern))
+        for pattern in ad_patterns:
+            add(KIND_AD, "ad", _check_pattern(pattern))
+        for word in negative_words:
+            add(KIND_NEGATIVE, "negative", re.escape(word))
+        for word in positive_words:
+            add(KIND_POSITIVE, "positive", re.escape(word))
+
+        pattern = "|".join(branches)
+        self._regex = re.compile(pattern) if branches else None
+
+        # 후보 위치 필터: 규칙이 시작할 수 있는 글자만 모은 문자 클래스
+        self._trigger = None
+        if branches:
+            chars = _first_chars(_sre_parse.parse(pattern))
+            if chars:
+                self._trigger = re.compile("[" + "".join(sorted(chars)) + "]")
+
+    def _hits(self, text: str):
+        """걸린 (그룹 이름) 을 앞에서부터 순서대로 내보냄 (겹치는 규칙도 놓치지 않음)"""
+        if self._regex is None:
+            return
+        if self._trigger is None:
+            search = self._regex.search
+            m = search(text)
+            while m:
+                yield m.lastgroup
+                m = search(text, m.start() + 1)
+            return
+
+        find, match = self._trigger.search, self._regex.match
+        t = find(text)
+        while t:
+            pos = t.start()
+            m = match(text, pos)
+            if m:
+                yield m.lastgroup
+            t = find(text, pos + 1)
+
+    def scan(self, text: str) -> dict:
+        """종류별로 처음 걸린 규칙 이름 반환 (예: {"b": "badword:씨\\s*발"})"""
+        found = {}
+        for name in self._hits(text):
+            found.setdefault(name[0], self.rules[name])
+        return found
+
+    def match(self, text: str, original: str = None):
+        """
+        기존 로컬 필터 3종(욕설 → 광고 → 정상 빠른 통과)과 같은 판정을 한 번의 스캔으로 수행
+        욕설이 걸리면 그 자리에서 바로 종료
+
+        text가 정규화된 텍스트라면 original에 원문을 넘김
+        (이모티콘 / 최소 길이 조건은 원문 기준: ㅋㅋㅋㅋㅋㅋ → ㅋㅋㅋ 로 줄어도 긍정 통과)
+        """
+        ad_rule = negative_rule = positive_rule = None
+        if self._regex is not None:
+            for name in self._hits(text):
+                kind = name[0]
+                if kind == KIND_BADWORD:
+                    # '욕설'은 DB에서 '위험' 카테고리(ID: 2)로 분류
+                    return {"category": "위험", "reason": "욕설 패턴 감지", "rule": self.rules[name]}
+                if kind == KIND_AD:
+                    ad_rule = ad_rule or self.rules[name]
+                elif kind == KIND_NEGATIVE:
+                    negative_rule = negative_rule or self.rules[name]
+                else:
+                    positive_rule = positive_rule or self.rules[name]
+
+        if ad_rule:
+            # '광고'는 DB에서 '스팸' 카테고리(ID: 3)로 분류
+            return {"category": "스팸", "reason": "광고/홍보 의심", "rule": ad_rule}
+
+        stripped = (text if original is None else original).strip()
+        if len(stripped) <= EMOJI_MAX_LENGTH and not any(char.isalnum() for char in stripped):
+            return {"category": "정상", "reason": "이모티콘 반응", "rule": "emoji"}
+
+        if negative_rule:
+            return None
+
+        if positive_rule and len(stripped) >= POSITIVE_MIN_LENGTH:
+            return {"category": "정상", "reason": "긍정적 반응", "rule": positive_rule}
+        return None
+
+
+# ==============================
+# 규칙 파일 로드 / 변경 시 교체
+# ==============================
+def load_rules(path: str) -> RuleMatcher:
+    """
+    규칙 JSON 파일을 읽어 RuleMatcher 생성
+    {"version": "...", "bad_word_patterns": [...], "ad_patterns": [...],
+     "positive_words": [...], "negative_words": [...]}
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    version = data.get("version")
+    if not version:
+        raise ValueError(f"규칙 파일에 version이 없습니다: {path}")
+    return RuleMatcher(
+        data.get("bad_word_patterns", []), data.get("ad_patterns", []),
+        data.get("positive_words", []), data.get("negative_words", []),
+        version=str(version)
+    )
+
+
+class RuleStore:
+    """
+    현재 규칙(RuleMatcher)을 들고 있다가 파일이 바뀌면 새것으로 교체
+
+    - current(): 지금 규칙 반환 (check_interval마다 파일 수정 시각 확인)
+    - reload(): 강제로 다시 읽기 (관리자 API)
+    RuleMatcher는 생성 후 바뀌지 않으므로, 이미 current()로 받아 간 분류 작업은
+    교체와 상관없이 끝까지 이전 규칙을 사용한다.
+    읽기에 실패하면 기존 규칙을 그대로 유지한다.
+    """
+
+    def __init__(self, path: str = RULES_PATH, check_interval: float = RULES_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._matcher = RuleMatcher([], [], [], [], version=EMPTY_RULES_VERSION)
+        self._mtime = None
+        self._checked_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.loaded_at = None
+        self.reloads = 0
+        self.last_error = None
+
+        if self._file_mtime() is None:
+            print(f"⚠️ 필터 규칙 파일 없음: {path} (로컬 필터 없이 GPT로만 분류)")
+        self._reload_if_changed()
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _reload_if_changed(self):
+        mtime = self._file_mtime()
+        if mtime is None or mtime == self._mtime:
+            return
+        try:
+            self.reload()
+        except Exception as e:
+            print(f"⚠️ 필터 규칙 로드 실패 (기존 규칙 {self._matcher.version} 유지): {e}")
+
+    def current(self) -> RuleMatcher:
+        if self.check_interval >= 0:
+            now = time.monotonic()
+            if now - self._checked_at >= self.check_interval:
+                self._checked_at = now
+                self._reload_if_changed()
+        return self._matcher
+
+    def reload(self) -> RuleMatcher:
+        """규칙 파일을 다시 읽어 교체 (실패하면 예외를 올리고 기존 규칙 유지)"""
+        with self._lock:
+            mtime = self._file_mtime()
+            try:
+                matcher = load_rules(self.path)
+            except Exception as e:
+                # 같은 (깨진) 파일을 매번 다시 읽지 않도록 수정 시각은 기록
+                self._mtime = mtime
+                self.last_error = str(e)
+                raise
+            self._matcher = matcher     # 참조 한 번 교체 → 원자적
+            self._mtime = mtime
+            self.loaded_at = time.time()
+            self.reloads += 1
+            self.last_error = None
+        print(f"✅ 필터 규칙 로드: {matcher.version} (규칙 {len(matcher.rules)}개)")
+        return matcher
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "version": self._matcher.version,
+            "rules": len(self._matcher.rules),
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "last_error": self.last_error
+        }
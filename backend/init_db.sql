@@ -51,11 +51,13 @@ CREATE TABLE IF NOT EXISTS comments (
     published_at DATETIME NOT NULL COMMENT '작성일시',
     collected_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '수집일시',
     is_reply BOOLEAN DEFAULT FALSE COMMENT '답글 여부',
+    cluster_id VARCHAR(100) COMMENT '유사 댓글 묶음 ID (대표 댓글의 YouTube 댓글 ID)',
     INDEX idx_video_id (video_id),
     INDEX idx_user_id (user_id),
     INDEX idx_published_at (published_at),
     INDEX idx_parent_comment (parent_comment_id),
     INDEX idx_is_reply (is_reply),
+    INDEX idx_cluster_id (cluster_id),
     FULLTEXT INDEX idx_comment_text (comment_text)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='YouTube 댓글 정보';
 
@@ -74,6 +76,48 @@ CREATE TABLE IF NOT EXISTS comment_analysis (
     INDEX idx_analyzed_at (analyzed_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='댓글 분석 결과';
 
+-- 6. WATCHLIST 테이블: 주기적으로 새 댓글을 확인할 영상
+CREATE TABLE IF NOT EXISTS watchlist (
+    video_id VARCHAR(20) PRIMARY KEY COMMENT 'YouTube 비디오 ID',
+    active BOOLEAN DEFAULT TRUE COMMENT '감시 여부',
+    high_water_mark VARCHAR(30) COMMENT '마지막으로 본 댓글 작성일시 (YouTube publishedAt 형식)',
+    poll_interval INT NOT NULL DEFAULT 1800 COMMENT '다음 확인까지 간격(초, 댓글 속도에 따라 조정)',
+    next_poll_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '다음 확인 예정 시각',
+    last_polled_at DATETIME COMMENT '마지막 확인 시각',
+    last_new_count INT DEFAULT 0 COMMENT '마지막 확인에서 찾은 새 댓글 수',
+    total_new_count INT DEFAULT 0 COMMENT '감시 시작 후 찾은 새 댓글 수',
+    last_error VARCHAR(500) COMMENT '마지막 확인 오류',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '등록일시',
+    INDEX idx_next_poll (active, next_poll_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='새 댓글 감시 영상';
+
+-- 7. AUTHOR_PROFILES 테이블: 작성자별 누적 판정 (댓글 저장 시 함께 갱신)
+CREATE TABLE IF NOT EXISTS author_profiles (
+    user_id VARCHAR(50) PRIMARY KEY COMMENT '사용자 ID',
+    username VARCHAR(200) COMMENT '마지막으로 본 사용자명',
+    total_count INT NOT NULL DEFAULT 0 COMMENT '분석된 댓글 수',
+    normal_count INT NOT NULL DEFAULT 0 COMMENT '정상 댓글 수',
+    danger_count INT NOT NULL DEFAULT 0 COMMENT '위험 댓글 수',
+    spam_count INT NOT NULL DEFAULT 0 COMMENT '스팸 댓글 수',
+    video_count INT NOT NULL DEFAULT 0 COMMENT '댓글을 단 영상 수',
+    last_offense_at DATETIME COMMENT '마지막 위험 / 스팸 댓글 작성일시',
+    last_comment_at DATETIME COMMENT '마지막 댓글 작성일시',
+    risk_score FLOAT NOT NULL DEFAULT 0 COMMENT '위험도 (위험 + 0.5 x 스팸) / (전체 + 3)',
+    blacklisted BOOLEAN NOT NULL DEFAULT FALSE COMMENT '블랙리스트 여부',
+    blacklist_reason VARCHAR(200) COMMENT '차단 사유',
+    blacklisted_at DATETIME COMMENT '차단 등록 일시',
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '수정일시',
+    INDEX idx_risk (blacklisted, risk_score),
+    INDEX idx_blacklisted_at (blacklisted, blacklisted_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='작성자별 위험도';
+
+-- 8. AUTHOR_VIDEOS 테이블: 작성자가 댓글을 단 영상 (author_profiles.video_count 계산용)
+CREATE TABLE IF NOT EXISTS author_videos (
+    user_id VARCHAR(50) NOT NULL COMMENT '사용자 ID',
+    video_id VARCHAR(20) NOT NULL COMMENT '비디오 ID',
+    PRIMARY KEY (user_id, video_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='작성자-영상';
+
 -- 외래키 제약조건 추가
 ALTER TABLE comments 
 ADD CONSTRAINT fk_comments_video 
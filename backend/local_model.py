@@ -0,0 +1,300 @@
+# ==============================
+# 로컬 분류 모델 (정규식 필터 → [로컬 모델] → GPT)
+# ==============================
+# - 글자 n-gram(1~3) 해싱 + 선형(softmax) 모델, NumPy만 사용 (CPU / 오프라인)
+# - comment_analysis에 쌓인 판정(GPT / 로컬 규칙)으로 학습
+#     python -m backend.local_model train [--limit N] [--epochs N]
+#   → 실행 중인 서버는 POST /api/admin/local-model/reload 로 새 모델을 읽음
+# - 페이지 단위로 한 번에 점수 계산 (n-gram 해시 / 가중치 합산 모두 벡터 연산)
+# - 확률이 기준값 이상인 댓글만 확정, 나머지는 GPT로 넘김
+#   기준값은 학습 때 평가용 데이터에서 정확도 LOCAL_MODEL_TARGET_ACCURACY를 지키는
+#   가장 낮은 확률로 정해 모델 파일에 저장 (LOCAL_MODEL_THRESHOLD를 주면 그 값이 우선)
+# - NumPy가 없거나 모델 파일이 없으면 이 단계는 건너뜀
+import argparse
+import os
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:     # NumPy 없이도 서비스는 동작 (로컬 모델 단계만 빠짐)
+    np = None
+
+LOCAL_MODEL_PATH = os.getenv(
+    "LOCAL_MODEL_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "local_model.npz")
+)
+# 이 확률 이상일 때만 로컬 모델 판정을 사용 (나머지는 GPT)
+# 비워 두면 모델 파일에 저장된 보정값, 보정값이 없는 예전 모델은 DEFAULT_THRESHOLD
+DEFAULT_THRESHOLD = 0.9
+LOCAL_MODEL_THRESHOLD = float(os.getenv("LOCAL_MODEL_THRESHOLD")) if os.getenv("LOCAL_MODEL_THRESHOLD") else None
+# 보정 기준: 기준값 이상으로 확정한 댓글의 평가용 정확도가 이 값 이상
+LOCAL_MODEL_TARGET_ACCURACY = float(os.getenv("LOCAL_MODEL_TARGET_ACCURACY", "0.97"))
+MIN_THRESHOLD = 0.5         # 클래스 3개에서 이보다 낮으면 사실상 최고 확률이 아님
+LOCAL_MODEL_ENABLED = os.getenv("LOCAL_MODEL_ENABLED", "1") == "1"
+
+# 모델 판정의 model_version 접두사 (학습 데이터에서 모델 자신의 판정을 빼는 데 사용)
+MODEL_VERSION_PREFIX = "lm-"
+CLASSES = ["정상", "위험", "스팸"]
+FEATURE_BITS = 18           # 해시 버킷 수 = 2^18
+NGRAM_MAX = 3
+
+_PRIME = 1000003
+_MIX = 0x9E3779B97F4A7C15
+
+
+def _featurize(texts: list, bits: int):
+    """
+    댓글 목록 → (문서 번호, 해시 버킷, 가중치) 배열
+    모든 댓글을 경계 문자(\\x00)로 이어 붙인 코드포인트 배열에서
+    n-gram 해시를 한꺼번에 계산하고, 댓글 경계를 넘는 n-gram은 버린다.
+    가중치는 댓글별 1/sqrt(n-gram 수) (긴 댓글이 점수를 독차지하지 않도록)
+    """
+    pieces = ["\x00" + t + "\x00" for t in texts]
+    codes = np.frombuffer("".join(pieces).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    lengths = np.fromiter((len(p) for p in pieces), dtype=np.int64, count=len(pieces))
+    doc_of = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+
+    shift = np.uint64(64 - bits)
+    docs, buckets = [], []
+    h = np.zeros(len(codes), dtype=np.uint64)
+    for n in range(1, NGRAM_MAX + 1):
+        # h[i] = codes[i:i+n] 의 다항식 해시 (uint64 오버플로는 mod 2^64로 동작)
+        h = h[:len(codes) - n + 1] * np.uint64(_PRIME) + codes[n - 1:]
+        valid = doc_of[:len(h)] == doc_of[n - 1:]
+        docs.append(doc_of[:len(h)][valid])
+        buckets.append((((h[valid] ^ np.uint64(n)) * np.uint64(_MIX)) >> shift).astype(np.int64))
+
+    doc = np.concatenate(docs)
+    bucket = np.concatenate(buckets)
+    counts = np.bincount(doc, minlength=len(texts))
+    value = (1.0 / np.sqrt(np.maximum(counts, 1)))[doc].astype(np.float32)
+    return doc, bucket, value
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class LocalModel:
+
+    def __init__(self, weights, bias, bits: int = FEATURE_BITS, version: str = None,
+                 threshold: float = DEFAULT_THRESHOLD):
+        self.weights = weights          # (2^bits, 클래스 수) float32
+        self.bias = bias                # (클래스 수,)
+        self.bits = bits
+        self.threshold = threshold      # 학습 때 보정한 확정 기준 (inf면 확정하지 않음)
+        self.version = version or f"{MODEL_VERSION_PREFIX}{time.strftime('%Y%m%d%H%M%S')}"
+
+    def _logits(self, doc, bucket, value, n_docs: int):
+        contrib = self.weights[bucket] * value[:, None]
+        logits = np.empty((n_docs, len(CLASSES)), dtype=np.float64)
+        for c in range(len(CLASSES)):
+            logits[:, c] = np.bincount(doc, weights=contrib[:, c], minlength=n_docs)
+        return logits + self.bias
+
+    def predict_proba(self, texts: list):
+        """댓글 목록 → (댓글 수, 클래스 수) 확률 배열 (한 번의 벡터 연산)"""
+        if not texts:
+            return np.zeros((0, len(CLASSES)))
+        return _softmax(self._logits(*_featurize(texts, self.bits), len(texts)))
+
+    def classify(self, texts: list, threshold: float = None) -> list:
+        """확률이 threshold(기본: LOCAL_MODEL_THRESHOLD → 모델 보정값) 이상인 댓글만 분석 결과 dict, 나머지는 None"""
+        if not texts:
+            return []
+        if threshold is None:
+            threshold = LOCAL_MODEL_THRESHOLD if LOCAL_MODEL_THRESHOLD is not None else self.threshold
+        proba = self.predict_proba(texts)
+        best = proba.argmax(axis=1)
+        results = []
+        for label, p in zip(best.tolist(), proba[np.arange(len(texts)), best].tolist()):
+            if p < threshold:
+                results.append(None)
+                continue
+            results.append({
+                "category": CLASSES[label],
+                "reason": "로컬 모델 판정",
+                "confidence_score": round(p, 4),
+                "model_version": self.version
+            })
+        return results
+
+    # ==============================
+    # 학습 (미니배치 SGD, softmax cross-entropy)
+    # ==============================
+    @classmethod
+    def train(cls, texts: list, labels: list, epochs: int = 10, lr: float = 10.0,
+              batch_size: int = 256, bits: int = FEATURE_BITS, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(texts))
+        texts = [texts[i] for i in order]
+        y = np.array([CLASSES.index(labels[i]) for i in order], dtype=np.int64)
+
+        # 전체 특징을 한 번만 계산 → 문서 순서대로 정렬된 CSR 형태
+        doc, bucket, value = _featurize(texts, bits)
+        sort = np.argsort(doc, kind="stable")
+        doc, bucket, value = doc[sort], bucket[sort], value[sort]
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(doc, minlength=len(texts)))])
+
+        model = cls(np.zeros((1 << bits, len(CLASSES)), dtype=np.float32),
+                    np.zeros(len(CLASSES), dtype=np.float64), bits)
+        starts = np.arange(0, len(texts), batch_size)
+        for epoch in range(epochs):
+            step = lr / (1 + epoch)
+            for start in rng.permutation(starts):
+                end = min(start + batch_size, len(texts))
+                lo, hi = indptr[start], indptr[end]
+                d, bk, v = doc[lo:hi] - start, bucket[lo:hi], value[lo:hi]
+
+                grad = _softmax(model._logits(d, bk, v, end - start))
+                grad[np.arange(end - start), y[start:end]] -= 1.0
+                grad /= (end - start)
+
+                np.add.at(model.weights, bk, (-step * v[:, None] * grad[d]).astype(np.float32))
+                model.bias -= step * grad.sum(axis=0)
+        return model
+
+    # ==============================
+    # 저장 / 불러오기
+    # ==============================
+    def save(self, path: str = LOCAL_MODEL_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, weights=self.weights, bias=self.bias,
+                            bits=self.bits, version=self.version, threshold=self.threshold,
+                            classes=np.array(CLASSES))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = LOCAL_MODEL_PATH):
+        with np.load(path) as data:
+            if list(data["classes"]) != CLASSES:
+                raise ValueError(f"모델 클래스가 다릅니다: {list(data['classes'])}")
+            threshold = float(data["threshold"]) if "threshold" in data.files else DEFAULT_THRESHOLD
+            return cls(data["weights"], data["bias"], int(data["bits"]), str(data["version"]), threshold)
+
+
+# ==============================
+# 서비스에서 쓰는 모델 (첫 사용 시 로드)
+# ==============================
+_model = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+def get_local_model():
+    """학습된 모델 반환 (NumPy / 모델 파일이 없거나 꺼져 있으면 None)"""
+    global _model, _model_loaded
+    if _model_loaded:
+        return _model
+    with _model_lock:
+        if not _model_loaded:
+            _model = None
+            if LOCAL_MODEL_ENABLED and np is not None and os.path.exists(LOCAL_MODEL_PATH):
+                try:
+                    _model = LocalModel.load(LOCAL_MODEL_PATH)
+                    print(f"✅ 로컬 모델 로드: {_model.version} (기준 확률 {_model.threshold})")
+                except Exception as e:
+                    print(f"⚠️ 로컬 모델 로드 실패 (GPT로만 분류): {e}")
+            _model_loaded = True
+    return _model
+
+
+def reload_local_model():
+    """모델 파일을 다시 읽음 (재학습 후 POST /api/admin/local-model/reload 로 호출)"""
+    global _model_loaded
+    with _model_lock:
+        _model_loaded = False
+    return get_local_model()
+
+
+def calibrate_threshold(proba, y, target_accuracy: float = LOCAL_MODEL_TARGET_ACCURACY) -> float:
+    """
+    평가용 확률 / 정답 → 확정 기준 확률
+    확률이 높은 순으로 댓글을 더해 가며, 더한 댓글의 정확도가 target_accuracy 이상인
+    가장 낮은 확률을 고름 (확정 비율을 최대로). 만족하는 구간이 없으면 inf (확정 안 함)
+    """
+    top = proba.max(axis=1)
+    order = np.argsort(-top, kind="stable")
+    top = top[order]
+    correct = (proba.argmax(axis=1) == y)[order]
+    accuracy = np.cumsum(correct) / np.arange(1, len(top) + 1)
+    # 같은 확률끼리는 함께 들어가므로 묶음의 마지막 위치에서만 판단
+    group_end = np.append(top[1:] < top[:-1], True)
+    ok = np.flatnonzero(group_end & (accuracy >= target_accuracy) & (top >= MIN_THRESHOLD))
+    return float(top[ok[-1]]) if len(ok) else float("inf")
+
+
+def _evaluate(model, texts, labels, threshold):
+    proba = model.predict_proba(texts)
+    best = proba.argmax(axis=1)
+    y = np.array([CLASSES.index(l) for l in labels])
+    confident = proba.max(axis=1) >= threshold
+    accuracy = float((best == y).mean()) if len(y) else 0.0
+    covered = float(confident.mean()) if len(y) else 0.0
+    confident_accuracy = float((best[confident] == y[confident]).mean()) if confident.any() else 0.0
+    return accuracy, covered, confident_accuracy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 분류 모델 학습")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train_cmd = sub.add_parser("train", help="comment_analysis 판정으로 학습")
+    train_cmd.add_argument("--limit", type=int, default=200000)
+    train_cmd.add_argument("--epochs", type=int, default=10)
+    train_cmd.add_argument("--lr", type=float, default=10.0)
+    train_cmd.add_argument("--target-accuracy", type=float, default=LOCAL_MODEL_TARGET_ACCURACY,
+                           help="확정 기준 확률 보정 목표 (평가용 데이터에서 확정한 댓글의 정확도)")
+    train_cmd.add_argument("--holdout", type=float, default=0.1, help="평가용으로 떼어 둘 비율")
+    train_cmd.add_argument("--seed", type=int, default=0, help="평가용 분할 / 학습 순서 시드")
+    train_cmd.add_argument("--out", default=LOCAL_MODEL_PATH)
+    args = parser.parse_args(argv)
+
+    if np is None:
+        raise SystemExit("❌ NumPy가 설치되어 있지 않습니다 (pip install numpy)")
+
+    from backend.database import get_training_samples
+    from backend.text_normalizer import normalize_text
+
+    samples = get_training_samples(args.limit, exclude_version_prefix=MODEL_VERSION_PREFIX)
+    if len(samples) < 100:
+        raise SystemExit(f"❌ 학습 데이터가 부족합니다 ({len(samples)}개)")
+    # DB는 최신순으로 주므로 섞은 뒤 나눔 (평가용이 특정 시기 / 영상에 몰리지 않도록, 시드 고정)
+    order = np.random.default_rng(args.seed).permutation(len(samples))
+    texts = [normalize_text(samples[i][0]) for i in order]
+    labels = [samples[i][1] for i in order]
+    n_test = int(len(texts) * args.holdout)
+    print(f"📚 학습 {len(texts) - n_test}개 / 평가 {n_test}개 "
+          f"({', '.join(f'{c} {labels.count(c)}' for c in CLASSES)})")
+
+    started = time.time()
+    model = LocalModel.train(texts[n_test:], labels[n_test:], epochs=args.epochs, lr=args.lr,
+                             seed=args.seed)
+    print(f"⏱️ 학습 {time.time() - started:.1f}초")
+    if n_test:
+        y_test = np.array([CLASSES.index(l) for l in labels[:n_test]])
+        model.threshold = calibrate_threshold(model.predict_proba(texts[:n_test]), y_test, args.target_accuracy)
+        if model.threshold == float("inf"):
+            print(f"⚠️ 정확도 {args.target_accuracy} 를 지키는 기준 확률이 없습니다 (이 모델은 판정을 확정하지 않음)")
+        for label, threshold in (("보정", model.threshold), ("기본", DEFAULT_THRESHOLD)):
+            accuracy, covered, confident_accuracy = _evaluate(model, texts[:n_test], labels[:n_test], threshold)
+            print(f"📊 [{label}] 확률 {threshold:.4f} 이상 확정 {covered:.1%} (GPT 호출 절감), "
+                  f"그 중 정확도 {confident_accuracy:.3f} | 전체 정확도 {accuracy:.3f}")
+        if LOCAL_MODEL_THRESHOLD is not None:
+            accuracy, covered, confident_accuracy = _evaluate(
+                model, texts[:n_test], labels[:n_test], LOCAL_MODEL_THRESHOLD
+            )
+            print(f"📊 [LOCAL_MODEL_THRESHOLD 우선 적용] 확률 {LOCAL_MODEL_THRESHOLD} 이상 확정 {covered:.1%}, "
+                  f"그 중 정확도 {confident_accuracy:.3f}")
+    else:
+        print(f"⚠️ 평가용 데이터가 없어 기본 기준 확률 {DEFAULT_THRESHOLD} 사용 (--holdout)")
+    model.save(args.out)
+    print(f"✅ 저장: {args.out} ({model.version})")
+    print("   실행 중인 서버에 적용: POST /api/admin/local-model/reload")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# ==============================
+# 지표 수집 (카운터 / 히스토그램 / 게이지) → Prometheus 텍스트 형식
+# ==============================
+# - 외부 라이브러리 없이 프로세스 메모리에 누적 (GET /metrics 에서 render() 결과를 반환)
+# - 기록 비용: 라벨 튜플 만들기 + 잠금 한 번 + 덧셈 (히스토그램은 이진 탐색 추가)
+#   → 댓글 / 페이지 / 배치 단위로만 기록하면 핫패스 영향은 무시할 수준
+# - 게이지는 값을 들고 있지 않고 수집할 때 함수를 호출 (큐 길이 / 풀 상태 / 남은 할당량)
+# - METRICS_ENABLED=0 이면 기록하지 않음
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_PREFIX = "ytfilter_"
+
+# 초 단위 기본 구간 (로컬 처리 ~ 느린 외부 API)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry = []
+_registry_lock = threading.Lock()
+
+
+def _register(metric):
+    with _registry_lock:
+        if any(m.name == metric.name for m in _registry):
+            raise ValueError(f"이미 등록된 지표: {metric.name}")
+        _registry.append(metric)
+    return metric
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = METRICS_PREFIX + name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _register(self)
+
+    def inc(self, amount: float = 1, **labels):
+        if not METRICS_ENABLED or not amount:
+            return
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self) -> list:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_label_text(self.labelnames, key)} {_number(v)}" for key, v in items]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = METRICS_PREFIX + name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}       # 라벨 → [구간별 개수(마지막은 +Inf), 합계, 개수]
+        self._lock = threading.Lock()
+        _register(self)
+
+    def observe(self, value: float, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with HISTOGRAM.time(...): 블록 실행 시간(초) 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def collect(self) -> list:
+        with self._lock:
+            items = [(key, list(entry[0]), entry[1], entry[2]) for key, entry in self._values.items()]
+        lines = []
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, key, le)} {cumulative}")
+            labels = _label_text(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Gauge:
+    """수집할 때 fn()을 호출해 현재 값을 읽는 게이지 (실패하면 출력 생략)"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn):
+        self.name = METRICS_PREFIX + name
+        self.help = help
+        self.fn = fn
+        _register(self)
+
+    def collect(self) -> list:
+        try:
+            value = self.fn()
+        except Exception:
+            return []
+        return [] if value is None else [f"{self.name} {_number(value)}"]
+
+
+def render() -> str:
+    """등록된 모든 지표를 Prometheus 텍스트 형식(0.0.4)으로"""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+# ==============================
+# 공용 지표 (모듈마다 같은 이름을 다시 만들지 않도록 여기서 정의)
+# ==============================
+YOUTUBE_SECONDS = Histogram("youtube_request_seconds", "YouTube API 요청 시간 (캐시 적중 제외)", ("method",))
+YOUTUBE_REQUESTS = Counter("youtube_requests_total", "YouTube API 요청 수 (결과별: ok / cache / not_modified / error)",
+                           ("method", "result"))
+PAGE_SECONDS = Histogram("scan_page_seconds", "댓글 페이지 하나 분석 시간 (조회 / 묶기 / 분류)")
+SCAN_COMMENTS = Counter("scan_comments_total", "분석한 댓글 수 (판정 출처별)", ("source",))
+CLASSIFY_RESULTS = Counter("classify_results_total", "classify_comments 판정 수 (중복 제거 후, 출처별)", ("source",))
+LOCAL_FILTER_HITS = Counter("local_filter_hits_total", "로컬 필터 규칙별 적중 수", ("rule",))
+OPENAI_BATCH_SECONDS = Histogram("openai_batch_seconds", "GPT 배치 호출 시간 (재시도 포함)")
+OPENAI_BATCH_SIZE = Histogram("openai_batch_comments", "GPT 배치 하나의 댓글 수", buckets=(1, 5, 10, 25, 50, 100))
+OPENAI_BATCHES = Counter("openai_batches_total", "GPT 배치 호출 수", ("result",))
+OPENAI_TOKENS = Counter("openai_tokens_total", "GPT 사용 토큰 (응답 usage 기준)", ("kind",))
+OPENAI_RETRIES = Counter("openai_retries_total", "GPT 요청 재시도 수 (원인별)", ("reason",))
+DB_WRITE_SECONDS = Histogram("db_write_seconds", "스캔 페이지 하나 DB 저장 시간 (트랜잭션 1개)")
+DB_WRITES = Counter("db_writes_total", "DB 저장 작업 수", ("result",))
+DB_ROWS = Counter("db_rows_written_total", "DB에 저장한 행 수 (테이블별)", ("table",))
+HTTP_SECONDS = Histogram("http_request_seconds", "HTTP 요청 처리 시간 (스트리밍은 첫 응답까지)",
+                         ("method", "endpoint", "status"))
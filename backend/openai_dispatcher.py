@@ -0,0 +1,182 @@
+# ==============================
+# OpenAI 배치 동시 호출기
+# ==============================
+# - 공유 requests.Session (커넥션 풀 재사용)
+# - 스레드 풀로 최대 N개 배치를 동시에 전송
+# - 429 / 5xx는 Retry-After + jitter로 재시도
+# - 분당 요청 수(RPM) / 분당 토큰 수(TPM) 예산 준수
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.metrics import OPENAI_RETRIES
+
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "4"))
+OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "4"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "30"))
+
+# 재시도 대상 상태 코드
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 1.0      # 첫 재시도 대기(초)
+BACKOFF_MAX = 30.0      # 최대 대기(초)
+
+
+class RateLimiter:
+    """
+    RPM / TPM 두 개의 토큰 버킷을 함께 관리한다.
+    acquire()는 두 예산이 모두 남아 있을 때까지 호출 스레드를 대기시킨다.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = max(1, rpm)
+        self.tpm = max(1, tpm)
+        self._requests = float(self.rpm)
+        self._tokens = float(self.tpm)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+
+    def acquire(self, tokens: int = 0):
+        # 한 번에 TPM보다 큰 요청은 버킷 전체를 쓰는 것으로 취급 (영원히 대기 방지)
+        tokens = min(max(0, tokens), self.tpm)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait_requests = (1 - self._requests) * 60.0 / self.rpm
+                wait_tokens = (tokens - self._tokens) * 60.0 / self.tpm
+                wait = max(wait_requests, wait_tokens, 0.01)
+            time.sleep(wait)
+
+
+def _retry_after_seconds(response):
+    """Retry-After(초 또는 HTTP-date) / retry-after-ms 헤더를 초 단위로 변환"""
+    if response is None:
+        return None
+    ms = response.headers.get("retry-after-ms")
+    if ms:
+        try:
+            return float(ms) / 1000.0
+        except ValueError:
+            pass
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class BatchDispatcher:
+    """
+    OpenAI chat completions 요청을 병렬로 보내는 디스패처
+
+    사용 예:
+        dispatcher = get_dispatcher()
+        results = dispatcher.run_all([lambda: ..., lambda: ...])
+    """
+
+    def __init__(self, max_workers: int = OPENAI_MAX_CONCURRENCY, rpm: int = OPENAI_RPM_LIMIT,
+                 tpm: int = OPENAI_TPM_LIMIT, max_retries: int = OPENAI_MAX_RETRIES,
+                 timeout: float = OPENAI_TIMEOUT):
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.limiter = RateLimiter(rpm, tpm)
+
+        # 동시 요청 수만큼 커넥션을 유지하는 공유 세션
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="openai-batch"
+        )
+
+    def post(self, url: str, headers: dict, payload: dict, est_tokens: int = 0) -> dict:
+        """
+        rate limit 예산을 확보한 뒤 POST 요청을 보내고 JSON 응답을 반환한다.
+        429 / 5xx / 네트워크 오류는 지수 백오프 + jitter로 재시도한다.
+        """
+        attempt = 0
+        while True:
+            self.limiter.acquire(est_tokens)
+            response = None
+            try:
+                response = self.session.post(url, headers=headers, json=payload, timeout=self.timeout)
+                if response.status_code not in RETRYABLE_STATUS:
+                    response.raise_for_status()
+                    return response.json()
+                error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            if attempt >= self.max_retries:
+                raise error
+            OPENAI_RETRIES.inc(reason=response.status_code if response is not None else type(error).__name__)
+
+            backoff = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+            retry_after = _retry_after_seconds(response)
+            delay = retry_after if retry_after is not None else backoff
+            # 여러 스레드가 같은 순간에 재시도하지 않도록 jitter 추가
+            delay += random.uniform(0, backoff / 2)
+            print(f"⏳ OpenAI 재시도 {attempt + 1}/{self.max_retries} ({delay:.1f}s 후): {error}")
+            time.sleep(delay)
+            attempt += 1
+
+    def run_all(self, tasks: list) -> list:
+        """
+        인자 없는 함수 목록을 병렬 실행하고 같은 순서로 결과를 반환한다.
+        실패한 작업은 결과 자리에 예외 객체가 들어간다.
+        """
+        futures = [self.executor.submit(task) for task in tasks]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> BatchDispatcher:
+    """프로세스 전체에서 공유하는 디스패처 (첫 사용 시 생성)"""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = BatchDispatcher()
+    return _dispatcher
+
+
+def set_dispatcher(dispatcher):
+    """사용할 디스패처 교체 (가짜 / 테스트용, None이면 다음 사용 때 새로 생성)"""
+    global _dispatcher
+    with _dispatcher_lock:
+        _dispatcher = dispatcher
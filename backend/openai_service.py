@@ -1,11 +1,33 @@
 import os
 import json
 import re
-import requests
+import threading
+import time
 from dotenv import load_dotenv
 
+from backend.cache import ClassificationCache
+from backend.comment_record import UNCLASSIFIED_CATEGORY
+from backend.local_model import get_local_model
+from backend.filter_engine import RuleMatcher, RuleStore, KIND_BADWORD, KIND_AD, KIND_NEGATIVE, KIND_POSITIVE
+from backend.openai_dispatcher import get_dispatcher
+from backend.text_normalizer import normalize_text, NORMALIZER_VERSION
+from backend.metrics import (
+    CLASSIFY_RESULTS, LOCAL_FILTER_HITS, OPENAI_BATCH_SECONDS, OPENAI_BATCH_SIZE, OPENAI_BATCHES, OPENAI_TOKENS
+)
+
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# 호환 서버 / 벤치마크용 가짜 서버를 쓸 때 변경 (예: http://127.0.0.1:8765/v1)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+
+# ==============================
+# 모델 / 프롬프트 버전
+# ==============================
+# ❗ 프롬프트를 바꾸면 버전을 올려야 캐시된 GPT 결과가 무효화됨
+# (로컬 필터 버전은 filter_rules.json의 "version" + 정규화 버전을 사용)
+OPENAI_MODEL = "gpt-4o-mini"
+PROMPT_VERSION = "v1"
+GPT_MODEL_VERSION = f"{OPENAI_MODEL}:{PROMPT_VERSION}"
 
 # ==============================
 # ✅ 카테고리 정의 (DB와 일치시킴)
@@ -14,61 +36,70 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 ALLOWED_CATEGORIES = ["정상", "위험", "스팸"]
 
 # ==============================
-# 1️⃣ 로컬 욕설 필터
+# 1️⃣ ~ 3️⃣ 로컬 욕설 / 광고 / 정상 필터 규칙
 # ==============================
-BAD_WORD_PATTERNS = [
-    r"씨\s*발", r"ㅅ\s*ㅂ", r"병\s*신", r"ㅂ\s*ㅅ",
-    r"좆", r"미\s*친", r"지\s*랄", r"개\s*새끼", r"염병",
-    r"꺼\s*져", r"죽\s*어"
-]
+# 규칙 목록은 backend/filter_rules.json 에서 읽음 (FILTER_RULES_PATH)
+# 파일을 고치면 FILTER_RULES_CHECK_INTERVAL 초 안에 자동 반영,
+# 또는 POST /api/admin/rules/reload 로 즉시 반영
+rule_store = RuleStore()
+
+
+def local_filter_version(matcher: RuleMatcher = None) -> str:
+    """로컬 필터 판정에 기록하는 model_version (규칙 버전 + 정규화 버전)"""
+    return f"{(matcher or rule_store.current()).version}/{NORMALIZER_VERSION}"
+
+
+def current_model_versions() -> list[str]:
+    """현재 분류기가 기록하는 model_version 목록 (이 버전의 저장 결과는 재사용 가능)"""
+    versions = [GPT_MODEL_VERSION, local_filter_version()]
+    model = get_local_model()
+    if model:
+        versions.append(model.version)
+    return versions
+
+
+def reload_rules() -> RuleMatcher:
+    """규칙 파일을 다시 읽어 교체"""
+    return rule_store.reload()
+
 
 def local_badword_filter(text: str):
-    for pattern in BAD_WORD_PATTERNS:
-        if re.search(pattern, text):
-            # '욕설'은 DB에서 '위험' 카테고리(ID: 2)로 분류되도록 설정
-            return {"category": "위험", "reason": "욕설 패턴 감지"}
+    rule = rule_store.current().scan(normalize_text(text)).get(KIND_BADWORD)
+    if rule:
+        # '욕설'은 DB에서 '위험' 카테고리(ID: 2)로 분류되도록 설정
+        return {"category": "위험", "reason": "욕설 패턴 감지", "rule": rule}
     return None
 
-# ==============================
-# 2️⃣ 로컬 광고 필터
-# ==============================
 def local_ad_filter(text: str):
-    AD_PATTERNS = [
-        r"http[s]?://[^\s]+", r"www\.[^\s]+",
-        r"\d{2,4}-\d{3,4}-\d{4}", r"010-?\d{4}-?\d{4}",
-        r"카톡\s*문의", r"텔레그램", r"인스타\s*@"
-    ]
-    for pattern in AD_PATTERNS:
-        if re.search(pattern, text):
-            # '광고'는 DB에서 '스팸' 카테고리(ID: 3)로 분류
-            return {"category": "스팸", "reason": "광고/홍보 의심"}
+    rule = rule_store.current().scan(normalize_text(text)).get(KIND_AD)
+    if rule:
+        # '광고'는 DB에서 '스팸' 카테고리(ID: 3)로 분류
+        return {"category": "스팸", "reason": "광고/홍보 의심", "rule": rule}
     return None
 
-# ==============================
-# 3️⃣ 로컬 정상 필터 (빠른 통과)
-# ==============================
 def local_fast_filter(text: str):
     stripped = text.strip()
     if len(stripped) <= 3 and not any(char.isalnum() for char in stripped):
-        return {"category": "정상", "reason": "이모티콘 반응"}
-    
-    POSITIVE_WORDS = ["ㅋㅋㅋ", "ㅎㅎㅎ", "좋아", "귀여워", "최고", "감사", "응원", "👍", "❤️"]
-    NEGATIVE_WORDS = ["죽", "꺼져", "싫어", "최악", "쓰레기", "혐오", "무식"]
-    
-    if any(word in stripped for word in NEGATIVE_WORDS):
+        return {"category": "정상", "reason": "이모티콘 반응", "rule": "emoji"}
+
+    found = rule_store.current().scan(normalize_text(stripped))
+    if KIND_NEGATIVE in found:
         return None
-    
-    if any(word in stripped for word in POSITIVE_WORDS) and len(stripped) >= 5:
-        return {"category": "정상", "reason": "긍정적 반응"}
+
+    if KIND_POSITIVE in found and len(stripped) >= 5:
+        return {"category": "정상", "reason": "긍정적 반응", "rule": found[KIND_POSITIVE]}
     return None
 
 # ==============================
 # 4️⃣ GPT 배치 분석 (프롬프트 카테고리 고정)
 # ==============================
 def analyze_comments_batch(texts: list[str]):
+    # 키가 없으면 요청을 보내지 않음 (classify_comments가 '미분류'로 처리)
+    if not OPENAI_API_KEY:
+        raise RuntimeError("OPENAI_API_KEY가 .env에 없습니다.")
     joined = "\n".join([f"{i+1}. {text}" for i, text in enumerate(texts)])
     payload = {
-        "model": "gpt-4o-mini",
+        "model": OPENAI_MODEL,
         "temperature": 0,
         "messages": [
             {
@@ -87,74 +118,240 @@ def analyze_comments_batch(texts: list[str]):
             }
         ]
     }
-    response = requests.post(
-        "https://api.openai.com/v1/chat/completions",
-        headers={"Authorization": f"Bearer {OPENAI_API_KEY}", "Content-Type": "application/json"},
-        json=payload, timeout=15
-    )
+    # 입력 댓글 + 시스템 프롬프트 + 댓글당 응답 분량을 TPM 예산으로 잡음
+    est_tokens = sum(estimate_tokens(t) for t in texts) + 300 + 40 * len(texts)
+    OPENAI_BATCH_SIZE.observe(len(texts))
+    started = time.perf_counter()
+    try:
+        data = get_dispatcher().post(
+            f"{OPENAI_BASE_URL}/chat/completions",
+            headers={"Authorization": f"Bearer {OPENAI_API_KEY}", "Content-Type": "application/json"},
+            payload=payload, est_tokens=est_tokens
+        )
+    except Exception:
+        OPENAI_BATCHES.inc(result="error")
+        raise
+    finally:
+        OPENAI_BATCH_SECONDS.observe(time.perf_counter() - started)
+    OPENAI_BATCHES.inc(result="ok")
+    usage = data.get("usage") or {}
+    OPENAI_TOKENS.inc(usage.get("prompt_tokens", 0), kind="prompt")
+    OPENAI_TOKENS.inc(usage.get("completion_tokens", 0), kind="completion")
     # JSON 파싱 로직 (간소화)
-    content = response.json()["choices"][0]["message"].get("content", "[]")
+    content = data["choices"][0]["message"].get("content", "[]")
     match = re.search(r"\[.*\]", content, re.S)
     return json.loads(match.group()) if match else []
 
 # ==============================
-# 5️⃣ 통합 분석 함수 (DB 구조에 맞게 리턴)
+# 5️⃣ 배치 분류 (캐시 → 로컬 필터 → GPT 배치, 인덱스 기준 매핑)
+# ==============================
+# 한 번의 GPT 호출에 묶을 최대 댓글 수 / 입력 토큰 예산
+GPT_BATCH_SIZE = int(os.getenv("GPT_BATCH_SIZE", "25"))
+GPT_BATCH_TOKEN_BUDGET = int(os.getenv("GPT_BATCH_TOKEN_BUDGET", "3000"))
+
+
+_classification_cache = None
+_classification_cache_lock = threading.Lock()
+
+
+def get_classification_cache() -> ClassificationCache:
+    """
+    GPT 분류 결과 캐시 (첫 사용 시 생성, 모델/프롬프트 버전별로 분리)
+    키 = 모델 버전 + 규칙 버전 + normalize_text를 거친 텍스트 (우회 표기끼리 같은 결과 공유)
+    규칙 버전이 키에 들어가므로 캐시를 먼저 보고 로컬 필터는 캐시에 없을 때만 실행
+    (규칙을 바꾸면 새 규칙에 걸리는 텍스트가 예전 GPT 결과로 덮이지 않도록 캐시가 새로 시작)
+    """
+    global _classification_cache
+    if _classification_cache is None:
+        with _classification_cache_lock:
+            if _classification_cache is None:
+                _classification_cache = ClassificationCache(version=f"{GPT_MODEL_VERSION}|{NORMALIZER_VERSION}")
+    return _classification_cache
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    댓글 하나가 프롬프트에서 차지하는 토큰 수 대략 추정
+    (한글 1음절 = UTF-8 3바이트 ≈ 1토큰, 번호/줄바꿈 여유분 포함)
+    """
+    return len(text.encode("utf-8")) // 3 + 4
+
+
+def split_batches(texts: list[str], batch_size: int = None, token_budget: int = None) -> list[list[int]]:
+    """
+    texts를 batch_size 개수 / token_budget 토큰 안에서 묶어
+    각 배치에 들어갈 인덱스 목록을 반환한다.
+    예산보다 긴 댓글 하나는 단독 배치로 보낸다.
+    """
+    batch_size = batch_size or GPT_BATCH_SIZE
+    token_budget = token_budget or GPT_BATCH_TOKEN_BUDGET
+
+    batches = []
+    current, current_tokens = [], 0
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= batch_size or current_tokens + tokens > token_budget):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def local_filter(text: str, matcher: RuleMatcher = None, normalized: str = None):
+    """
+    로컬 필터 3종을 우선순위(욕설 → 광고 → 정상) 순서로 적용
+    (컴파일된 규칙으로 정규화된 텍스트를 한 번만 훑음, 걸린 규칙은 'rule'에 기록)
+    normalized: 이미 normalize_text를 거친 텍스트가 있으면 재사용
+    """
+    matcher = matcher or rule_store.current()
+    if normalized is None:
+        normalized = normalize_text(text)
+    res = matcher.match(normalized, original=text)
+    if res:
+        res["model_version"] = local_filter_version(matcher)
+    return res
+
+
+def analyze_batch_indexed(texts: list[str]) -> list:
+    """
+    analyze_comments_batch 결과를 GPT가 돌려준 'index' 기준으로 다시 정렬한다.
+    GPT가 일부 댓글을 빠뜨리거나 순서를 바꿔도 결과가 밀리지 않으며,
+    누락된 자리는 None으로 남는다.
+    """
+    mapped = [None] * len(texts)
+    for g in analyze_comments_batch(texts):
+        if not isinstance(g, dict):
+            continue
+        try:
+            pos = int(g.get("index")) - 1
+        except (TypeError, ValueError):
+            continue
+        if 0 <= pos < len(texts):
+            category = g.get("category")
+            mapped[pos] = {
+                "category": category if category in ALLOWED_CATEGORIES else "위험",
+                "reason": g.get("reason", "AI 분석"),
+                "model_version": GPT_MODEL_VERSION
+            }
+    return mapped
+
+
+def classify_comments(texts: list[str], batch_size: int = None, token_budget: int = None,
+                      use_cache: bool = True) -> list[dict]:
+    """
+    댓글 텍스트 목록을 분류해 입력과 같은 순서의 분석 결과 목록을 반환한다.
+
+    0. 댓글마다 한 번 정규화(normalize_text)하고, 정규화 결과가 같은 텍스트는 한 번만 분류
+    1. 캐시에 GPT 결과가 있으면 그대로 사용 (로컬 필터도 건너뜀)
+       캐시 키에 규칙 버전이 들어 있으므로, 적중 = 지금 규칙에 걸리지 않는 텍스트
+    2. 나머지는 로컬 필터로 걸러지면 바로 결과 확정 (현재 규칙 버전으로)
+    2-1. 로컬 모델(학습돼 있으면)이 기준 확률(학습 때 보정) 이상으로 판정한 댓글 확정
+    3. 남은 댓글은 batch_size / token_budget 단위로 묶어 GPT 배치 호출
+    4. 배치들은 디스패처가 동시에 전송 (OPENAI_MAX_CONCURRENCY)
+    5. GPT 결과는 배치 내 index로 원래 위치에 매핑
+    """
+    cache = get_classification_cache() if use_cache else None
+    # 호출 동안 같은 규칙을 사용 (도중에 규칙이 교체되어도 영향 없음)
+    matcher = rule_store.current()
+
+    # 같은 텍스트(정규화 기준)의 위치를 묶음
+    groups = {}
+    normalized = {}
+    for i, text in enumerate(texts):
+        norm = normalize_text(text)
+        key = cache.key(norm, matcher.version) if cache else norm
+        if key not in groups:
+            groups[key] = []
+            normalized[key] = norm
+        groups[key].append(i)
+    keys = list(groups)
+    rep_texts = [texts[groups[k][0]] for k in keys]
+    rep_results = cache.get_many(keys) if cache else [None] * len(keys)
+    fresh = []          # 새로 GPT로 분류되어 캐시에 넣을 (key 위치)
+
+    pending = [i for i, res in enumerate(rep_results) if res is None]
+    CLASSIFY_RESULTS.inc(len(rep_results) - len(pending), source="cache")
+    for i in pending:
+        res = local_filter(rep_texts[i], matcher, normalized[keys[i]])
+        if res is not None:
+            rep_results[i] = res
+            LOCAL_FILTER_HITS.inc(rule=res.get("rule", ""))
+    gpt_targets = [i for i in pending if rep_results[i] is None]
+    CLASSIFY_RESULTS.inc(len(pending) - len(gpt_targets), source="local_rule")
+
+    # 로컬 모델: 남은 댓글 전체를 한 번에 점수 계산, 확신이 낮은 댓글만 GPT로
+    model = get_local_model()
+    if model and gpt_targets:
+        verdicts = model.classify([normalized[keys[i]] for i in gpt_targets])
+        for i, verdict in zip(gpt_targets, verdicts):
+            rep_results[i] = verdict
+        remaining = [i for i in gpt_targets if rep_results[i] is None]
+        CLASSIFY_RESULTS.inc(len(gpt_targets) - len(remaining), source="local_model")
+        gpt_targets = remaining
+
+    gpt_texts = [rep_texts[i] for i in gpt_targets]
+    batches = [
+        [gpt_targets[j] for j in batch]
+        for batch in split_batches(gpt_texts, batch_size, token_budget)
+    ]
+    outcomes = get_dispatcher().run_all([
+        (lambda positions=positions: analyze_batch_indexed([rep_texts[i] for i in positions]))
+        for positions in batches
+    ])
+
+    for positions, mapped in zip(batches, outcomes):
+        if isinstance(mapped, Exception):
+            print(f"GPT 분석 실패: {mapped}")
+            mapped = [None] * len(positions)
+
+        for pos, res in zip(positions, mapped):
+            if res:
+                rep_results[pos] = res
+                fresh.append(pos)
+                CLASSIFY_RESULTS.inc(source="gpt")
+            else:
+                # 실패 결과는 캐시 / DB에 남기지 않음 (다음 요청에서 다시 시도)
+                rep_results[pos] = {"category": UNCLASSIFIED_CATEGORY, "reason": "분석 오류"}
+                CLASSIFY_RESULTS.inc(source="error")
+
+    if cache:
+        cache.set_many([(keys[i], rep_results[i]) for i in fresh])
+
+    results = [None] * len(texts)
+    for key, res in zip(keys, rep_results):
+        for pos in groups[key]:
+            results[pos] = dict(res)
+    return results
+
+# ==============================
+# 6️⃣ 통합 분석 함수 (DB 구조에 맞게 리턴)
 # ==============================
 def analyze_comments_bulk(comments: list[dict]):
     """
     최종 결과 구조를 DB 저장 함수인 save_video_with_comments가 
     정확히 읽을 수 있도록 구성합니다.
     """
-    final_results = []
-    gpt_targets = []
-
-    for c in comments:
-        text = c.get("text", "")
-        # 로컬 필터 우선 적용
-        res = local_badword_filter(text) or local_ad_filter(text) or local_fast_filter(text)
-        
-        if res:
-            # DB가 기대하는 중첩 구조 생성
-            final_results.append({
-                "user": {"author": c.get("author"), "profile_image": c.get("profile_image")},
-                "comment": {"text": text, "like_count": c.get("like_count"), "published_at": c.get("published_at")},
-                "analysis": res
-            })
-        else:
-            gpt_targets.append(c)
-
-    # GPT 처리
-    if gpt_targets:
-        texts = [c["text"] for c in gpt_targets]
-        try:
-            gpt_res_list = analyze_comments_batch(texts)
-            for c, g in zip(gpt_targets, gpt_res_list):
-                final_results.append({
-                    "user": {"author": c.get("author"), "profile_image": c.get("profile_image")},
-                    "comment": {"text": c.get("text"), "like_count": c.get("like_count"), "published_at": c.get("published_at")},
-                    "analysis": {
-                        "category": g.get("category") if g.get("category") in ALLOWED_CATEGORIES else "위험",
-                        "reason": g.get("reason", "AI 분석")
-                    }
-                })
-        except Exception as e:
-            print(f"GPT 분석 실패: {e}")
-            for c in gpt_targets:
-                final_results.append({
-                    "user": c, "comment": c, 
-                    "analysis": {"category": "위험", "reason": "분석 오류"}
-                })
-
-    return final_results
+    texts = [c.get("text", "") for c in comments]
+    analyses = classify_comments(texts)
+
+    return [
+        {
+            "user": {"author": c.get("author"), "profile_image": c.get("profile_image")},
+            "comment": {"text": text, "like_count": c.get("like_count"), "published_at": c.get("published_at")},
+            "analysis": analysis
+        }
+        for c, text, analysis in zip(comments, texts, analyses)
+    ]
 
 def analyze_comment(text: str):
     """
     단일 댓글 분석을 위한 래퍼 함수
-    youtube_api.py에서 이 이름을 찾고 있으므로 반드시 필요합니다.
+    (여러 댓글은 classify_comments로 한 번에 처리하는 것이 훨씬 빠릅니다)
     """
-    # 임시로 단일 리스트를 만들어 bulk 함수를 호출하거나 직접 분석
-    results = analyze_comments_bulk([{"text": text, "author": "unknown"}])
+    results = classify_comments([text])
     if results:
-        # 결과 구조에서 analysis 부분만 반환
-        return results[0]["analysis"]
-    return {"category": "위험", "reason": "분석 실패"}
\ No newline at end of file
+        return results[0]
+    return {"category": UNCLASSIFIED_CATEGORY, "reason": "분석 실패"}
@@ -0,0 +1,171 @@
+# ==============================
+# 비동기 댓글 스캔 작업 관리
+# ==============================
+# - POST /api/scans 로 등록 → job_id 즉시 반환
+# - 백그라운드 워커 풀이 get_comments 실행 (대기열 크기 제한)
+# - 같은 영상 + 같은 설정(max_results / 답글 포함 여부) 스캔이 진행 중이면 기존 작업을 그대로 돌려줌
+#   (설정이 다르면 진행 중인 작업이 요청을 다 채우지 못하므로 새 작업)
+# - 페이지 단위로 부분 결과 / 진행률 갱신
+import os
+import queue
+import threading
+import time
+import uuid
+
+from backend.youtube_api import get_comments, YT_INCLUDE_REPLIES
+
+SCAN_WORKERS = int(os.getenv("SCAN_WORKERS", "2"))
+SCAN_QUEUE_SIZE = int(os.getenv("SCAN_QUEUE_SIZE", "20"))
+SCAN_JOB_TTL = int(os.getenv("SCAN_JOB_TTL", "3600"))     # 완료된 작업 보관 시간(초)
+
+
+class ScanQueueFull(Exception):
+    """대기열이 가득 차서 새 스캔을 받을 수 없을 때"""
+
+
+class ScanJob:
+
+    def __init__(self, video_id: str, max_results: int, include_replies: bool = None):
+        self.job_id = uuid.uuid4().hex
+        self.video_id = video_id
+        self.max_results = max_results
+        self.include_replies = YT_INCLUDE_REPLIES if include_replies is None else include_replies
+        self.status = "queued"          # queued → running → done / failed
+        self.comments = []              # 프론트엔드용 결과 (페이지마다 추가)
+        self.danger_count = 0
+        self.top_level_count = 0        # 진행률은 최상위 댓글 기준 (답글은 max_results에 포함되지 않음)
+        self.video_info = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    @property
+    def key(self) -> tuple:
+        """중복 실행 판단 기준 (영상, 댓글 수, 답글 포함 여부)"""
+        return (self.video_id, self.max_results, bool(self.include_replies))
+
+    def add_page(self, page_results: list):
+        with self._lock:
+            self.comments.extend(page_results)
+            self.danger_count += sum(1 for c in page_results if c["category"] == "위험")
+            self.top_level_count += sum(1 for c in page_results if not c.get("isReply"))
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            total = len(self.comments)
+            fetched = self.top_level_count
+            danger = self.danger_count
+        return {
+            "job_id": self.job_id,
+            "video_id": self.video_id,
+            "status": self.status,
+            "progress": {
+                "fetched": fetched,
+                "target": self.max_results,
+                "percent": 100 if self.status == "done" else min(99, int(fetched * 100 / max(1, self.max_results)))
+            },
+            "summary": {"total": total, "replies": total - fetched, "danger": danger},
+            "video_info": self.video_info,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+    def results_since(self, offset: int) -> list:
+        with self._lock:
+            return self.comments[offset:]
+
+
+class ScanManager:
+
+    def __init__(self, workers: int = SCAN_WORKERS, queue_size: int = SCAN_QUEUE_SIZE):
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._jobs = {}
+        self._active_by_key = {}       # ScanJob.key → 대기 / 진행 중인 job_id
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def _ensure_workers(self):
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._run, name=f"scan-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def submit(self, video_id: str, max_results: int = 50, include_replies: bool = None):
+        """
+        스캔 등록. (job, created) 반환
+        같은 영상 / 같은 설정의 스캔이 이미 대기/진행 중이면 그 작업을 반환 (created=False)
+        """
+        self._ensure_workers()
+        job = ScanJob(video_id, max_results, include_replies)
+        with self._lock:
+            self._cleanup()
+            job_id = self._active_by_key.get(job.key)
+            if job_id and self._jobs[job_id].active:
+                return self._jobs[job_id], False
+
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise ScanQueueFull("스캔 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.")
+            self._jobs[job.job_id] = job
+            self._active_by_key[job.key] = job.job_id
+            return job, True
+
+    def get(self, job_id: str):
+        return self._jobs.get(job_id)
+
+    def _cleanup(self):
+        """보관 시간이 지난 완료 작업 삭제 (_lock 안에서 호출)"""
+        expire_before = time.time() - SCAN_JOB_TTL
+        for job_id in [j.job_id for j in self._jobs.values()
+                       if not j.active and j.finished_at and j.finished_at < expire_before]:
+            del self._jobs[job_id]
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                result = get_comments(job.video_id, job.max_results, on_page=job.add_page,
+                                      include_replies=job.include_replies)
+                job.video_info = result.get("video_info")
+                job.status = "done"
+            except Exception as e:
+                print(f"❌ 스캔 작업 실패 ({job.video_id}): {e}")
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                job.finished_at = time.time()
+                with self._lock:
+                    if self._active_by_key.get(job.key) == job.job_id:
+                        del self._active_by_key[job.key]
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        with self._lock:
+            statuses = [j.status for j in self._jobs.values()]
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "running": statuses.count("running"),
+            "done": statuses.count("done"),
+            "failed": statuses.count("failed")
+        }
+
+
+scan_manager = ScanManager()
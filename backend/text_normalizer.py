@@ -0,0 +1,150 @@
+# ==============================
+# 필터 / 캐시용 댓글 텍스트 정규화
+# ==============================
+# 욕설 규칙(r"씨\s*발")은 공백만 허용하기 때문에 아래와 같은 우회 표기는 전부 GPT로 넘어감
+#   ㅆㅣㅂㅏㄹ / 씨.발 / ｗｗｗ / 씨\u200b발 / h77p://
+# 댓글마다 한 번 정규화한 텍스트를 로컬 필터와 캐시 키에 같이 사용
+# (GPT에는 원문을 그대로 보냄)
+#
+# 처리 순서
+#   1. 폭 없는 문자 / 한글 채움 문자 제거
+#   2. 한글 사이에 끼운 구두점 제거 (최대 3글자)
+#   3. 낱자 조합 (ㅆㅣㅂㅏㄹ → 씨발)
+#   4. NFKC (전각 → 반각, ① → 1 등)
+#   5. NFKC가 바꿔 놓은 첫가끝 낱자를 호환 낱자로 되돌림 (ᄏ → ㅋ)
+#   6. 소문자
+#   7. 같은 글자 4번 이상 반복 → 3번 (ㅋㅋㅋㅋㅋ → ㅋㅋㅋ)
+# ❗ 숫자는 2 / 7 단계에서 건드리지 않음
+#   - 전화번호(010-1111-2222)가 광고 규칙에 계속 걸려야 함
+#   - 정규화 텍스트가 캐시 키이므로 1000000원 / 1000원, 2024년3월 / 2024년월이 합쳐지면 안 됨
+#   8. 영문 단어에 붙은 숫자 치환 (h77p → http, n00b → noob)
+import re
+import unicodedata
+
+# ❗ 정규화 방식을 바꾸면 버전을 올려야 캐시 / 저장된 로컬 판정이 무효화됨
+NORMALIZER_VERSION = "n2"
+
+# 1. 눈에 안 보이는 문자
+_INVISIBLE_RE = re.compile(
+    "[\u00ad"          # soft hyphen
+    "\u034f"           # combining grapheme joiner
+    "\u115f\u1160"     # 한글 초성 / 중성 채움
+    "\u180e"           # mongolian vowel separator
+    "\u200b-\u200f"
+    "\u2060-\u2064"
+    "\u3164"           # 한글 채움 문자
+    "\ufeff"
+    "\uffa0]"          # 반각 한글 채움 문자
+)
+
+# 2. 한글 사이 구분자 (공백은 규칙에서 \s* 로 처리하므로 그대로 둠, 이모티콘 / 숫자도 유지)
+_HANGUL = "가-힣ㄱ-ㅣ"
+_SEPARATOR = r"[_!-/:-@\[-`{-~·•‥…ㆍ\uff01-\uff0f\uff1a-\uff20\uff3b-\uff40\uff5b-\uff65]"
+_SEPARATOR_RE = re.compile(f"(?<=[{_HANGUL}]){_SEPARATOR}{{1,3}}(?=[{_HANGUL}])")
+
+# 3. 호환 낱자 조합표
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+              "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+_CHO_INDEX = {c: i for i, c in enumerate(_CHOSEONG)}
+_JUNG_INDEX = {c: i for i, c in enumerate(_JUNGSEONG)}
+_JONG_INDEX = {c: i for i, c in enumerate(_JONGSEONG) if c}
+_VOWEL_RE = re.compile("[ㅏ-ㅣ]")
+# 자음 + 모음 (+ 뒤에 모음이 오지 않는 자음 = 받침)
+_JAMO_SYLLABLE_RE = re.compile("([ㄱ-ㅎ])([ㅏ-ㅣ])(?:([ㄱ-ㅎ])(?![ㅏ-ㅣ]))?")
+
+
+def _compose_syllable(m) -> str:
+    cho, jung, jong = m.group(1), m.group(2), m.group(3)
+    if cho not in _CHO_INDEX:       # ㄳ 같은 겹자음은 초성이 될 수 없음
+        return m.group()
+    tail = ""
+    if jong and jong not in _JONG_INDEX:    # ㄸ ㅃ ㅉ 은 받침이 될 수 없음
+        jong, tail = None, jong
+    code = 0xAC00 + (_CHO_INDEX[cho] * 21 + _JUNG_INDEX[jung]) * 28 + _JONG_INDEX.get(jong, 0)
+    return chr(code) + tail
+
+
+# 5. 첫가끝 낱자(U+1100~U+11FF) → 호환 낱자(U+3131~)
+def _build_conjoining_map() -> dict:
+    table = {}
+    for cp in range(0x1100, 0x1200):
+        try:
+            name = unicodedata.name(chr(cp))
+        except ValueError:
+            continue
+        for part in ("CHOSEONG ", "JUNGSEONG ", "JONGSEONG "):
+            if part in name:
+                try:
+                    table[cp] = unicodedata.lookup(name.replace(part, "LETTER "))
+                except KeyError:
+                    pass
+    return table
+
+
+_CONJOINING_TO_COMPAT = _build_conjoining_map()
+
+# 7. 반복 글자 (숫자 제외)
+_REPEAT_RE = re.compile(r"(\D)\1\1\1+")
+
+# 8. 영문 단어에 붙은 1~2자리 숫자 (전화번호 / 연도 같은 숫자 덩어리는 건드리지 않음)
+_LEET = str.maketrans("013457", "oieast")
+_LEET_DIGIT_RE = re.compile("[013457]")
+_LEET_RE = re.compile(r"(?<![0-9])(?:(?<=[a-z])[013457]{1,2}|[013457]{1,2}(?=[a-z]))(?![0-9])")
+
+
+def normalize_text(text: str) -> str:
+    """필터 / 캐시 키용 정규화 텍스트 반환 (원문 길이와 달라질 수 있음)"""
+    if not text:
+        return ""
+
+    if not text.isascii():
+        text = _INVISIBLE_RE.sub("", text)
+        text = _SEPARATOR_RE.sub("", text)
+        if _VOWEL_RE.search(text):
+            text = _JAMO_SYLLABLE_RE.sub(_compose_syllable, text)
+        if not unicodedata.is_normalized("NFKC", text):
+            text = unicodedata.normalize("NFKC", text).translate(_CONJOINING_TO_COMPAT)
+
+    text = text.lower()
+    text = _REPEAT_RE.sub(r"\1\1\1", text)
+    if _LEET_DIGIT_RE.search(text):
+        text = _LEET_RE.sub(lambda m: m.group().translate(_LEET), text)
+    return text
+
+
+# ==============================
+# 회귀 확인용 예시 (python -m backend.text_normalizer)
+# ==============================
+# (원문, 정규화 결과, 광고 규칙에 걸려야 하는지)
+REGRESSION_CASES = [
+    ("ㅆㅣㅂㅏㄹ", "씨발", False),
+    ("씨.발", "씨발", False),
+    ("ㅋㅋㅋㅋㅋㅋ", "ㅋㅋㅋ", False),
+    ("h77p://spam.example", "http://spam.example", True),
+    ("문의 010-1111-2222", "문의 010-1111-2222", True),
+    ("문의 01022223333", "문의 01022223333", True),
+    ("문의 02-000-0000", "문의 02-000-0000", True),
+    ("1000000원", "1000000원", False),
+    ("2024년3월", "2024년3월", False),
+]
+
+
+def _check_regressions() -> int:
+    from backend.filter_engine import KIND_AD, RuleStore
+
+    matcher = RuleStore().current()
+    failed = 0
+    for text, expected, is_ad in REGRESSION_CASES:
+        normalized = normalize_text(text)
+        ad_hit = KIND_AD in matcher.scan(normalized)
+        if normalized != expected or ad_hit != is_ad:
+            failed += 1
+            print(f"❌ {text!r} → {normalized!r} (기대값 {expected!r}), 광고 규칙 {ad_hit} (기대값 {is_ad})")
+    print(f"{'✅' if not failed else '⚠️'} 정규화 회귀 확인: {len(REGRESSION_CASES) - failed}/{len(REGRESSION_CASES)} 통과")
+    return failed
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if _check_regressions() else 0)
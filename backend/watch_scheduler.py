@@ -0,0 +1,159 @@
+# ==============================
+# 감시 영상 새 댓글 주기 확인 (프로세스 내부 스케줄러)
+# ==============================
+# - WATCH_TICK초마다 watchlist에서 확인할 때가 된 영상을 골라 poll_new_comments 실행
+# - 새 댓글만 받음 (high_water_mark 이후, 최신순으로 받다가 멈춤)
+# - 다음 확인 간격은 댓글 속도에 맞춰 조정
+#     새 댓글이 있으면: 한 번 확인할 때 WATCH_TARGET_NEW개 정도 쌓이는 간격
+#     없으면: 간격 x WATCH_BACKOFF
+#   (WATCH_MIN_INTERVAL ~ WATCH_MAX_INTERVAL 사이)
+# - YouTube 할당량이 모자라면 이번 확인은 건너뛰고 다음 tick에 다시 시도
+# - 명시적으로 켠 프로세스 하나에서만 실행 (WATCH_SCHEDULER_ENABLED=1, 기본 꺼짐)
+#     python run.py                        → 개발 서버 안에서 같이 실행
+#     python -m backend.watch_scheduler    → WSGI 서버(gunicorn 등)와 별도로 전용 프로세스 1개
+#   ❗ 할당량 계산은 프로세스마다 따로 하므로 여러 곳에서 켜면 영상마다 중복 확인 + 할당량 중복 사용
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.database import get_due_watches, update_watch
+from backend.youtube_api import poll_new_comments
+from backend.youtube_quota import quota, QuotaExceeded
+
+WATCH_SCHEDULER_ENABLED = os.getenv("WATCH_SCHEDULER_ENABLED", "0") == "1"
+WATCH_TICK = float(os.getenv("WATCH_TICK", "30"))
+WATCH_WORKERS = int(os.getenv("WATCH_WORKERS", "2"))
+WATCH_BATCH = int(os.getenv("WATCH_BATCH", "20"))                       # tick 한 번에 확인할 최대 영상 수
+WATCH_MAX_PER_POLL = int(os.getenv("WATCH_MAX_PER_POLL", "200"))       # 처음 확인할 때 받을 최근 댓글 수
+WATCH_DEFAULT_INTERVAL = int(os.getenv("WATCH_DEFAULT_INTERVAL", "1800"))
+WATCH_MIN_INTERVAL = int(os.getenv("WATCH_MIN_INTERVAL", "300"))
+WATCH_MAX_INTERVAL = int(os.getenv("WATCH_MAX_INTERVAL", str(6 * 3600)))
+WATCH_TARGET_NEW = int(os.getenv("WATCH_TARGET_NEW", "50"))
+WATCH_BACKOFF = float(os.getenv("WATCH_BACKOFF", "1.5"))
+
+
+def next_interval(interval: float, new_count: int, elapsed: float) -> int:
+    """
+    다음 확인 간격(초)
+    elapsed: 지난 확인부터 지금까지 걸린 시간 (첫 확인이면 직전 간격)
+    """
+    if new_count > 0 and elapsed > 0:
+        rate = new_count / elapsed      # 초당 새 댓글 수
+        interval = WATCH_TARGET_NEW / rate
+    else:
+        interval = interval * WATCH_BACKOFF
+    return int(min(WATCH_MAX_INTERVAL, max(WATCH_MIN_INTERVAL, interval)))
+
+
+class WatchScheduler:
+
+    def __init__(self, tick: float = WATCH_TICK, workers: int = WATCH_WORKERS):
+        self.tick = tick
+        self.workers = max(1, workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="watch-poll")
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.polls = 0
+        self.new_comments = 0
+        self.errors = 0
+        self.skipped_quota = 0
+        self.last_tick_at = None
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="watch-scheduler", daemon=True)
+            self._thread.start()
+        print(f"✅ 감시 스케줄러 시작 (확인 주기 {self.tick}초, 워커 {self.workers}개)")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"⚠️ 감시 스케줄러 오류: {e}")
+            self._stop.wait(self.tick)
+
+    def run_once(self) -> int:
+        """확인할 때가 된 영상을 처리하고 처리한 영상 수 반환"""
+        self.last_tick_at = time.time()
+        # 영상 하나에 최소 videos.list + commentThreads.list 1페이지
+        budget = quota.affordable_pages(WATCH_BATCH * 2) // 2
+        if budget == 0:
+            self.skipped_quota += 1
+            return 0
+        due = get_due_watches(budget)
+        list(self._executor.map(self._poll, due))
+        return len(due)
+
+    def _poll(self, watch: dict):
+        video_id = watch["video_id"]
+        since = watch["high_water_mark"]
+        interval = watch["poll_interval"] or WATCH_DEFAULT_INTERVAL
+        # 지난 확인부터 걸린 시간은 DB에서 계산 (last_polled_at이 DB의 NOW()로 기록되므로)
+        since_last_poll = watch.get("since_last_poll")
+        elapsed = max(0, int(since_last_poll)) if since_last_poll is not None else interval
+
+        try:
+            result = poll_new_comments(video_id, since, WATCH_MAX_PER_POLL)
+        except QuotaExceeded as e:
+            # 기준 시각은 그대로 두고 간격만 유지 → 할당량이 돌아오면 이어서 확인
+            print(f"⚠️ 할당량 부족으로 감시 확인 연기 ({video_id}): {e}")
+            self.skipped_quota += 1
+            update_watch(video_id, since, interval, 0, str(e))
+            return
+        except Exception as e:
+            print(f"❌ 감시 확인 실패 ({video_id}): {e}")
+            self.errors += 1
+            update_watch(video_id, since, next_interval(interval, 0, elapsed), 0, str(e))
+            return
+
+        # since와 같은 시각의 댓글은 이미 본 댓글
+        new_count = sum(1 for c in result["comments"] if not since or c["publishedAt"] > since)
+        interval = next_interval(interval, new_count, elapsed)
+        update_watch(video_id, result["high_water_mark"], interval, new_count)
+        with self._lock:
+            self.polls += 1
+            self.new_comments += new_count
+        if new_count:
+            print(f"🔔 {video_id}: 새 댓글 {new_count}개 (다음 확인 {interval}초 후)")
+
+    def stats(self) -> dict:
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "tick": self.tick,
+            "workers": self.workers,
+            "polls": self.polls,
+            "new_comments": self.new_comments,
+            "errors": self.errors,
+            "skipped_quota": self.skipped_quota,
+            "last_tick_at": self.last_tick_at
+        }
+
+
+watch_scheduler = WatchScheduler()
+
+
+def main():
+    """스케줄러 전용 프로세스 (Ctrl+C로 종료)"""
+    if not WATCH_SCHEDULER_ENABLED:
+        print("⚠️ WATCH_SCHEDULER_ENABLED=1 일 때만 실행합니다 (스케줄러는 프로세스 하나에서만 켤 것)")
+        return
+    watch_scheduler.start()
+    try:
+        while watch_scheduler.stats()["running"]:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("⏹️ 감시 스케줄러 종료")
+        watch_scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
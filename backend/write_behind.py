@@ -0,0 +1,113 @@
+# ==============================
+# DB 쓰기 지연(write-behind) 큐
+# ==============================
+# - 요청 스레드는 분류가 끝나면 저장 작업을 큐에 넣고 바로 응답
+# - 백그라운드 워커 1개가 순서대로 save_video_with_comments 실행
+# - 큐가 가득 차면 요청 스레드에서 직접 저장 (데이터 유실 없음)
+#   저장은 항상 _persist_lock 하나로 직렬화 → 워커와 요청 스레드가 동시에 쓰지 않음
+#   (동시에 쓰면 같은 댓글을 서로 "처음 집계"로 보고 작성자 통계를 두 번 올릴 수 있음)
+# - 프로세스 종료 시 남은 작업을 비우고 끝냄
+import atexit
+import os
+import queue
+import threading
+import time
+
+from backend.database import save_video_with_comments
+from backend.metrics import DB_WRITE_SECONDS, DB_WRITES, DB_ROWS, Gauge
+
+WRITE_BEHIND_QUEUE_SIZE = int(os.getenv("WRITE_BEHIND_QUEUE_SIZE", "100"))
+WRITE_BEHIND_PUT_TIMEOUT = float(os.getenv("WRITE_BEHIND_PUT_TIMEOUT", "2"))
+
+
+class WriteBehindQueue:
+
+    def __init__(self, persist_fn, maxsize: int = WRITE_BEHIND_QUEUE_SIZE):
+        self.persist_fn = persist_fn
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._worker = None
+        self._lock = threading.Lock()
+        self._persist_lock = threading.Lock()   # 저장은 한 번에 하나씩 (워커 / 요청 스레드 공통)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.inline_writes = 0
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(
+                        target=self._run, name="db-write-behind", daemon=True
+                    )
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            video_info, db_comments = self._queue.get()
+            try:
+                self._persist(video_info, db_comments)
+            finally:
+                self._queue.task_done()
+
+    def _persist(self, video_info, db_comments):
+        with self._persist_lock:
+            self._persist_locked(video_info, db_comments)
+
+    def _persist_locked(self, video_info, db_comments):
+        started = time.perf_counter()
+        try:
+            stats = self.persist_fn(video_info, db_comments)
+            DB_WRITE_SECONDS.observe(time.perf_counter() - started)
+            DB_WRITES.inc(result="ok" if stats["videos"] else "error")    # 롤백되면 모두 0
+            for table, rows in stats.items():
+                DB_ROWS.inc(rows, table=table)
+            self.completed += 1
+            print(f"✅ DB 저장 완료 - 비디오: {stats['videos']}, 사용자: {stats['users']}, 댓글: {stats['comments']}, 분석: {stats['analyses']}")
+        except Exception as e:
+            DB_WRITE_SECONDS.observe(time.perf_counter() - started)
+            DB_WRITES.inc(result="error")
+            self.failed += 1
+            print(f"⚠️ DB 저장 중 오류 발생: {e}")
+
+    def submit(self, video_info: dict, db_comments: list):
+        """저장 작업 등록 (큐가 가득 차 있으면 현재 스레드에서 바로 저장, 워커 저장이 끝나길 기다림)"""
+        self.submitted += 1
+        self._ensure_worker()
+        try:
+            self._queue.put((video_info, db_comments), timeout=WRITE_BEHIND_PUT_TIMEOUT)
+        except queue.Full:
+            self.inline_writes += 1
+            self._persist(video_info, db_comments)
+
+    def flush(self):
+        """큐에 쌓인 저장 작업이 모두 끝날 때까지 대기"""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.join()
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize(),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "inline_writes": self.inline_writes
+        }
+
+
+writer = WriteBehindQueue(save_video_with_comments)
+atexit.register(writer.flush)
+Gauge("write_behind_pending", "DB 저장 대기 중인 페이지 수", lambda: writer.stats()["pending"])
+
+
+def persist_scan(video_info: dict, db_comments: list):
+    """
+    분석 결과 저장 단계 (유일한 DB 쓰기 경로)
+
+    - video_info: get_video_info() 결과
+    - db_comments: CommentRecord 목록 (backend.comment_record)
+    저장은 백그라운드에서 진행되며 호출은 바로 반환된다.
+    """
+    if not video_info or not db_comments:
+        return
+    writer.submit(video_info, db_comments)
@@ -2,13 +2,21 @@
 # 환경변수 로드
 # ==============================
 import os
+import hashlib
+import math
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 load_dotenv()
 
 # ==============================
 # YouTube API 라이브러리
 # ==============================
-from googleapiclient.discovery import build
+# discovery / httplib2는 import가 느려서 처음 요청할 때 불러옴
+from googleapiclient.errors import HttpError
 
 # ==============================
 # OpenAI 댓글 분석 함수
@@ -16,41 +24,157 @@ from googleapiclient.discovery import build
 # ❗ 1순위 개선 포인트:
 # - analyze_comment 내부 GPT 프롬프트를
 #   "확실할 때만 위험" 기준으로 완화해야 함
-from backend.openai_service import analyze_comment
+# - 댓글은 페이지 단위로 classify_comments에 모아서 보냄 (배치 호출)
+from backend.openai_service import classify_comments, current_model_versions
+from backend.text_normalizer import normalize_text
+from backend.dedup import get_dedup_index
+from backend.blacklist import blacklist, BLACKLIST_MODEL_VERSION
+from backend.comment_record import CommentRecord, UNCLASSIFIED_CATEGORY
 
 
 # ==============================
 # DB 저장 모듈
 # ==============================
-from backend.database import (
-    save_video_with_comments, 
-    init_database,
-    save_video,
-    save_user,
-    save_comment_and_analysis
-)
+from backend.database import get_stored_analyses, get_reply_counts
+from backend.write_behind import persist_scan
+
+# ==============================
+# 할당량 계산 / 응답 캐시
+# ==============================
+from backend.cache import LRUCache
+from backend.youtube_quota import quota, QuotaExceeded
+from backend.metrics import YOUTUBE_SECONDS, YOUTUBE_REQUESTS, PAGE_SECONDS, SCAN_COMMENTS
 
 # ==============================
 # YouTube API Key
 # ==============================
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
-# ❗ API 키 없을 때 바로 에러 확인용
-if not YOUTUBE_API_KEY:
-    raise ValueError("YOUTUBE_API_KEY가 .env에 없습니다.")
+# ==============================
+# YouTube Data API 객체 (처음 사용할 때 생성)
+# ==============================
+# - import 시점에는 만들지 않음 → API 키가 없어도 앱 / 관리자 페이지는 뜨고,
+#   키가 없다는 에러는 실제로 YouTube를 호출할 때 남
+# - discovery 문서는 라이브러리에 포함된 정적 문서 사용 (네트워크 요청 없음)
+# - set_youtube_client()로 가짜 클라이언트로 교체 가능 (벤치마크 / 테스트)
+_youtube = None
+_youtube_lock = threading.Lock()
+
+
+def get_youtube_client():
+    global _youtube
+    if _youtube is None:
+        with _youtube_lock:
+            if _youtube is None:
+                # ❗ API 키 없을 때 바로 에러 확인용
+                if not YOUTUBE_API_KEY:
+                    raise ValueError("YOUTUBE_API_KEY가 .env에 없습니다.")
+                from googleapiclient.discovery import build
+                _youtube = build(
+                    "youtube",
+                    "v3",
+                    developerKey=YOUTUBE_API_KEY,
+                    static_discovery=True,
+                    cache_discovery=False
+                )
+    return _youtube
+
+
+def set_youtube_client(client):
+    """사용할 클라이언트 교체 (None이면 다음 사용 때 실제 클라이언트를 다시 생성)"""
+    global _youtube
+    with _youtube_lock:
+        _youtube = client
+
+# ==============================
+# 페이지 미리 받기(prefetch) 설정
+# ==============================
+# 분석 중인 페이지보다 몇 페이지까지 앞서 받아둘지
+YT_PREFETCH_PAGES = int(os.getenv("YT_PREFETCH_PAGES", "2"))
+YOUTUBE_HTTP_TIMEOUT = float(os.getenv("YOUTUBE_HTTP_TIMEOUT", "30"))
+
+_thread_local = threading.local()
+_fetch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="yt-fetch")
+
+# ==============================
+# YouTube 응답 캐시 (같은 영상을 연달아 스캔할 때 할당량 절약)
+# ==============================
+# - TTL 안의 응답은 요청 없이 그대로 사용
+# - TTL이 지난 응답은 ETag로 조건부 요청 (304면 본문 재사용)
+YT_VIDEO_CACHE_TTL = float(os.getenv("YT_VIDEO_CACHE_TTL", "300"))
+YT_PAGE_CACHE_TTL = float(os.getenv("YT_PAGE_CACHE_TTL", "120"))
+YT_RESPONSE_CACHE_SIZE = int(os.getenv("YT_RESPONSE_CACHE_SIZE", "2000"))
+YT_ETAG_TTL = float(os.getenv("YT_ETAG_TTL", "86400"))     # ETag 재검증용 보관 기간
+
+_response_cache = LRUCache(maxsize=YT_RESPONSE_CACHE_SIZE, ttl=YT_ETAG_TTL)
+_response_stats = {"fresh_hits": 0, "not_modified": 0, "fetches": 0}
+
+
+def _execute_cached(method, make_request, cache_key, fresh_ttl, http=None):
+    """
+    YouTube API 요청 실행 (응답 캐시 → ETag 조건부 요청 → 할당량 차감)
+
+    - method: 할당량 계산용 메서드 이름 (예: "commentThreads.list")
+    - make_request: googleapiclient 요청 객체를 만드는 함수
+    - cache_key: 응답 캐시 키 (영상 ID / 페이지 토큰 등)
+    할당량이 부족하면 QuotaExceeded
+    """
+    entry = _response_cache.get(cache_key)      # (받은 시각, 응답 본문)
+    if entry is not None and time.monotonic() - entry[0] < fresh_ttl:
+        _response_stats["fresh_hits"] += 1
+        YOUTUBE_REQUESTS.inc(method=method, result="cache")
+        return entry[1]
+
+    quota.charge(method)
+    request = make_request()
+    if entry is not None and entry[1].get("etag"):
+        request.headers["If-None-Match"] = entry[1]["etag"]
+    started = time.perf_counter()
+    try:
+        body = request.execute(http=http)
+    except HttpError as e:
+        YOUTUBE_SECONDS.observe(time.perf_counter() - started, method=method)
+        if entry is not None and e.resp.status == 304:
+            YOUTUBE_REQUESTS.inc(method=method, result="not_modified")
+            _response_stats["not_modified"] += 1
+            _response_cache.set(cache_key, (time.monotonic(), entry[1]))
+            return entry[1]
+        YOUTUBE_REQUESTS.inc(method=method, result="error")
+        raise
+    except Exception:
+        YOUTUBE_SECONDS.observe(time.perf_counter() - started, method=method)
+        YOUTUBE_REQUESTS.inc(method=method, result="error")
+        raise
+    YOUTUBE_SECONDS.observe(time.perf_counter() - started, method=method)
+    YOUTUBE_REQUESTS.inc(method=method, result="ok")
+    _response_stats["fetches"] += 1
+    _response_cache.set(cache_key, (time.monotonic(), body))
+    return body
+
+
+def get_youtube_usage() -> dict:
+    """할당량 사용량 + 응답 캐시 지표"""
+    return {"quota": quota.stats(), "cache": {**_response_stats, "size": len(_response_cache)}}
 
 # ==============================
-# YouTube Data API 객체 생성
+# 답글 수집 설정 (comments.list(parentId=...))
 # ==============================
-youtube = build(
-    "youtube",
-    "v3",
-    developerKey=YOUTUBE_API_KEY
-)
+YT_INCLUDE_REPLIES = os.getenv("YT_INCLUDE_REPLIES", "0") == "1"     # 기본값 (요청마다 지정 가능)
+YT_REPLY_WORKERS = int(os.getenv("YT_REPLY_WORKERS", "4"))             # 동시에 받는 스레드(댓글) 수
+YT_MAX_REPLIES_PER_THREAD = int(os.getenv("YT_MAX_REPLIES_PER_THREAD", "100"))
+YT_MAX_REPLIES_PER_SCAN = int(os.getenv("YT_MAX_REPLIES_PER_SCAN", "1000"))
+_reply_executor = ThreadPoolExecutor(max_workers=YT_REPLY_WORKERS, thread_name_prefix="yt-replies")
+
+# 분석 결과로 허용하는 카테고리 (그 외 값은 '정상' 처리)
+# - 로컬 광고 필터 / GPT는 '스팸'을 돌려주므로 함께 허용
+# - '미분류': GPT 호출 실패 (DB에 분석 행을 남기지 않음)
+VALID_CATEGORIES = ["정상", "위험", "욕설", "혐오", "광고", "스팸", UNCLASSIFIED_CATEGORY]
+
 
-def get_video_info(video_id):
+def get_video_info(video_id, http=None):
     """
     YouTube 비디오 정보 가져오기
+    (http: 백그라운드 스레드에서 호출할 때 쓸 스레드 전용 httplib2.Http)
     
     Returns:
         Dict: {
@@ -67,11 +191,11 @@ def get_video_info(video_id):
         }
     """
     try:
-        request = youtube.videos().list(
-            part="snippet,statistics",
-            id=video_id
+        response = _execute_cached(
+            "videos.list",
+            lambda: get_youtube_client().videos().list(part="snippet,statistics", id=video_id),
+            ("videos", video_id), YT_VIDEO_CACHE_TTL, http
         )
-        response = request.execute()
         
         if not response.get("items"):
             raise ValueError(f"비디오를 찾을 수 없습니다: {video_id}")
@@ -106,129 +230,560 @@ def get_video_info(video_id):
         raise
 
 
-def get_comments(video_id, max_results=50):
-    """
-    유튜브 댓글을 가져와서
-    각 댓글을 OpenAI(GPT)로 분석한 뒤 반환
+def extract_video_id(youtube_url):
+    """YouTube 영상 URL(watch?v= / youtu.be / shorts)에서 영상 ID 추출 (없으면 None)"""
+    patterns = [r"v=([^&]+)", r"youtu\.be/([^?]+)", r"shorts/([^?]+)"]
+    for pattern in patterns:
+        match = re.search(pattern, youtube_url)
+        if match: return match.group(1)
+    return None
 
-    ✔ max_results: 최대로 가져올 댓글 수 (50, 100, 200 등)
 
-    ⚠️ 주의:
-    - YouTube API는 한 번에 최대 50개만 반환
-    - nextPageToken으로 반복 호출 필요
+def get_uploads_playlist_id(channel_id):
+    """채널의 '업로드한 동영상' 재생목록 ID (channels.list, 1 unit)"""
+    response = _execute_cached(
+        "channels.list",
+        lambda: get_youtube_client().channels().list(part="contentDetails", id=channel_id),
+        ("channels", channel_id), YT_VIDEO_CACHE_TTL
+    )
+    if not response.get("items"):
+        raise ValueError(f"채널을 찾을 수 없습니다: {channel_id}")
+    return response["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+
+def iter_playlist_video_ids(playlist_id, limit=None):
     """
+    재생목록의 영상 ID를 순서대로 내보냄 (playlistItems.list, 50개당 1 unit)
+    채널 전체는 업로드 재생목록으로 조회 (search.list는 100 unit이라 사용하지 않음)
+    """
+    page_token, count = None, 0
+    while True:
+        response = _execute_cached(
+            "playlistItems.list",
+            lambda: get_youtube_client().playlistItems().list(
+                part="contentDetails",
+                playlistId=playlist_id,
+                maxResults=50,
+                pageToken=page_token
+            ),
+            ("playlistItems", playlist_id, page_token), YT_PAGE_CACHE_TTL
+        )
+        for item in response.get("items", []):
+            yield item["contentDetails"]["videoId"]
+            count += 1
+            if limit and count >= limit:
+                return
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return
 
-    results = []        # 프론트엔드용 간단한 형식
-    db_comments = []    # DB 저장용 상세 형식
-    page_token = None   # 🔥 페이지네이션용 토큰
 
-    danger_count = 0    # 🔥 위험 댓글 개수 (요약용)
+def _propagated(label: dict, cluster_id: str) -> dict:
+    """묶음 대표의 판정을 다른 댓글에 복사 (새 댓글이므로 stored 표시는 빼고 저장 대상으로)"""
+    analysis = {k: v for k, v in label.items() if k != "stored"}
+    analysis["cluster_id"] = cluster_id
+    return analysis
 
-    # ==============================
-    # 🔁 nextPageToken이 있는 동안 반복 호출
-    # ==============================
-    while len(results) < max_results:
-
-        request = youtube.commentThreads().list(
-            part="snippet",
-            videoId=video_id,
-            maxResults=50,            # ❗ YouTube API 최대값은 항상 50
-            textFormat="plainText",
-            pageToken=page_token      # 🔥 다음 페이지 요청
-        )
 
-        response = request.execute()
+def _author_id(snippet: dict) -> str:
+    """작성자 ID: authorChannelId, 없으면 authorDisplayName 해시"""
+    author_id = snippet.get("authorChannelId", {}).get("value", "")
+    if not author_id:
+        author_id = hashlib.md5(snippet["authorDisplayName"].encode()).hexdigest()
+    return author_id
 
-        # ==============================
-        # 댓글 하나씩 처리
-        # ==============================
-        for item in response.get("items", []):
-            top_comment = item["snippet"]["topLevelComment"]
-            snippet = top_comment["snippet"]
-            text = snippet["textDisplay"]
-            youtube_comment_id = top_comment["id"]
-            author_id = snippet.get("authorChannelId", {}).get("value", "")
-            
-            # authorChannelId가 없으면 authorDisplayName을 해시해서 사용
-            if not author_id:
-                import hashlib
-                author_id = hashlib.md5(snippet["authorDisplayName"].encode()).hexdigest()
-
-            # =====================================================
-            # 🔥 OpenAI(GPT)로 댓글 분석
-            # =====================================================
-            analysis = analyze_comment(text)
 
-            # ==============================
-            # 🔥 category 정규화 (매우 중요)
-            # ==============================
-            raw_category = analysis.get("category", "정상")
-
-            # GPT가 이상한 값 주면 무조건 정상 처리
-            if raw_category not in ["정상", "위험", "욕설", "혐오", "광고"]:
-                raw_category = "정상"
-
-            if raw_category == "위험":
-                danger_count += 1
-
-            # 프론트엔드용 간단한 형식 (기존 호환성 유지)
-            results.append({
-                "author": snippet["authorDisplayName"],
-                "text": text,
-                "likeCount": snippet["likeCount"],
-                "publishedAt": snippet["publishedAt"],
-                "category": raw_category,
-                "reason": analysis.get("reason", "분석 실패 또는 기본 처리")
-            })
-            
-            # DB 저장용 상세 정보
-            db_comments.append({
-                "user": {
-                    "user_id": author_id,
-                    "username": snippet["authorDisplayName"],
-                    "profile_image_url": snippet.get("authorProfileImageUrl", "")
-                },
-                "comment": {
-                    "youtube_comment_id": youtube_comment_id,
-                    "user_id": author_id,
-                    "comment_text": text,
-                    "like_count": snippet["likeCount"],
-                    "reply_count": item["snippet"].get("totalReplyCount", 0),
-                    "published_at": snippet["publishedAt"],
-                    "parent_comment_id": None,
-                    "is_reply": False
-                },
-                "analysis": {
-                    "category": raw_category,
-                    "reason": analysis.get("reason", ""),
-                    "confidence_score": 0.8
+def _classify_page(items, incremental=True, dedup_index=None, reply_counts=None):
+    """
+    commentThreads 한 페이지의 item 목록을 분석해서 CommentRecord 목록을 반환
+    (API 응답은 record.to_api(), DB 저장은 persist_scan(video_info, records))
+    dedup_index: 스캔 단위 유사 댓글 인덱스 (None이면 묶지 않음)
+    reply_counts: 이번에 답글을 모두 받은 스레드의 {댓글 ID: totalReplyCount}
+      (DB reply_count는 답글을 받은 시점의 개수 → 다음 스캔에서 변화가 없으면 건너뜀)
+    답글은 _reply_item()으로 감싸서 같은 목록에 넣으면 같이 분류된다.
+    """
+    started = time.perf_counter()
+    reply_counts = reply_counts or {}
+    texts = [item["snippet"]["topLevelComment"]["snippet"]["textDisplay"] for item in items]
+    comment_ids = [item["snippet"]["topLevelComment"]["id"] for item in items]
+    author_ids = [_author_id(item["snippet"]["topLevelComment"]["snippet"]) for item in items]
+    # 🚫 블랙리스트 작성자 판정 (메모리 dict 조회)
+    blacklisted = [blacklist.verdict(author_id) for author_id in author_ids]
+
+    # =====================================================
+    # 🔁 증분 모드: 저장된 분석 결과 조회 (페이지당 쿼리 1번)
+    # =====================================================
+    analyses = [None] * len(items)
+    versions = current_model_versions()
+    if incremental:
+        stored = get_stored_analyses(comment_ids, versions + [BLACKLIST_MODEL_VERSION])
+        for i, (comment_id, text) in enumerate(zip(comment_ids, texts)):
+            row = stored.get(comment_id)
+            # 차단이 풀린 작성자의 블랙리스트 판정은 버리고 다시 분석
+            if row and row["model_version"] == BLACKLIST_MODEL_VERSION and blacklisted[i] is None:
+                continue
+            # 수정된 댓글(내용이 달라진 경우)은 다시 분석
+            if row and row["comment_text"] == text:
+                analyses[i] = {
+                    "category": row["category"],
+                    "reason": row["reason"],
+                    "confidence_score": row["confidence_score"],
+                    "model_version": row["model_version"],
+                    "stored": True
                 }
-            })
 
-            # ❗ max_results 초과 방지
-            if len(results) >= max_results:
-                break
+    # =====================================================
+    # 🧬 유사 댓글 묶기: 묶음마다 대표 하나만 분류
+    # - 이미 판정이 있는 묶음(이전 페이지 / 저장된 결과)은 그 판정을 그대로 사용
+    # =====================================================
+    clusters = [None] * len(items)
+    if dedup_index is not None:
+        clusters = dedup_index.assign(comment_ids, [normalize_text(t) for t in texts])
+        for cluster_id, analysis in zip(clusters, analyses):
+            # 블랙리스트 판정은 작성자 기준이라 다른 작성자의 비슷한 댓글에 옮기지 않음
+            if analysis is not None and analysis.get("model_version") != BLACKLIST_MODEL_VERSION:
+                dedup_index.set_label(cluster_id, analysis, versions)
+
+    # 차단된 작성자의 새 댓글은 분류하지 않고 바로 판정
+    stored_count = sum(1 for a in analyses if a is not None)
+    blacklisted_count = 0
+    for i, verdict in enumerate(blacklisted):
+        if verdict is not None and analyses[i] is None:
+            analyses[i] = verdict
+            blacklisted_count += 1
+
+    to_classify, waiting = [], []
+    page_leaders = set()
+    for i, analysis in enumerate(analyses):
+        if analysis is not None:
+            continue
+        cluster_id = clusters[i]
+        label = dedup_index.get_label(cluster_id, versions) if cluster_id is not None else None
+        if label is not None:
+            analyses[i] = _propagated(label, cluster_id)
+        elif cluster_id is not None and cluster_id in page_leaders:
+            waiting.append(i)       # 같은 페이지의 대표 결과를 기다림
+        else:
+            to_classify.append(i)
+            if cluster_id is not None:
+                page_leaders.add(cluster_id)
+
+    # =====================================================
+    # 🔥 페이지 단위 분석 (로컬 필터 → GPT 배치)
+    # - 결과는 texts와 같은 순서로 매핑되어 돌아옴
+    # =====================================================
+    leader_results = {}
+    for i, analysis in zip(to_classify, classify_comments([texts[i] for i in to_classify])):
+        analyses[i] = analysis
+        if clusters[i] is not None:
+            leader_results[clusters[i]] = analysis
+            # 분석 오류(버전 없음)는 다른 페이지로 전파하지 않음
+            if analysis.get("model_version"):
+                dedup_index.set_label(clusters[i], analysis, versions)
+    for i in waiting:
+        analyses[i] = _propagated(leader_results[clusters[i]], clusters[i])
+
+    SCAN_COMMENTS.inc(stored_count, source="stored")
+    SCAN_COMMENTS.inc(blacklisted_count, source="blacklist")
+    SCAN_COMMENTS.inc(len(items) - stored_count - blacklisted_count - len(to_classify), source="dedup")
+    SCAN_COMMENTS.inc(len(to_classify), source="classified")
+
+    records = []
+    for item, text, analysis, cluster_id, author_id in zip(items, texts, analyses, clusters, author_ids):
+        top_comment = item["snippet"]["topLevelComment"]
+        snippet = top_comment["snippet"]
 
         # ==============================
-        # 다음 페이지 토큰 처리
+        # 🔥 category 정규화 (매우 중요)
         # ==============================
-        page_token = response.get("nextPageToken")
+        raw_category = analysis.get("category", "정상")
+
+        # GPT가 이상한 값 주면 무조건 정상 처리
+        if raw_category not in VALID_CATEGORIES:
+            raw_category = "정상"
 
-        # ❗ 다음 페이지 없으면 종료
+        records.append(CommentRecord(
+            comment_id=top_comment["id"],
+            author_id=author_id,
+            author_name=snippet["authorDisplayName"],
+            text=text,
+            like_count=snippet["likeCount"],
+            published_at=snippet["publishedAt"],
+            parent_id=item["snippet"].get("parentId"),     # 답글이면 부모 댓글 ID
+            reply_count=reply_counts.get(top_comment["id"]),
+            cluster_id=cluster_id,
+            category=raw_category,
+            reason=analysis.get("reason"),
+            confidence_score=analysis.get("confidence_score", 0.8),
+            model_version=analysis.get("model_version"),
+            stored=analysis.get("stored", False)
+        ))
+
+    PAGE_SECONDS.observe(time.perf_counter() - started)
+    return records
+
+
+def _reply_item(reply: dict, parent_id: str) -> dict:
+    """답글(comments 리소스)을 commentThreads item 모양으로 감쌈 (_classify_page 공용)"""
+    return {"snippet": {"topLevelComment": reply, "parentId": parent_id}}
+
+
+def _fetch_replies(parent_id: str, limit: int):
+    """
+    comments.list(parentId)로 답글을 최대 limit개 받음 (백그라운드 스레드용)
+    (답글 목록, 끝까지 받았는지) 반환 — 할당량이 모자라면 받은 데까지만
+    """
+    replies, page_token = [], None
+    while len(replies) < limit:
+        try:
+            response = _execute_cached(
+                "comments.list",
+                lambda: get_youtube_client().comments().list(
+                    part="snippet",
+                    parentId=parent_id,
+                    maxResults=100,
+                    textFormat="plainText",
+                    pageToken=page_token
+                ),
+                ("comments", parent_id, page_token), YT_PAGE_CACHE_TTL, _thread_http()
+            )
+        except QuotaExceeded as e:
+            print(f"⚠️ 할당량 부족으로 답글 수집 중단 ({parent_id}): {e}")
+            return replies, False
+        replies.extend(response.get("items", []))
+        page_token = response.get("nextPageToken")
         if not page_token:
             break
+    return replies[:limit], True
+
 
+def _collect_replies(items, budget: int):
+    """
+    한 페이지의 스레드들에서 답글을 모아 옴
+
+    - totalReplyCount가 지난 스캔(DB reply_count)과 같은 스레드는 건너뜀
+    - 답글 5개 이하 스레드는 commentThreads 응답(part=replies)에 이미 들어 있어 추가 요청 없음
+    - 나머지는 YT_REPLY_WORKERS개씩 동시에 요청
+    - 스레드당 YT_MAX_REPLIES_PER_THREAD, 스캔 전체 budget 개까지만
+    반환: ({부모 ID: [답글 item, ...]}, {끝까지 받은 스레드 ID: totalReplyCount}, 남은 budget)
+    """
+    threads = [item for item in items if item["snippet"].get("totalReplyCount", 0) > 0]
+    if not threads or budget <= 0:
+        return {}, {}, budget
+
+    known = get_reply_counts([item["snippet"]["topLevelComment"]["id"] for item in threads])
+    replies_by_parent, ingested, pending = {}, {}, []
+    for item in threads:
+        thread_id = item["snippet"]["topLevelComment"]["id"]
+        total = item["snippet"]["totalReplyCount"]
+        if known.get(thread_id) == total:
+            continue        # 지난 스캔 이후 답글 변화 없음
+        if budget <= 0:
+            break
+        limit = min(total, YT_MAX_REPLIES_PER_THREAD, budget)
+        budget -= limit
+        # 스캔 전체 한도에 걸려 덜 받은 스레드는 기록하지 않음 → 다음 스캔에서 다시 받음
+        # (스레드당 한도는 정책이므로 그만큼만 받았어도 다 받은 것으로 봄)
+        full = limit == min(total, YT_MAX_REPLIES_PER_THREAD)
+
+        inline = item.get("replies", {}).get("comments", [])
+        if len(inline) >= total:
+            replies_by_parent[thread_id] = [_reply_item(r, thread_id) for r in inline[:limit]]
+            if full:
+                ingested[thread_id] = total
+        else:
+            pending.append((thread_id, total, full, _reply_executor.submit(_fetch_replies, thread_id, limit)))
+
+    for thread_id, total, full, future in pending:
+        try:
+            replies, complete = future.result()
+        except Exception as e:
+            print(f"⚠️ 답글 가져오기 실패 ({thread_id}): {e}")
+            continue
+        replies_by_parent[thread_id] = [_reply_item(r, thread_id) for r in replies]
+        if complete and full:
+            ingested[thread_id] = total
+    return replies_by_parent, ingested, budget
+
+
+def _thread_http():
+    """
+    스레드별 httplib2.Http 객체
+    (httplib2는 스레드 안전하지 않으므로 백그라운드 요청은 각자 Http를 사용)
+    """
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        import httplib2
+        http = httplib2.Http(timeout=YOUTUBE_HTTP_TIMEOUT)
+        _thread_local.http = http
+    return http
+
+
+def _put_until_stopped(q, item, stop):
+    """소비자가 중단되면 더 기다리지 않고 포기하는 queue.put"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.2)
+            return
+        except queue.Full:
+            continue
+
+
+def _prefetch_comment_pages(video_id, max_results, stop, lookahead=YT_PREFETCH_PAGES, include_replies=False):
+    """
+    commentThreads 페이지를 백그라운드 스레드에서 미리 받아오는 큐를 반환
+    - 소비자가 페이지 N을 분석하는 동안 N+1 페이지를 요청
+    - 큐 크기(lookahead)만큼만 앞서 나감
+    - 큐 항목: ("page", response) / ("truncated", 이유) / ("error", 예외) / ("end", None)
+      truncated: 할당량이 바닥나 남은 페이지를 받지 못함
+    - include_replies: 답글 일부(최대 5개)를 같이 받음 (할당량 비용 동일)
+    """
+    pages = queue.Queue(maxsize=max(1, lookahead))
+    part = "snippet,replies" if include_replies else "snippet"
+
+    def producer():
+        fetched = 0
+        page_token = None   # 🔥 페이지네이션용 토큰
+        try:
+            while fetched < max_results and not stop.is_set():
+                try:
+                    response = _execute_cached(
+                        "commentThreads.list",
+                        lambda: get_youtube_client().commentThreads().list(
+                            part=part,
+                            videoId=video_id,
+                            maxResults=50,            # ❗ YouTube API 최대값은 항상 50
+                            textFormat="plainText",
+                            pageToken=page_token      # 🔥 다음 페이지 요청
+                        ),
+                        ("commentThreads", video_id, part, page_token), YT_PAGE_CACHE_TTL, _thread_http()
+                    )
+                except QuotaExceeded as e:
+                    # 이미 받은 페이지가 있으면 거기까지만 분석 (스캔 축소)
+                    if not fetched:
+                        raise
+                    print(f"⚠️ 할당량 부족으로 {fetched}개에서 스캔 중단: {e}")
+                    _put_until_stopped(pages, ("truncated", str(e)), stop)
+                    break
+                fetched += len(response.get("items", []))
+                _put_until_stopped(pages, ("page", response), stop)
+
+                # ❗ 다음 페이지 없으면 종료
+                page_token = response.get("nextPageToken")
+                if not page_token:
+                    break
+        except Exception as e:
+            _put_until_stopped(pages, ("error", e), stop)
+        finally:
+            _put_until_stopped(pages, ("end", None), stop)
+
+    threading.Thread(target=producer, name=f"yt-prefetch-{video_id}", daemon=True).start()
+    return pages
+
+
+def _fetch_video_info(video_id):
+    """비디오 정보 조회 (백그라운드 스레드용, 실패하면 None)"""
+    try:
+        return get_video_info(video_id, http=_thread_http())
+    except Exception as e:
+        print(f"⚠️ 비디오 정보 없이 진행 (DB 저장 생략): {e}")
+        return None
+
+
+def iter_comment_pages(video_id, max_results=50, incremental=True, include_replies=None):
+    """
+    댓글을 페이지 단위로 가져와 분석하면서 바로바로 내보내는 제너레이터
+
+    yield 순서:
+      1. {"type": "video_info", "video_info": {...} 또는 None}
+      2. {"type": "comments", "comments": [...]}  ← 페이지마다 1번
+      3. {"type": "truncated", "reason": ..., "fetched": N}  ← 할당량 때문에 끝까지 못 받은 경우만
+
+    - 페이지 결과는 분석 즉시 DB 저장 큐로 넘기고 보관하지 않음
+      (메모리 사용량이 max_results가 아니라 페이지 크기에 비례)
+    - 비디오 정보 / 다음 페이지는 분석과 동시에 백그라운드에서 요청
+    - 할당량이 모자라면 받을 수 있는 만큼으로 줄이고, 한 페이지도 안 되면 QuotaExceeded
+    - include_replies: 답글도 수집해 부모 댓글 바로 뒤에 넣음 (None이면 YT_INCLUDE_REPLIES)
+      max_results는 최상위 댓글 기준, 답글은 YT_MAX_REPLIES_PER_SCAN개까지 추가
+    """
+    if include_replies is None:
+        include_replies = YT_INCLUDE_REPLIES
     # ==============================
-    # 🔥 비디오 정보 가져오기 및 DB 저장
+    # 💰 할당량 확인: 남은 양으로 받을 수 있는 만큼만 스캔 (하나도 못 받으면 거부)
     # ==============================
+    pages_needed = math.ceil(max_results / 50)
+    pages_allowed = quota.affordable_pages(pages_needed, overhead=1)
+    if pages_allowed == 0:
+        raise QuotaExceeded("오늘 YouTube API 할당량을 모두 사용했습니다. 내일 다시 시도하세요.")
+    reduced = None
+    if pages_allowed < pages_needed:
+        reduced = f"할당량 부족: {max_results}개 → {pages_allowed * 50}개로 축소"
+        print(f"⚠️ {reduced}")
+        max_results = pages_allowed * 50
+
+    stop = threading.Event()
+    video_info_future = _fetch_executor.submit(_fetch_video_info, video_id)
+    pages = _prefetch_comment_pages(video_id, max_results, stop, include_replies=include_replies)
+    reply_budget = YT_MAX_REPLIES_PER_SCAN
+
+    fetched = 0         # 지금까지 내보낸 댓글 수
+    truncated = None    # 끝까지 못 받은 이유
+    video_info = None
+    dedup_index = None
     try:
-        video_info = get_video_info(video_id)
-        
-        # DB에 저장
-        stats = save_video_with_comments(video_info, db_comments)
-        print(f"✅ DB 저장 완료 - 비디오: {stats['videos']}, 사용자: {stats['users']}, 댓글: {stats['comments']}, 분석: {stats['analyses']}")
-    except Exception as e:
-        print(f"⚠️ DB 저장 중 오류 발생 (계속 진행): {e}")
+        while fetched < max_results:
+            kind, payload = pages.get()
+            if kind == "end":
+                break
+            if kind == "error":
+                raise payload
+            if kind == "truncated":
+                truncated = payload
+                continue
+
+            # ==============================
+            # 🔥 비디오 정보 (DB 저장 시 videos 행이 먼저 필요)
+            # - 첫 페이지를 받는 동안 이미 받아져 있음
+            # - 채널 ID로 유사 댓글 인덱스 선택 (같은 채널의 이전 스캔과 묶음 공유)
+            # ==============================
+            first_page = video_info_future is not None
+            if first_page:
+                video_info = video_info_future.result()
+                video_info_future = None
+                dedup_index = get_dedup_index(video_info.get("channel_id") if video_info else None)
+
+            # 이번 페이지 댓글 (max_results 초과분은 버림)
+            items = payload.get("items", [])[:max_results - fetched]
+            fetched += len(items)
+
+            # 💬 답글: 부모 댓글 바로 뒤에 끼워서 같은 배치로 분류
+            reply_counts = {}
+            if include_replies:
+                replies_by_parent, reply_counts, reply_budget = _collect_replies(items, reply_budget)
+                if replies_by_parent:
+                    items = [
+                        entry
+                        for item in items
+                        for entry in [item, *replies_by_parent.get(item["snippet"]["topLevelComment"]["id"], [])]
+                    ]
+            records = _classify_page(items, incremental, dedup_index, reply_counts)
+
+            if first_page:
+                yield {"type": "video_info", "video_info": video_info}
+
+            # DB 저장은 write-behind 큐에서 처리
+            persist_scan(video_info, records)
+
+            yield {"type": "comments", "comments": [record.to_api() for record in records]}
+
+        # 댓글이 하나도 없는 영상이어도 video_info는 내보냄
+        if video_info_future is not None:
+            yield {"type": "video_info", "video_info": video_info_future.result()}
+
+        # 줄인 개수를 다 채웠으면 뒤에 댓글이 더 있을 수 있음
+        if truncated is None and reduced and fetched >= max_results:
+            truncated = reduced
+        if truncated:
+            yield {"type": "truncated", "reason": truncated, "fetched": fetched}
+    finally:
+        # 소비자가 중간에 멈추면 미리 받기 스레드도 중단
+        stop.set()
+
+
+def poll_new_comments(video_id, since=None, max_results=200):
+    """
+    감시 중인 영상의 새 댓글만 가져와 분석 / 저장 (스케줄러용)
+
+    - 최신순(order=time)으로 페이지를 받다가 since(마지막으로 본 publishedAt)보다
+      오래된 댓글이 나오면 그 페이지에서 멈춤 → 스레드 전체를 다시 읽지 않음
+    - since와 같은 시각의 댓글은 다시 받지만 증분 분석으로 저장된 결과를 재사용
+    - 고정 댓글은 최신순에서도 맨 위에 올 수 있어서 첫 페이지 첫 댓글은 멈춤 조건에서 제외
+    - since가 없으면(처음 감시) 최근 max_results개만 받음
+    - since가 있으면 max_results와 상관없이 since에 닿을 때까지 계속 받음
+      (중간에 멈추고 기준 시각을 최신 댓글로 옮기면 그 사이 댓글을 영영 놓침)
+      → 할당량이 모자라 QuotaExceeded로 끝나면 호출한 쪽이 기준 시각을 그대로 두고 다시 확인
+    반환: {"video_info", "comments": [...], "high_water_mark": 가장 최근 publishedAt, "pages"}
+    """
+    video_info = get_video_info(video_id)
+    dedup_index = get_dedup_index(video_info.get("channel_id"))
+    results = []
+    high_water_mark = since
+    page_token, pages, fetched = None, 0, 0
+
+    while since or fetched < max_results:
+        per_page = 100 if since else min(100, max_results - fetched)
+        response = _execute_cached(
+            "commentThreads.list",
+            lambda: get_youtube_client().commentThreads().list(
+                part="snippet",
+                videoId=video_id,
+                order="time",
+                maxResults=per_page,
+                textFormat="plainText",
+                pageToken=page_token
+            ),
+            ("commentThreads", video_id, "time", per_page, page_token), YT_PAGE_CACHE_TTL
+        )
+        items = response.get("items", [])
+        new_items = []
+        reached_old = False
+        for i, item in enumerate(items):
+            published_at = item["snippet"]["topLevelComment"]["snippet"]["publishedAt"]
+            if since and published_at < since:
+                if pages == 0 and i == 0:
+                    continue        # 고정 댓글일 수 있음
+                reached_old = True
+                break
+            new_items.append(item)
+            if not high_water_mark or published_at > high_water_mark:
+                high_water_mark = published_at
+        pages += 1
+        fetched += len(new_items)
+
+        if new_items:
+            records = _classify_page(new_items, True, dedup_index)
+            persist_scan(video_info, records)
+            results.extend(record.to_api() for record in records)
+
+        page_token = response.get("nextPageToken")
+        if reached_old or not page_token:
+            break
+
+    return {"video_info": video_info, "comments": results, "high_water_mark": high_water_mark, "pages": pages}
+
+
+def get_comments(video_id, max_results=50, incremental=True, on_page=None, include_replies=None):
+    """
+    유튜브 댓글을 가져와서
+    각 댓글을 OpenAI(GPT)로 분석한 뒤 반환
+
+    ✔ max_results: 최대로 가져올 댓글 수 (50, 100, 200 등)
+    ✔ incremental: True면 현재 모델 버전으로 이미 분석된 댓글은
+      DB에 저장된 결과를 그대로 사용 (내용이 바뀐 댓글만 재분석)
+    ✔ on_page: 페이지 분석이 끝날 때마다 호출되는 콜백
+      on_page(page_results) — 진행률 표시 / 부분 결과 전달용
+    ✔ include_replies: 답글도 수집 / 분석 (None이면 YT_INCLUDE_REPLIES 환경변수)
+
+    ⚠️ 주의:
+    - YouTube API는 한 번에 최대 50개만 반환
+    - nextPageToken으로 반복 호출 필요
+    - 결과를 모두 모아서 반환하므로, 바로바로 받으려면 iter_comment_pages 사용
+    - 할당량 때문에 끝까지 못 받았으면 "truncated"에 이유 (아니면 None)
+    """
+    video_info = None
+    truncated = None
+    results = []
+
+    for event in iter_comment_pages(video_id, max_results, incremental, include_replies):
+        if event["type"] == "video_info":
+            video_info = event["video_info"]
+            continue
+        if event["type"] == "truncated":
+            truncated = event["reason"]
+            continue
+        results.extend(event["comments"])
+        if on_page:
+            on_page(event["comments"])
 
     # ==============================
     # 🔥 요약 정보 포함해서 반환
@@ -237,7 +792,8 @@ def get_comments(video_id, max_results=50):
         "video_info": video_info,  # ⭐ 이 줄을 반드시 추가하세요!
         "summary": {
             "total": len(results),
-            "danger": danger_count
+            "danger": sum(1 for c in results if c["category"] == "위험")
         },
+        "truncated": truncated,
         "comments": results
     }
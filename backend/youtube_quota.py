@@ -0,0 +1,103 @@
+# ==============================
+# YouTube Data API 할당량(quota) 계산기
+# ==============================
+# - 메서드별 사용 단위(unit)를 누적 (commentThreads.list = 1, search.list = 100 ...)
+# - 하루 한도(YOUTUBE_DAILY_QUOTA)는 태평양 시간 자정에 초기화 (YouTube 기준)
+# - 남은 양이 예비분(YOUTUBE_QUOTA_RESERVE) 아래로 내려가는 요청은 거부 → 스캔 축소 / 중단
+# - 프로세스 단위 계산 (서버를 여러 개 띄우면 YOUTUBE_DAILY_QUOTA를 나눠서 설정)
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+from backend.metrics import Gauge
+
+try:
+    from zoneinfo import ZoneInfo
+    _QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+except Exception:       # tzdata가 없는 환경 (Windows 등)
+    _QUOTA_TZ = timezone(timedelta(hours=-8))
+
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+# 이만큼은 남겨 둠 (관리자 조회 / 단건 조회용)
+YOUTUBE_QUOTA_RESERVE = int(os.getenv("YOUTUBE_QUOTA_RESERVE", "200"))
+
+# 메서드별 비용 (https://developers.google.com/youtube/v3/determine_quota_cost)
+METHOD_COSTS = {
+    "videos.list": 1,
+    "channels.list": 1,
+    "playlistItems.list": 1,
+    "commentThreads.list": 1,
+    "comments.list": 1,
+    "search.list": 100,
+}
+
+
+class QuotaExceeded(Exception):
+    """오늘 남은 할당량으로는 요청할 수 없을 때"""
+
+
+class QuotaMeter:
+
+    def __init__(self, daily_limit: int = YOUTUBE_DAILY_QUOTA, reserve: int = YOUTUBE_QUOTA_RESERVE):
+        self.daily_limit = daily_limit
+        self.reserve = reserve
+        self._day = None
+        self._used = 0
+        self._by_method = {}
+        self.refused = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _today():
+        return datetime.now(_QUOTA_TZ).date()
+
+    def _roll_day(self):
+        """날짜가 바뀌었으면 사용량 초기화 (_lock 안에서 호출)"""
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._used = 0
+            self._by_method = {}
+
+    @property
+    def available(self) -> int:
+        """예비분을 빼고 지금 쓸 수 있는 양"""
+        with self._lock:
+            self._roll_day()
+            return max(0, self.daily_limit - self.reserve - self._used)
+
+    def charge(self, method: str, units: int = None, use_reserve: bool = False):
+        """요청 1건 비용 차감 (한도를 넘으면 QuotaExceeded, 차감하지 않음)"""
+        units = METHOD_COSTS.get(method, 1) if units is None else units
+        with self._lock:
+            self._roll_day()
+            limit = self.daily_limit if use_reserve else self.daily_limit - self.reserve
+            if self._used + units > limit:
+                self.refused += 1
+                raise QuotaExceeded(
+                    f"YouTube API 할당량 부족 ({method}: 오늘 {self._used}/{self.daily_limit} 사용)"
+                )
+            self._used += units
+            self._by_method[method] = self._by_method.get(method, 0) + units
+
+    def affordable_pages(self, pages: int, method: str = "commentThreads.list", overhead: int = 0) -> int:
+        """pages 페이지 중 지금 할당량으로 받을 수 있는 페이지 수 (overhead: 같이 필요한 다른 요청 비용)"""
+        cost = METHOD_COSTS.get(method, 1)
+        return max(0, min(pages, (self.available - overhead) // cost))
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._roll_day()
+            return {
+                "day": self._day.isoformat(),
+                "daily_limit": self.daily_limit,
+                "reserve": self.reserve,
+                "used": self._used,
+                "remaining": max(0, self.daily_limit - self._used),
+                "by_method": dict(self._by_method),
+                "refused": self.refused
+            }
+
+
+quota = QuotaMeter()
+Gauge("youtube_quota_remaining", "오늘 남은 YouTube API 할당량 (unit)", lambda: quota.stats()["remaining"])
@@ -0,0 +1,4 @@
+# ==============================
+# 오프라인 성능 측정 (YouTube / OpenAI / MySQL 없이)
+# ==============================
+# python -m bench.run --help
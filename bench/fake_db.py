@@ -0,0 +1,189 @@
+# ==============================
+# 벤치마크용 DB 대상
+# ==============================
+# - RecordingPool: MySQL 없이 SQL 문만 세는 가짜 풀 (SELECT 결과는 항상 빈 목록)
+#   → 매 스캔이 "처음 보는 영상"으로 동작 (저장된 분석 / 답글 수 / 블랙리스트 없음)
+# - CountingPool: 실제 ConnectionPool을 감싸 SQL 문 수만 셈 (--db mysql)
+# - prepare_mysql_database: 버리는 데이터베이스(이름이 _bench로 끝나야 함)를 새로 만듦
+# database.py의 pool 변수를 바꿔 끼워서 사용 (db_connection()이 호출 시점에 pool을 읽음)
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+import pymysql
+
+
+class StatementCounter:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_verb = {}
+
+    def count(self, sql: str):
+        verb = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "?"
+        with self._lock:
+            self.by_verb[verb] = self.by_verb.get(verb, 0) + 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_verb.values())
+
+    def reset(self):
+        with self._lock:
+            self.by_verb = {}
+
+
+class _CountingCursor:
+    """execute / executemany 한 번을 SQL 문 1개로 셈 (executemany는 다중 행 INSERT 한 번)"""
+
+    def __init__(self, cursor, counter: StatementCounter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def execute(self, sql, params=None):
+        self._counter.count(sql)
+        return self._cursor.execute(sql, params) if self._cursor else 0
+
+    def executemany(self, sql, rows):
+        self._counter.count(sql)
+        return self._cursor.executemany(sql, rows) if self._cursor else 0
+
+    def fetchall(self):
+        return self._cursor.fetchall() if self._cursor else []
+
+    def fetchone(self):
+        return self._cursor.fetchone() if self._cursor else None
+
+    def __getattr__(self, name):
+        if self._cursor is None:
+            return 0        # rowcount / lastrowid
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._cursor:
+            self._cursor.close()
+        return False
+
+
+class _RecordingConnection:
+    open = True
+    server_status = 0
+
+    def __init__(self, counter: StatementCounter):
+        self.counter = counter
+
+    def cursor(self, *args):
+        return _CountingCursor(None, self.counter)
+
+    def ping(self, reconnect=False):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _CountingConnection:
+
+    def __init__(self, conn, counter: StatementCounter):
+        self.conn = conn
+        self.counter = counter
+
+    def cursor(self, *args):
+        return _CountingCursor(self.conn.cursor(*args), self.counter)
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+class RecordingPool:
+
+    def __init__(self, counter: StatementCounter):
+        self.counter = counter
+        self.checkouts = 0
+
+    def acquire(self, timeout: float = None):
+        self.checkouts += 1
+        return _RecordingConnection(self.counter)
+
+    def release(self, conn, broken: bool = False):
+        pass
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        yield self.acquire(timeout)
+
+    def close_all(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"recording": True, "checkouts": self.checkouts, "statements": self.counter.total}
+
+
+class CountingPool:
+
+    def __init__(self, pool, counter: StatementCounter):
+        self.pool = pool
+        self.counter = counter
+
+    def acquire(self, timeout: float = None):
+        return _CountingConnection(self.pool.acquire(timeout), self.counter)
+
+    def release(self, conn, broken: bool = False):
+        self.pool.release(conn.conn, broken)
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        with self.pool.connection(timeout) as conn:
+            yield _CountingConnection(conn, self.counter)
+
+    def close_all(self):
+        self.pool.close_all()
+
+    def stats(self) -> dict:
+        return {**self.pool.stats(), "statements": self.counter.total}
+
+
+def _sql_statements(path: str) -> list:
+    """init_db.sql을 문장 단위로 나눔 (-- 주석 줄 제거)"""
+    with open(path, encoding="utf-8") as f:
+        lines = [line for line in f if not line.lstrip().startswith("--")]
+    return [s.strip() for s in "".join(lines).split(";") if s.strip()]
+
+
+def prepare_mysql_database(name: str, host: str, port: int, user: str, password: str):
+    """버리는 벤치마크 DB를 지우고 init_db.sql 스키마로 새로 만듦"""
+    if not re.fullmatch(r"[A-Za-z0-9_]+_bench", name):
+        raise ValueError(f"벤치마크 DB 이름은 _bench로 끝나야 합니다 (실수로 운영 DB를 지우지 않도록): {name}")
+    schema = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend", "init_db.sql")
+    conn = pymysql.connect(host=host, port=port, user=user, password=password, charset="utf8mb4")
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{name}`")
+            cursor.execute(f"CREATE DATABASE `{name}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+            cursor.execute(f"USE `{name}`")
+            for statement in _sql_statements(schema):
+                cursor.execute(statement)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def drop_mysql_database(name: str, host: str, port: int, user: str, password: str):
+    if not name.endswith("_bench"):
+        return
+    conn = pymysql.connect(host=host, port=port, user=user, password=password, charset="utf8mb4")
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{name}`")
+    finally:
+        conn.close()
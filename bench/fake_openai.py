@@ -0,0 +1,125 @@
+# ==============================
+# 가짜 OpenAI chat.completions 서버 (로컬 HTTP)
+# ==============================
+# - POST /v1/chat/completions 만 처리
+# - 사용자 메시지의 "N. 댓글" 줄을 읽어 키워드로 분류한 JSON 배열을 돌려줌
+# - latency / jitter: 요청마다 대기 시간(초)
+# - error_rate: 이 비율만큼 429(retry-after-ms 포함) / 500 응답 → 디스패처 재시도 경로 측정
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DANGER_WORDS = ["씨발", "시발", "병신", "ㅂㅅ", "닥쳐", "꺼져", "죽어", "ㅆㅣㅂㅏㄹ", "씨.발"]
+SPAM_WORDS = ["수익", "카톡", "문의", "링크", "텔레그램", "리딩방", "부업", "http"]
+LINE = re.compile(r"^(\d+)\.\s?(.*)$")
+
+
+def fake_category(text: str) -> str:
+    if any(word in text for word in DANGER_WORDS):
+        return "위험"
+    if any(word in text for word in SPAM_WORDS):
+        return "스팸"
+    return "정상"
+
+
+class FakeOpenAIServer:
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.comments = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _draw(self):
+        """(대기 시간, 오류 응답 코드 또는 None)"""
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            status = None
+            if self._rng.random() < self.error_rate:
+                self.errors += 1
+                status = self._rng.choice([429, 500])
+        return delay, status
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: dict, headers: dict = None):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if not self.path.endswith("/chat/completions"):
+                    self._send(404, {"error": {"message": "not found"}})
+                    return
+
+                delay, status = server._draw()
+                time.sleep(delay)
+                if status == 429:
+                    self._send(429, {"error": {"message": "rate limited"}}, {"retry-after-ms": "20"})
+                    return
+                if status:
+                    self._send(status, {"error": {"message": "server error"}})
+                    return
+
+                user = payload["messages"][-1]["content"]
+                results = []
+                for line in user.splitlines():
+                    match = LINE.match(line.strip())
+                    if match:
+                        results.append({"index": int(match.group(1)), "category": fake_category(match.group(2)),
+                                        "reason": "벤치마크 응답"})
+                with server._lock:
+                    server.comments += len(results)
+                content = json.dumps(results, ensure_ascii=False)
+                self._send(200, {
+                    "id": "chatcmpl-bench",
+                    "object": "chat.completion",
+                    "model": payload.get("model"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                                 "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": len(user) // 2, "completion_tokens": len(content) // 2},
+                })
+
+        return Handler
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "errors": self.errors, "comments": self.comments}
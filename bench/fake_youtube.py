@@ -0,0 +1,113 @@
+# ==============================
+# 가짜 YouTube Data API 클라이언트 (메모리 데이터)
+# ==============================
+# youtube_api.set_youtube_client()로 설치. googleapiclient 객체와 같은 모양만 흉내냄:
+#   youtube.commentThreads().list(...).execute(http=None)
+#   request.headers (If-None-Match 설정용)
+# 지원: videos / commentThreads / comments / channels / playlistItems 의 list
+import time
+
+CHANNEL_UPLOADS_PREFIX = "UU"
+
+
+class FakeRequest:
+
+    def __init__(self, client, fn):
+        self.client = client
+        self.fn = fn
+        self.headers = {}
+
+    def execute(self, http=None):
+        self.client.requests += 1
+        if self.client.latency:
+            time.sleep(self.client.latency)
+        return self.fn()
+
+
+class _Resource:
+
+    def __init__(self, client, list_fn):
+        self.client = client
+        self.list_fn = list_fn
+
+    def list(self, **kwargs):
+        return FakeRequest(self.client, lambda: self.list_fn(**kwargs))
+
+
+def _page(items: list, max_results: int, page_token: str = None) -> dict:
+    """오프셋을 페이지 토큰으로 사용"""
+    start = int(page_token or 0)
+    end = start + max(1, int(max_results or 20))
+    response = {"items": items[start:end], "pageInfo": {"totalResults": len(items)}}
+    if end < len(items):
+        response["nextPageToken"] = str(end)
+    return response
+
+
+class FakeYouTube:
+
+    def __init__(self, videos: list, latency: float = 0.0):
+        """videos: fixtures.synthetic_videos / load_recorded 결과"""
+        self._videos = {v["video_id"]: v for v in videos}
+        self.latency = latency
+        self.requests = 0
+
+    # ==============================
+    # 리소스
+    # ==============================
+    def videos(self):
+        return _Resource(self, self._videos_list)
+
+    def commentThreads(self):
+        return _Resource(self, self._threads_list)
+
+    def comments(self):
+        return _Resource(self, self._comments_list)
+
+    def channels(self):
+        return _Resource(self, self._channels_list)
+
+    def playlistItems(self):
+        return _Resource(self, self._playlist_list)
+
+    # ==============================
+    # list 구현
+    # ==============================
+    def _videos_list(self, id=None, **kwargs):
+        video = self._videos.get(id)
+        return {"items": [video["video"]] if video else []}
+
+    def _threads_list(self, videoId=None, part="snippet", maxResults=20, pageToken=None, order=None, **kwargs):
+        video = self._videos.get(videoId)
+        if video is None:
+            return {"items": []}
+        threads = video["threads"]
+        if order == "time":
+            threads = sorted(threads, key=lambda t: t["snippet"]["topLevelComment"]["snippet"]["publishedAt"],
+                             reverse=True)
+        response = _page(threads, maxResults, pageToken)
+        if "replies" in part:
+            # 실제 API처럼 답글은 스레드당 최대 5개만 같이 옴
+            response["items"] = [
+                {**item, "replies": {"comments": video["replies"].get(item["id"], [])[:5]}}
+                if item["snippet"].get("totalReplyCount") else item
+                for item in response["items"]
+            ]
+        return response
+
+    def _comments_list(self, parentId=None, maxResults=20, pageToken=None, **kwargs):
+        for video in self._videos.values():
+            if parentId in video["replies"]:
+                return _page(video["replies"][parentId], maxResults, pageToken)
+        return {"items": []}
+
+    def _channels_list(self, id=None, **kwargs):
+        return {"items": [{
+            "id": id,
+            "contentDetails": {"relatedPlaylists": {"uploads": CHANNEL_UPLOADS_PREFIX + (id or "")[2:]}}
+        }]}
+
+    def _playlist_list(self, playlistId=None, maxResults=50, pageToken=None, **kwargs):
+        # 재생목록 구분 없이 전체 영상
+        items = [{"contentDetails": {"videoId": video_id}} for video_id in self._videos]
+        return _page(items, maxResults, pageToken)
@@ -0,0 +1,178 @@
+# ==============================
+# 벤치마크용 commentThreads 데이터
+# ==============================
+# - 합성 데이터: 시드가 같으면 항상 같은 댓글 (한국어 일반 댓글 / 짧은 반응 / 이모지 /
+#   우회 표기 욕설 / 같은 광고를 조금씩 바꾼 도배 묶음 / 애매한 댓글 / 답글)
+# - 녹화 데이터: 실제 API 응답을 저장한 JSON 파일 (영상 하나당 파일 하나)
+#     {"video": <videos.list item>, "pages": [<commentThreads.list 응답>, ...]}
+#     또는 commentThreads.list 응답 목록 [...] / 응답 하나 {...}
+import glob
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+NORMAL = [
+    "영상 잘 봤습니다 다음 편도 기대할게요",
+    "이 부분 설명이 정말 이해하기 쉬웠어요",
+    "오늘도 퇴근길에 보면서 힘 얻고 갑니다",
+    "편집 실력이 갈수록 좋아지시네요",
+    "저도 같은 문제로 고민했는데 덕분에 해결했습니다",
+    "음악 정보 알 수 있을까요?",
+    "3분 20초 장면 진짜 웃기네요 ㅋㅋㅋ",
+    "처음 봤는데 구독하고 갑니다",
+    "부모님이랑 같이 봤는데 너무 좋아하셨어요",
+    "다음에는 부산 편도 해주세요",
+]
+SHORT = ["ㅋㅋㅋㅋ", "대박", "굿", "와", "1등", "ㅎㅇ", "좋아요", "최고"]
+EMOJI = ["👍👍👍", "😂😂", "❤️", "🔥🔥🔥🔥", "👏", "🥹🥹", "😍 너무 좋아요 😍", "🙏✨"]
+ABUSE = [
+    "씨발 이게 뭐냐",
+    "ㅆㅣㅂㅏㄹ 진짜 못하네",
+    "씨.발 광고 좀 그만해",
+    "병신같은 영상 왜 올림",
+    "ㅂㅅ 같은 소리 하고 있네",
+    "닥쳐 꺼져라 진짜",
+    "이런 놈은 죽어야 됨",
+]
+BORDERLINE = [
+    "이건 좀 아닌 것 같은데요 실망입니다",
+    "솔직히 예전이 더 나았음",
+    "말하는 거 보니까 생각이 없는 듯",
+    "이 사람 또 나왔네 지겹다",
+    "편집자 월급 깎아야 할 듯",
+]
+SPAM = [
+    "💰 하루 30분 투자로 월 500 수익 보장! 카톡 문의 주세요 {n}",
+    "부업 찾으시는 분 프로필 링크 확인 ㄱㄱ 선착순 {n}명",
+    "코인 리딩방 무료 입장 👉 텔레그램 @profit{n}",
+]
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _comment(comment_id: str, video_id: str, text: str, author: int, published: datetime,
+             parent_id: str = None) -> dict:
+    """comments 리소스 모양"""
+    snippet = {
+        "videoId": video_id,
+        "textDisplay": text,
+        "textOriginal": text,
+        "authorDisplayName": f"@user{author}",
+        "authorProfileImageUrl": "",
+        "authorChannelId": {"value": f"UCbenchuser{author:06d}"},
+        "likeCount": author % 17,
+        "publishedAt": _iso(published),
+        "updatedAt": _iso(published),
+    }
+    if parent_id:
+        snippet["parentId"] = parent_id
+    return {"kind": "youtube#comment", "id": comment_id, "snippet": snippet}
+
+
+def _pick_text(rng: random.Random, spam_burst: list) -> str:
+    """다음 댓글 내용 (도배 묶음이 진행 중이면 그 변형을 우선)"""
+    if spam_burst:
+        return spam_burst.pop()
+    roll = rng.random()
+    if roll < 0.45:
+        return rng.choice(NORMAL)
+    if roll < 0.60:
+        return rng.choice(SHORT)
+    if roll < 0.70:
+        return rng.choice(EMOJI)
+    if roll < 0.80:
+        return rng.choice(ABUSE)
+    if roll < 0.90:
+        return rng.choice(BORDERLINE) + " " + rng.choice(SHORT)
+    # 도배: 같은 광고를 숫자만 바꿔 연달아 여러 개
+    template = rng.choice(SPAM)
+    spam_burst.extend(template.format(n=rng.randint(1, 99)) for _ in range(rng.randint(3, 8)))
+    return spam_burst.pop()
+
+
+def synthetic_video(index: int, comments: int, seed: int = 0, replies: bool = False) -> dict:
+    """
+    합성 영상 하나: {"video_id", "video": videos.list item, "threads": [...], "replies": {부모 ID: [...]}}
+    스레드는 최신순 (order=time 기준)
+    """
+    rng = random.Random(f"{seed}:{index}")
+    video_id = f"bench{index:06d}"
+    channel_id = f"UCbenchchannel{index % 3:02d}"
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(days=index)
+    video = {
+        "kind": "youtube#video",
+        "id": video_id,
+        "snippet": {
+            "title": f"벤치마크 영상 {index}",
+            "channelTitle": f"벤치 채널 {index % 3}",
+            "channelId": channel_id,
+            "publishedAt": _iso(base),
+            "description": "",
+            "thumbnails": {},
+        },
+        "statistics": {"viewCount": "1000", "likeCount": "10", "commentCount": str(comments)},
+    }
+
+    threads, reply_map, spam_burst = [], {}, []
+    for i in range(comments):
+        thread_id = f"Ug{video_id}{i:06d}"
+        published = base + timedelta(minutes=comments - i)      # 최신순
+        top = _comment(thread_id, video_id, _pick_text(rng, spam_burst), rng.randint(1, comments), published)
+        reply_count = rng.choice([0, 0, 0, 0, 1, 2, 3, 8]) if replies else 0
+        thread_replies = [
+            _comment(f"{thread_id}.r{j}", video_id, _pick_text(rng, spam_burst), rng.randint(1, comments),
+                     published + timedelta(seconds=j + 1), parent_id=thread_id)
+            for j in range(reply_count)
+        ]
+        if thread_replies:
+            reply_map[thread_id] = thread_replies
+        threads.append({
+            "kind": "youtube#commentThread",
+            "id": thread_id,
+            "snippet": {
+                "videoId": video_id,
+                "topLevelComment": top,
+                "totalReplyCount": reply_count,
+                "canReply": True,
+                "isPublic": True,
+            },
+        })
+    return {"video_id": video_id, "video": video, "threads": threads, "replies": reply_map}
+
+
+def synthetic_videos(count: int, comments: int, seed: int = 0, replies: bool = False) -> list:
+    return [synthetic_video(i, comments, seed, replies) for i in range(count)]
+
+
+def load_recorded(path: str) -> list:
+    """녹화 파일(들)을 synthetic_video와 같은 모양으로 읽음 (path: 파일 또는 *.json이 있는 폴더)"""
+    paths = sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path]
+    videos = []
+    for file_path in paths:
+        with open(file_path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and "pages" in data:
+            video, pages = data.get("video"), data["pages"]
+        else:
+            video, pages = None, data if isinstance(data, list) else [data]
+
+        threads, reply_map = [], {}
+        for page in pages:
+            for item in page.get("items", []):
+                threads.append(item)
+                inline = item.get("replies", {}).get("comments", [])
+                if inline:
+                    reply_map[item["snippet"]["topLevelComment"]["id"]] = inline
+        if not threads:
+            print(f"⚠️ 댓글이 없는 녹화 파일 건너뜀: {file_path}")
+            continue
+
+        video_id = threads[0]["snippet"].get("videoId") or os.path.splitext(os.path.basename(file_path))[0]
+        if video is None:
+            video = {"id": video_id, "snippet": {"title": video_id, "channelId": "", "channelTitle": ""},
+                     "statistics": {}}
+        videos.append({"video_id": video_id, "video": video, "threads": threads, "replies": reply_map})
+    return videos
@@ -0,0 +1,317 @@
+# ==============================
+# 오프라인 스캔 벤치마크
+# ==============================
+# 실제 스캔 경로(get_comments → 분류 → write-behind 저장)를 그대로 돌리고
+# 바깥 서비스만 로컬 대역으로 바꿈
+#   - YouTube: 메모리 가짜 클라이언트 (합성 / 녹화 commentThreads)
+#   - OpenAI: 로컬 가짜 chat.completions 서버 (지연 / 오류율 조절)
+#   - DB: SQL 문만 세는 가짜 풀 (기본) 또는 버리는 MySQL DB (--db mysql)
+#
+# 보고: comments/sec, 단계별 p50 / p95 지연, 댓글 100개당 LLM 호출 수, 스캔당 SQL 문 수
+# 기준값(baseline)과 비교해 나빠진 항목이 있으면 종료 코드 1
+# (--db mysql은 준비 실행 결과가 DB에 남으므로 측정 구간이 재스캔 = 증분 분석 성능)
+#
+#   python -m bench.run --videos 10 --comments 500
+#   python -m bench.run --save-baseline          # 현재 결과를 기준값으로 저장
+#   python -m bench.run --gpt-error-rate 0.1 --replies
+#   python -m bench.run --db mysql --db-name youtube_bench
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench.fake_openai import FakeOpenAIServer
+from bench.fake_youtube import FakeYouTube
+from bench import fixtures
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+# 결정적인 값 (조금이라도 늘면 회귀)
+COUNT_METRICS = ["llm_calls_per_100_comments", "db_statements_per_scan", "youtube_requests_per_scan"]
+# 기준값과 비교하지 않는 설정 (출력 위치 등)
+IGNORED_CONFIG = {"baseline", "save_baseline", "output", "tolerance", "min_ms", "verbose", "db_keep"}
+
+
+# ==============================
+# 단계별 시간 측정
+# ==============================
+class StageTimer:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def wrap(self, owner, name: str, stage: str):
+        """owner.name 함수를 시간 측정 래퍼로 교체 (모듈 / 클래스 / 인스턴스 속성)"""
+        fn = getattr(owner, name)
+        timer = self
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                timer.record(stage, time.perf_counter() - started)
+
+        setattr(owner, name, timed)
+
+    def count(self, stage: str) -> int:
+        return len(self.samples.get(stage, []))
+
+    def summary(self) -> dict:
+        result = {}
+        for stage, values in sorted(self.samples.items()):
+            ordered = sorted(values)
+            result[stage] = {
+                "count": len(ordered),
+                "p50_ms": round(_percentile(ordered, 50) * 1000, 3),
+                "p95_ms": round(_percentile(ordered, 95) * 1000, 3),
+            }
+        return result
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    """nearest-rank 백분위 (ordered는 정렬된 목록)"""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+# ==============================
+# 환경 준비 (backend import 전에 환경변수를 정해야 함)
+# ==============================
+def _configure_env(args, openai_url: str):
+    os.environ["YOUTUBE_API_KEY"] = "bench"
+    os.environ["OPENAI_API_KEY"] = "bench"
+    os.environ["OPENAI_BASE_URL"] = openai_url
+    os.environ["CLASSIFY_CACHE_PATH"] = ""          # 디스크 분류 캐시 끔 (실행마다 같은 조건)
+    os.environ["LOCAL_MODEL_ENABLED"] = "1" if args.local_model else "0"
+    os.environ["YOUTUBE_DAILY_QUOTA"] = str(10 ** 9)
+    os.environ["WATCH_SCHEDULER_ENABLED"] = "0"
+    # 레이트 리밋 대기는 측정 대상이 아님 (재시도 / 동시 전송 경로는 그대로)
+    os.environ.setdefault("OPENAI_RPM_LIMIT", "1000000")
+    os.environ.setdefault("OPENAI_TPM_LIMIT", "1000000000")
+    if args.db == "mysql":
+        os.environ["DB_NAME"] = args.db_name
+
+
+def _load_videos(args) -> list:
+    if args.fixtures:
+        return fixtures.load_recorded(args.fixtures)
+    return fixtures.synthetic_videos(args.videos, args.comments, args.seed, args.replies)
+
+
+# ==============================
+# 실행
+# ==============================
+def run(args) -> dict:
+    fake_openai = FakeOpenAIServer(args.gpt_latency, args.gpt_jitter, args.gpt_error_rate, args.seed).start()
+    _configure_env(args, fake_openai.base_url)
+
+    from bench import fake_db
+    db_host, db_port = os.getenv("DB_HOST", "localhost"), int(os.getenv("DB_PORT", "3306"))
+    db_user, db_password = os.getenv("DB_USER", "root"), os.getenv("DB_PASSWORD", "1234")
+    if args.db == "mysql":
+        fake_db.prepare_mysql_database(args.db_name, db_host, db_port, db_user, db_password)
+
+    from backend import database, dedup, openai_service, youtube_api
+    from backend.write_behind import writer
+
+    counter = fake_db.StatementCounter()
+    if args.db == "mysql":
+        database.pool = fake_db.CountingPool(database.pool, counter)
+        database.init_database()
+    else:
+        database.pool = fake_db.RecordingPool(counter)
+
+    videos = _load_videos(args)
+    fake_youtube = FakeYouTube(videos, args.yt_latency)
+    youtube_api.set_youtube_client(fake_youtube)
+
+    timer = StageTimer()
+    totals = {"comments": 0, "scans": 0}
+
+    def scan(video):
+        started = time.perf_counter()
+        result = youtube_api.get_comments(video["video_id"], args.comments, include_replies=args.replies)
+        timer.record("scan", time.perf_counter() - started)
+        return result["summary"]["total"]
+
+    def scan_all():
+        # 반복마다 같은 조건 (응답 캐시 / 분류 캐시 / 채널 묶음 인덱스 비움)
+        youtube_api._response_cache.clear()
+        openai_service._classification_cache = None
+        dedup._channel_indexes.clear()
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            for count in pool.map(scan, videos):
+                totals["comments"] += count
+                totals["scans"] += 1
+        writer.flush()
+
+    log = io.StringIO()
+    try:
+        # 스캔 중 서버 로그(print)는 모아 두고 --verbose일 때만 출력
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else log):
+            # 첫 실행의 준비 비용(import / NumPy / 커넥션)은 측정에서 뺌
+            for _ in range(args.warmup):
+                scan_all()
+
+            timer.samples.clear()
+            timer.wrap(youtube_api, "_execute_cached", "youtube_fetch")
+            timer.wrap(youtube_api, "get_stored_analyses", "db_lookup")
+            timer.wrap(youtube_api, "get_reply_counts", "db_lookup")
+            timer.wrap(youtube_api, "_classify_page", "classify_page")
+            timer.wrap(youtube_api, "classify_comments", "classify")
+            timer.wrap(dedup.NearDuplicateIndex, "assign", "dedup")
+            timer.wrap(openai_service, "analyze_comments_batch", "llm_call")
+            timer.wrap(writer, "persist_fn", "db_save")
+            totals.update(comments=0, scans=0)
+            counter.reset()         # init_database / 준비 실행 문장은 세지 않음
+            fake_youtube.requests = 0
+            openai_before = fake_openai.stats()
+            failed_before = writer.failed
+
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                scan_all()
+            elapsed = time.perf_counter() - started
+    finally:
+        fake_openai.stop()
+        if args.db == "mysql" and not args.db_keep:
+            database.pool.close_all()
+            fake_db.drop_mysql_database(args.db_name, db_host, db_port, db_user, db_password)
+
+    total_comments, scans = totals["comments"], totals["scans"]
+    llm_calls = timer.count("llm_call")
+    openai_stats = {k: v - openai_before[k] for k, v in fake_openai.stats().items()}
+    per_100 = 100.0 / total_comments if total_comments else 0.0
+    return {
+        "config": {k: v for k, v in vars(args).items() if k not in IGNORED_CONFIG},
+        "metrics": {
+            "scans": scans,
+            "comments": total_comments,
+            "elapsed_seconds": round(elapsed, 3),
+            "comments_per_sec": round(total_comments / elapsed, 1) if elapsed else 0.0,
+            "llm_calls_per_100_comments": round(llm_calls * per_100, 3),
+            "llm_http_requests_per_100_comments": round(openai_stats["requests"] * per_100, 3),
+            "db_statements_per_scan": round(counter.total / scans, 2) if scans else 0.0,
+            "db_statements_by_verb": dict(sorted(counter.by_verb.items())),
+            "youtube_requests_per_scan": round(fake_youtube.requests / scans, 2) if scans else 0.0,
+            "write_failures": writer.failed - failed_before,
+            "stages": timer.summary(),
+        },
+        "fake_openai": openai_stats,
+    }
+
+
+# ==============================
+# 기준값 비교
+# ==============================
+def compare(report: dict, baseline: dict, tolerance: float, min_ms: float) -> list:
+    """나빠진 항목 목록 [(이름, 기준값, 현재값)]"""
+    old, new = baseline["metrics"], report["metrics"]
+    regressions = []
+
+    if new["comments_per_sec"] < old["comments_per_sec"] * (1 - tolerance):
+        regressions.append(("comments_per_sec", old["comments_per_sec"], new["comments_per_sec"]))
+
+    for name in COUNT_METRICS:
+        if name in old and new[name] > old[name] + 1e-9:
+            regressions.append((name, old[name], new[name]))
+
+    # 아주 짧은 단계는 잡음이 커서 min_ms 이상 늘었을 때만
+    for stage, stats in new["stages"].items():
+        base = old["stages"].get(stage)
+        if not base:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if stats[key] > base[key] * (1 + tolerance) and stats[key] - base[key] >= min_ms:
+                regressions.append((f"{stage}.{key}", base[key], stats[key]))
+    return regressions
+
+
+def print_report(report: dict):
+    m = report["metrics"]
+    print(f"📊 스캔 {m['scans']}회 / 댓글 {m['comments']}개 / {m['elapsed_seconds']}초")
+    print(f"   comments/sec            {m['comments_per_sec']}")
+    print(f"   LLM 호출 / 댓글 100개   {m['llm_calls_per_100_comments']} "
+          f"(HTTP 요청 {m['llm_http_requests_per_100_comments']}, 재시도 포함)")
+    print(f"   SQL 문 / 스캔           {m['db_statements_per_scan']} {m['db_statements_by_verb']}")
+    print(f"   YouTube 요청 / 스캔     {m['youtube_requests_per_scan']}")
+    if m["write_failures"]:
+        print(f"   ⚠️ DB 저장 실패 {m['write_failures']}건")
+    print(f"   {'단계':<16}{'횟수':>8}{'p50 ms':>12}{'p95 ms':>12}")
+    for stage, stats in m["stages"].items():
+        print(f"   {stage:<16}{stats['count']:>8}{stats['p50_ms']:>12.3f}{stats['p95_ms']:>12.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 스캔 벤치마크 (가짜 YouTube / OpenAI)")
+    parser.add_argument("--videos", type=int, default=5, help="합성 영상 수")
+    parser.add_argument("--comments", type=int, default=500, help="영상당 최대 댓글 수 (max_results)")
+    parser.add_argument("--replies", action="store_true", help="답글 포함")
+    parser.add_argument("--fixtures", help="녹화 JSON 파일 또는 폴더 (지정하면 합성 데이터 대신 사용)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="전체 영상 반복 횟수 (반복마다 캐시 비움)")
+    parser.add_argument("--warmup", type=int, default=1, help="측정 전 준비 실행 횟수")
+    parser.add_argument("--workers", type=int, default=1, help="동시에 스캔할 영상 수")
+    parser.add_argument("--local-model", action="store_true", help="학습된 로컬 모델 사용")
+    parser.add_argument("--gpt-latency", type=float, default=0.05, help="가짜 OpenAI 응답 지연(초)")
+    parser.add_argument("--gpt-jitter", type=float, default=0.0, help="응답 지연 ± 범위(초)")
+    parser.add_argument("--gpt-error-rate", type=float, default=0.0, help="429 / 500 응답 비율")
+    parser.add_argument("--yt-latency", type=float, default=0.0, help="가짜 YouTube 요청 지연(초)")
+    parser.add_argument("--db", choices=["record", "mysql"], default="record",
+                        help="record: SQL 문만 셈 / mysql: 버리는 DB에 실제 저장")
+    parser.add_argument("--db-name", default="youtube_bench", help="--db mysql 대상 (_bench로 끝나야 함)")
+    parser.add_argument("--db-keep", action="store_true", help="끝난 뒤 벤치마크 DB를 지우지 않음")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준값 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="시간 지표 허용 오차 (비율)")
+    parser.add_argument("--min-ms", type=float, default=2.0, help="이만큼(ms) 이상 늘어야 회귀로 봄")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--verbose", action="store_true", help="스캔 중 서버 로그 출력")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ 기준값 저장: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️ 기준값 없음 (--save-baseline으로 저장)")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("config") != report["config"]:
+        print("⚠️ 기준값과 실행 설정이 달라 비교하지 않습니다 (같은 옵션으로 실행하거나 기준값을 다시 저장)")
+        return 2
+
+    regressions = compare(report, baseline, args.tolerance, args.min_ms)
+    if not regressions:
+        print(f"✅ 기준값 대비 회귀 없음 (허용 오차 {args.tolerance:.0%})")
+        return 0
+    for name, old, new in regressions:
+        print(f"❌ 회귀: {name} {old} → {new}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,118 +1,214 @@
 // ==============================
-// 📊 Chart.js 인스턴스 저장용
+// 📊 관리자 대시보드
 // ==============================
-let chartInstance = null;
+// 통계는 서버 집계 API(/api/dashboard/*)에서 가져옴 (서버에서 짧게 캐시)
+let categoryChart = null;
+let timelineChart = null;
 
 // ==============================
-// 📌 대시보드 로드 함수
+// 📌 선택한 기간 (?days=N, 빈 값이면 전체)
 // ==============================
-function loadDashboard() {
-  // 🔹 fetchComments()에서 저장한 댓글 데이터 불러오기
-  const saved = localStorage.getItem("dashboardComments");
+function daysQuery() {
+  const select = document.getElementById("dashboard-days");
+  const days = select ? select.value : "";
+  return days ? `?days=${days}` : "";
+}
 
-  // 🔥 분석된 데이터가 없을 경우 방어
-  if (!saved) {
-    alert("분석된 댓글이 없습니다. 먼저 URL을 분석하세요.");
-    return;
+async function fetchJson(url) {
+  const response = await fetch(url);
+  if (!response.ok) throw new Error(`${url} → ${response.status}`);
+  return response.json();
+}
+
+// ==============================
+// 📌 대시보드 로드 (카드 / 차트 / 표를 동시에 요청)
+// ==============================
+async function loadDashboardStats() {
+  const query = daysQuery();
+  const timelineQuery = query ? `${query}&bucket=${query === "?days=1" ? "hour" : "day"}` : "?days=30";
+
+  try {
+    const [stats, timeline, videos, channels] = await Promise.all([
+      fetchJson(`/api/dashboard/stats${query}`),
+      fetchJson(`/api/dashboard/timeline${timelineQuery}`),
+      fetchJson(`/api/dashboard/videos${query}`),
+      fetchJson(`/api/dashboard/channels${query}`)
+    ]);
+
+    // 숫자 카드 채우기
+    document.getElementById("total-count").innerText = (stats.total || 0).toLocaleString();
+    document.getElementById("normal-count").innerText = (stats.normal || 0).toLocaleString();
+    document.getElementById("abuse-count").innerText = (stats.abuse || 0).toLocaleString();
+    document.getElementById("spam-count").innerText = (stats.spam || 0).toLocaleString();
+
+    updateCategoryChart(stats);
+    updateTimelineChart(timeline.timeline || []);
+    renderRows("video-stats", videos.videos || [], v => v.title || v.video_id);
+    renderRows("channel-stats", channels.channels || [], c => c.channel_name || c.channel_id);
+  } catch (error) {
+    console.error("데이터 로드 실패:", error);
   }
+}
 
-  // 🔹 문자열 → 객체 변환
-  const comments = JSON.parse(saved);
-
-  // ==============================
-  // 📊 카테고리 통계 초기화
-  // ==============================
-  let stats = {
-    정상: 0,
-    욕설: 0,
-    혐오: 0,
-    광고: 0,
-    위험: 0,
-    주의: 0
+// ==============================
+// 📈 카테고리 비율 차트
+// ==============================
+function updateCategoryChart(data) {
+  const ctx = document.getElementById("categoryChart").getContext("2d");
+
+  const chartData = {
+    labels: ["정상", "욕설/위험", "광고/스팸"],
+    datasets: [{
+      data: [data.normal || 0, data.abuse || 0, data.spam || 0],
+      backgroundColor: ["#10b981", "#fb7185", "#fbbf24"],
+      borderWidth: 0
+    }]
   };
 
-  // ==============================
-  // 📌 카테고리별 카운트
-  // ==============================
-  comments.forEach(c => {
-    const category = c.category || "정상"; // ⚠️ category 없을 때 대비
+  if (categoryChart) {
+    categoryChart.data = chartData;
+    categoryChart.update();
+  } else {
+    categoryChart = new Chart(ctx, {
+      type: "doughnut",
+      data: chartData,
+      options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: {
+          legend: { position: "bottom", labels: { color: "#cbd5e1" } }
+        }
+      }
+    });
+  }
+}
 
-    if (stats[category] !== undefined) {
-      stats[category]++;
-    }
-  });
+// ==============================
+// 📈 기간별 분석 건수 차트 (카테고리별 누적 막대)
+// ==============================
+function updateTimelineChart(rows) {
+  const ctx = document.getElementById("timelineChart").getContext("2d");
+
+  const chartData = {
+    labels: rows.map(r => r.bucket),
+    datasets: [
+      { label: "정상", data: rows.map(r => r.normal), backgroundColor: "#10b981" },
+      { label: "욕설/위험", data: rows.map(r => r.abuse), backgroundColor: "#fb7185" },
+      { label: "광고/스팸", data: rows.map(r => r.spam), backgroundColor: "#fbbf24" }
+    ]
+  };
 
-  // ==============================
-  // 📊 상단 카드 숫자 업데이트
-  // ==============================
-  document.getElementById("total-count").innerText = comments.length;
-  document.getElementById("normal-count").innerText = stats["정상"];
+  if (timelineChart) {
+    timelineChart.data = chartData;
+    timelineChart.update();
+  } else {
+    timelineChart = new Chart(ctx, {
+      type: "bar",
+      data: chartData,
+      options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        scales: {
+          x: { stacked: true, ticks: { color: "#94a3b8" } },
+          y: { stacked: true, ticks: { color: "#94a3b8" } }
+        },
+        plugins: {
+          legend: { position: "bottom", labels: { color: "#cbd5e1" } }
+        }
+      }
+    });
+  }
+}
 
-  // ⚠️ 위험도 높은 댓글은 합산
-  document.getElementById("abuse-count").innerText =
-    stats["욕설"] + stats["혐오"] + stats["위험"];
+// ==============================
+// 📋 영상 / 채널 표
+// ==============================
+function renderRows(tbodyId, rows, nameOf) {
+  const tbody = document.getElementById(tbodyId);
+  if (!tbody) return;
+  tbody.innerHTML = "";
 
-  document.getElementById("spam-count").innerText = stats["광고"];
+  if (rows.length === 0) {
+    tbody.innerHTML = `<tr><td colspan="4" class="py-2 text-slate-500">데이터 없음</td></tr>`;
+    return;
+  }
 
-  // ==============================
-  // 📈 차트 렌더링
-  // ==============================
-  renderChart(stats);
+  rows.forEach(row => {
+    const tr = document.createElement("tr");
+    tr.className = "border-t border-slate-800";
+    tr.innerHTML = `
+      <td class="py-2 pr-2 truncate max-w-xs"></td>
+      <td class="text-right">${row.total.toLocaleString()}</td>
+      <td class="text-right text-rose-400">${row.abuse.toLocaleString()}</td>
+      <td class="text-right text-amber-400">${row.spam.toLocaleString()}</td>
+    `;
+    tr.firstElementChild.textContent = nameOf(row);   // 제목은 텍스트로만 삽입
+    tbody.appendChild(tr);
+  });
 }
 
 // ==============================
-// 📈 차트 렌더링 함수
+// 🔍 분석 버튼: 스캔 작업 등록 후 완료될 때까지 진행률 폴링
 // ==============================
-function renderChart(stats) {
-  const ctx = document.getElementById("categoryChart");
+async function handleAnalyze() {
+  const urlInput = document.getElementById("youtube-url");
+  const btn = document.getElementById("analyze-btn");
+  const url = urlInput.value.trim();
 
-  // 🔄 기존 차트 제거 (중복 방지)
-  if (chartInstance) {
-    chartInstance.destroy();
+  if (!url) {
+    alert("유튜브 URL을 입력해주세요!");
+    return;
   }
 
-  chartInstance = new Chart(ctx, {
-    type: "doughnut",
-    data: {
-      labels: Object.keys(stats),
-      datasets: [{
-        data: Object.values(stats),
-
-        // 🎨 카테고리별 색상 (댓글 카드와 통일)
-        backgroundColor: [
-          "#16a34a", // 정상 (green)
-          "#ec4899", // 욕설 (pink)
-          "#7c3aed", // 혐오 (purple)
-          "#2563eb", // 광고 (blue)
-          "#dc2626", // 위험 (red)
-          "#facc15"  // 주의 (yellow)
-        ],
-        borderWidth: 0
-      }]
-    },
-    options: {
-      responsive: true,
-      maintainAspectRatio: false,
-      plugins: {
-        legend: {
-          position: "bottom",
-          labels: {
-            color: "#e5e7eb", // 글자색 (다크모드)
-            padding: 16
-          }
-        }
-      }
+  // 버튼 상태 변경
+  btn.innerText = "분석 중...";
+  btn.disabled = true;
+  btn.style.opacity = "0.5";
+
+  try {
+    const response = await fetch("/api/scans", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ url })
+    });
+    let scan = await response.json();
+
+    if (!response.ok) {
+      alert("에러: " + (scan.error || "분석에 실패했습니다."));
+      return;
     }
-  });
+
+    while (scan.status === "queued" || scan.status === "running") {
+      btn.innerText = `분석 중... ${scan.progress.percent}%`;
+      await new Promise(resolve => setTimeout(resolve, 1000));
+      scan = await (await fetch(`/api/scans/${scan.job_id}`)).json();
+    }
+
+    if (scan.status === "done") {
+      alert("분석 및 DB 저장이 완료되었습니다!");
+      await loadDashboardStats(); // 통계 갱신 (서버 캐시 TTL 이후 반영)
+      urlInput.value = "";
+    } else {
+      alert("에러: " + (scan.error || "분석에 실패했습니다."));
+    }
+  } catch (error) {
+    console.error("통신 에러:", error);
+    alert("서버와 통신할 수 없습니다.");
+  } finally {
+    btn.innerText = "분석 시작";
+    btn.disabled = false;
+    btn.style.opacity = "1";
+  }
 }
 
 // ==============================
-// 🖱️ 버튼 이벤트 연결
+// 🖱️ 이벤트 연결
 // ==============================
 document.addEventListener("DOMContentLoaded", () => {
-  const btn = document.getElementById("dashboard-btn");
+  loadDashboardStats();
 
-  if (btn) {
-    btn.addEventListener("click", loadDashboard);
+  const select = document.getElementById("dashboard-days");
+  if (select) {
+    select.addEventListener("change", loadDashboardStats);
   }
 });
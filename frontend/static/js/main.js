@@ -1,33 +1,4 @@
-async function fetchComments() {
-  const url = document.getElementById("youtube-url").value;
-  if (!url) {
-    alert("유튜브 URL을 입력하세요");
-    return;
-  }
-
-  const res = await fetch(`/api/comments?url=${encodeURIComponent(url)}`);
-  const data = await res.json();
-
-  // ==============================
-  // 🔥 API 에러 방어
-  // ==============================
-  if (!data.comments || !Array.isArray(data.comments)) {
-    alert(data.error || "댓글을 불러오지 못했습니다");
-    console.error(data);
-    return;
-  }
-
-  // ==============================
-  // ✅ 정상 데이터 분리
-  // ==============================
-  const comments = data.comments;
-  const summary = data.summary;
-
-  const list = document.getElementById("comment-list");
-  if (!list) return;
-  list.innerHTML = "";
-
-  // ==============================
+// ==============================
 // ✅ 카테고리별 색상 매핑
 // ==============================
 const categoryColorMap = {
@@ -36,20 +7,23 @@ const categoryColorMap = {
   "위험": "bg-red-600 text-white",
   "욕설": "bg-pink-600 text-white",
   "혐오": "bg-purple-700 text-white",
-  "광고": "bg-blue-600 text-white"
+  "광고": "bg-blue-600 text-white",
+  "스팸": "bg-blue-600 text-white",
+  "미분류": "bg-slate-400 text-white"
 };
 
-  // ==============================
-  // 댓글 렌더링
-  // ==============================
-  comments.forEach(c => {
-    const category = c.category || "정상";
+// ==============================
+// 댓글 카드 1개 렌더링
+// ==============================
+function renderComment(list, c) {
+  const category = c.category || "정상";
 
-    const card = document.createElement("div");
-    card.className = "comment-card";
+  const card = document.createElement("div");
+  // 답글은 부모 댓글 아래에 들여쓰기
+  card.className = c.isReply ? "comment-card ml-8 border-l-2 border-slate-600" : "comment-card";
 
-    card.innerHTML = `
-    <div class="font-bold mb-2">${c.author || "Unknown"}</div>
+  card.innerHTML = `
+    <div class="font-bold mb-2">${c.isReply ? "↳ " : ""}${c.author || "Unknown"}</div>
     <p class="text-slate-300 mb-3">"${c.text || ""}"</p>
     <span class="text-xs px-3 py-1 rounded-full ${
       categoryColorMap[category] || "bg-slate-600 text-white"
@@ -58,17 +32,76 @@ const categoryColorMap = {
     </span>
   `;
 
-    list.appendChild(card);
-  });
+  list.appendChild(card);
+}
+
+// ==============================
+// AI 요약 영역 업데이트
+// ==============================
+function renderSummary(summary, done) {
+  const summaryBox = document.getElementById("ai-summary");
+  if (!summaryBox) return;
+  summaryBox.classList.remove("hidden");
+
+  const text = `총 ${summary.total}개 댓글 중 ${summary.danger}개가 위험 댓글로 분류되었습니다.`;
+  document.getElementById("summary-text").innerText =
+    done ? text : `분석 중... ${text}`;
+}
+
+// ==============================
+// 스트리밍 API 호출 → 페이지가 도착할 때마다 렌더링
+// - 응답은 NDJSON (한 줄에 JSON 하나)
+// ==============================
+async function fetchComments() {
+  const url = document.getElementById("youtube-url").value;
+  if (!url) {
+    alert("유튜브 URL을 입력하세요");
+    return;
+  }
+
+  const res = await fetch(`/api/comments/stream?url=${encodeURIComponent(url)}`);
 
   // ==============================
-  // AI 요약 영역 업데이트
+  // 🔥 API 에러 방어
   // ==============================
-  const summaryBox = document.getElementById("ai-summary");
-  if (summaryBox) {
-    summaryBox.classList.remove("hidden");
+  if (!res.ok || !res.body) {
+    const data = await res.json().catch(() => ({}));
+    alert(data.error || "댓글을 불러오지 못했습니다");
+    console.error(data);
+    return;
+  }
+
+  const list = document.getElementById("comment-list");
+  if (!list) return;
+  list.innerHTML = "";
+
+  const summary = { total: 0, danger: 0 };
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  const handleEvent = event => {
+    if (event.type === "comments") {
+      event.comments.forEach(c => renderComment(list, c));
+      summary.total += event.comments.length;
+      summary.danger += event.comments.filter(c => c.category === "위험").length;
+      renderSummary(summary, false);
+    } else if (event.type === "done") {
+      renderSummary(event.summary, true);
+    } else if (event.type === "error") {
+      alert(event.error || "댓글 분석 중 오류가 발생했습니다");
+      console.error(event);
+    }
+  };
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
 
-    document.getElementById("summary-text").innerText =
-      `총 ${summary.total}개 댓글 중 ${summary.danger}개가 위험 댓글로 분류되었습니다.`;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split("\n");
+    buffer = lines.pop();   // 마지막 줄은 아직 덜 온 것일 수 있음
+    lines.filter(line => line.trim()).forEach(line => handleEvent(JSON.parse(line)));
   }
+  if (buffer.trim()) handleEvent(JSON.parse(buffer));
 }
@@ -15,6 +15,11 @@ from backend.app import api as backend_api
 # ==============================
 from backend.database import init_database
 
+# ==============================
+# 감시 영상 새 댓글 스케줄러
+# ==============================
+from backend.watch_scheduler import watch_scheduler, WATCH_SCHEDULER_ENABLED
+
 
 # ==============================
 # 메인 Flask 앱 생성
@@ -41,6 +46,22 @@ CORS(app)
 app.register_blueprint(backend_api)
 
 
+# ==============================
+# ⏰ 감시 스케줄러 시작
+# ==============================
+def start_watch_scheduler():
+    """
+    python run.py 로 실행할 때 감시 스케줄러 시작 (WATCH_SCHEDULER_ENABLED=1 일 때만)
+    - debug 리로더는 감시용 부모 + 실제 서버 자식 프로세스 2개를 띄우므로
+      자식 프로세스(WERKZEUG_RUN_MAIN=true)에서만 시작
+    - import 할 때는 시작하지 않음 (테스트 / 도구 / WSGI 워커마다 중복 실행 방지)
+      WSGI 서버로 띄울 때는 스케줄러 전용 프로세스 하나를 따로 실행:
+      WATCH_SCHEDULER_ENABLED=1 python -m backend.watch_scheduler
+    """
+    if WATCH_SCHEDULER_ENABLED and (not app.debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true"):
+        watch_scheduler.start()
+
+
 # ==============================
 # 서버 실행
 # ==============================
@@ -54,4 +75,6 @@ if __name__ == "__main__":
         print("서버는 계속 실행되지만 DB 저장 기능이 작동하지 않을 수 있습니다.")
     
     # 세션 테스트를 위해 debug=True 권장 (개발 단계)
-    app.run(host='0.0.0.0',debug=True, port=5000)
\ No newline at end of file
+    app.debug = True
+    start_watch_scheduler()
+    app.run(host='0.0.0.0',debug=app.debug, port=5000)
\ No newline at end of file
@@ -0,0 +1,16 @@
+# ==============================
+# 단위 테스트 공통 설정
+# ==============================
+# - backend 모듈을 import 하기 전에 환경변수를 정해야 함 (모듈 로드 시점에 읽음)
+# - MySQL / OpenAI / YouTube 없이 실행 (DB가 필요한 부분은 가짜 커서 사용)
+#     python -m pytest -q tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ["WATCH_SCHEDULER_ENABLED"] = "0"
+os.environ["CLASSIFY_CACHE_PATH"] = ""          # 디스크 분류 캐시 끔
+os.environ["LOCAL_MODEL_ENABLED"] = "0"
+os.environ.setdefault("YOUTUBE_API_KEY", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
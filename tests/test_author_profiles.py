@@ -0,0 +1,122 @@
+# ==============================
+# 작성자 누적 집계 (save_video_with_comments → _update_author_profiles)
+# ==============================
+# 댓글은 "버전이 있고 블랙리스트 판정이 아닌 분석 행"이 처음 생길 때 한 번만 집계
+# MySQL 대신 필요한 문장만 흉내 내는 메모리 DB를 database.pool 자리에 끼워 확인
+import pytest
+
+from backend import database
+from backend.comment_record import UNCLASSIFIED_CATEGORY, CommentRecord
+from backend.database import BLACKLIST_MODEL_VERSION, SQL_INSERT_ANALYSIS, SQL_UPSERT_AUTHOR, SQL_UPSERT_COMMENT
+
+
+class MemoryDB:
+
+    def __init__(self):
+        self.comment_pks = {}       # youtube_comment_id → comment_id
+        self.analyses = []          # (comment_id, category_id, model_version)
+        self.authors = {}           # user_id → [전체, 정상, 위험, 스팸]
+
+    def counted(self, youtube_comment_id) -> bool:
+        pk = self.comment_pks.get(youtube_comment_id)
+        return any(cid == pk and version is not None and version != BLACKLIST_MODEL_VERSION
+                   for cid, _, version in self.analyses)
+
+    # 풀 / 커넥션 / 커서 인터페이스
+    def acquire(self, timeout: float = None):
+        return self
+
+    def release(self, conn, broken: bool = False):
+        pass
+
+    def cursor(self):
+        return MemoryCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        raise AssertionError("저장이 롤백됨")
+
+
+class MemoryCursor:
+
+    def __init__(self, db: MemoryDB):
+        self.db = db
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=()):
+        self._rows = []
+        if sql.startswith("SELECT comment_id, youtube_comment_id FROM comments"):
+            self._rows = [{"comment_id": self.db.comment_pks[cid], "youtube_comment_id": cid}
+                          for cid in params if cid in self.db.comment_pks]
+        elif sql.startswith("SELECT DISTINCT c.youtube_comment_id"):
+            assert params[-1] == BLACKLIST_MODEL_VERSION
+            self._rows = [{"youtube_comment_id": cid} for cid in params[:-1] if self.db.counted(cid)]
+
+    def executemany(self, sql, rows):
+        if sql == SQL_UPSERT_COMMENT:
+            for row in rows:
+                self.db.comment_pks.setdefault(row[0], len(self.db.comment_pks) + 1)
+        elif sql == SQL_INSERT_ANALYSIS:
+            self.db.analyses.extend((row[0], row[1], row[4]) for row in rows)
+        elif sql == SQL_UPSERT_AUTHOR:
+            for row in rows:
+                totals = self.db.authors.setdefault(row[0], [0, 0, 0, 0])
+                for i in range(4):
+                    totals[i] += row[2 + i]
+
+    def fetchall(self):
+        return self._rows
+
+
+@pytest.fixture
+def db(monkeypatch):
+    memory = MemoryDB()
+    monkeypatch.setattr(database, "pool", memory)
+    return memory
+
+
+VIDEO = {"video_id": "v1", "title": "t", "channel_name": "c", "published_at": "2026-01-01T00:00:00Z"}
+
+
+def _record(comment_id, author, category="정상", model_version="gpt-4o-mini:v1", **kwargs):
+    return CommentRecord(comment_id, author, author, "text", 0, "2026-01-01T00:00:00Z",
+                         category=category, model_version=model_version, **kwargs)
+
+
+def test_counts_each_comment_once(db):
+    records = [_record("c1", "u1"), _record("c2", "u1", "위험"), _record("c3", "u2", "스팸")]
+    database.save_video_with_comments(VIDEO, records)
+    # 재스캔 / 재분석: 같은 댓글에 분석 행이 또 생겨도 다시 세지 않음
+    database.save_video_with_comments(VIDEO, records)
+    database.save_video_with_comments(VIDEO, [_record("c1", "u1", "위험", model_version="local-v2/n2")])
+    assert db.authors == {"u1": [2, 1, 1, 0], "u2": [1, 0, 0, 1]}
+
+
+def test_unclassified_comment_is_counted_when_classified_later(db):
+    database.save_video_with_comments(VIDEO, [_record("c1", "u1", UNCLASSIFIED_CATEGORY, model_version=None)])
+    assert db.authors == {}
+    database.save_video_with_comments(VIDEO, [_record("c1", "u1", "위험")])
+    database.save_video_with_comments(VIDEO, [_record("c1", "u1", "위험")])
+    assert db.authors == {"u1": [1, 0, 1, 0]}
+
+
+def test_blacklist_verdict_is_not_counted(db):
+    # 블랙리스트 판정은 작성자 때문에 붙은 판정 → 세지 않고, 나중에 실제 분류되면 그때 집계
+    database.save_video_with_comments(VIDEO, [_record("c1", "u1", "위험", model_version=BLACKLIST_MODEL_VERSION)])
+    assert db.authors == {}
+    database.save_video_with_comments(VIDEO, [_record("c1", "u1", "정상")])
+    assert db.authors == {"u1": [1, 1, 0, 0]}
+
+
+def test_reused_analysis_is_not_counted_again(db):
+    database.save_video_with_comments(VIDEO, [_record("c1", "u1", "스팸")])
+    database.save_video_with_comments(VIDEO, [_record("c1", "u1", "스팸", stored=True)])
+    assert db.authors == {"u1": [1, 0, 0, 1]}
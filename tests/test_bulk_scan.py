@@ -0,0 +1,96 @@
+# ==============================
+# 일괄 스캔 체크포인트 / 이어서 실행
+# ==============================
+import json
+
+import pytest
+
+from backend import bulk_scan
+from backend.bulk_scan import BulkScan, run_key
+from backend.youtube_quota import QuotaExceeded
+
+
+class FakeComments:
+    """영상 ID별 동작을 정해 둔 get_comments (호출 순서 기록)"""
+
+    def __init__(self, outcomes: dict = None):
+        self.outcomes = outcomes or {}
+        self.calls = []
+
+    def __call__(self, video_id, max_results, include_replies=None, on_page=None):
+        self.calls.append(video_id)
+        outcome = self.outcomes.get(video_id, "ok")
+        if isinstance(outcome, Exception):
+            raise outcome
+        result = {"summary": {"total": 10, "danger": 1}, "comments": []}
+        if outcome == "truncated":
+            result["truncated"] = "quota"
+        return result
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    comments = FakeComments()
+    monkeypatch.setattr(bulk_scan, "get_comments", comments)
+    return comments
+
+
+def _scan(tmp_path, videos, **kwargs):
+    # workers=1 → 목록 순서대로 실행 (중단 지점이 정해짐)
+    return BulkScan(videos=videos, workers=1, include_replies=False,
+                    checkpoint_path=str(tmp_path / "checkpoint.json"), **kwargs)
+
+
+def _statuses(tmp_path) -> dict:
+    with open(tmp_path / "checkpoint.json", encoding="utf-8") as f:
+        return {v: entry["status"] for v, entry in json.load(f)["videos"].items()}
+
+
+def test_resume_skips_only_done_videos(tmp_path, fake):
+    fake.outcomes = {"v2": RuntimeError("boom"), "v3": "truncated"}
+    report = _scan(tmp_path, ["v1", "v2", "v3", "v4"]).run()
+    # v3에서 할당량 때문에 일부만 받음 → 중단, v4는 시작하지 않음
+    assert report["status"] == "stopped"
+    assert fake.calls == ["v1", "v2", "v3"]
+    assert _statuses(tmp_path) == {"v1": "done", "v2": "failed", "v3": "partial"}
+    assert report["videos"] == {"total": 4, "skipped": 0, "scanned": 1, "partial": 1, "failed": 1, "remaining": 1}
+
+    fake.outcomes, fake.calls = {}, []
+    report = _scan(tmp_path, ["v1", "v2", "v3", "v4"]).run()
+    assert report["status"] == "done"
+    assert fake.calls == ["v2", "v3", "v4"]
+    assert report["videos"]["skipped"] == 1
+    assert _statuses(tmp_path) == {"v1": "done", "v2": "done", "v3": "done", "v4": "done"}
+
+
+def test_quota_exceeded_leaves_video_for_next_run(tmp_path, fake):
+    fake.outcomes = {"v2": QuotaExceeded("daily limit")}
+    report = _scan(tmp_path, ["v1", "v2", "v3"]).run()
+    assert report["status"] == "stopped"
+    assert fake.calls == ["v1", "v2"]
+    assert _statuses(tmp_path) == {"v1": "done"}
+
+    fake.outcomes, fake.calls = {}, []
+    _scan(tmp_path, ["v1", "v2", "v3"]).run()
+    assert fake.calls == ["v2", "v3"]
+
+
+def test_unreadable_checkpoint_starts_over(tmp_path, fake):
+    (tmp_path / "checkpoint.json").write_text("{\"videos\": {\"v1\"", encoding="utf-8")
+    report = _scan(tmp_path, ["v1", "v2"]).run()
+    assert report["status"] == "done"
+    assert fake.calls == ["v1", "v2"]
+
+
+def test_limit_applies_before_skipping(tmp_path, fake):
+    _scan(tmp_path, ["v1", "v2", "v3"], limit=2).run()
+    assert fake.calls == ["v1", "v2"]
+
+
+def test_run_key_depends_on_targets_and_settings():
+    base = run_key(videos=["a", "b"], max_results=100)
+    assert run_key(videos=["b", "a"], max_results=100) == base
+    assert run_key(videos=["a", "b"], max_results=200) != base
+    assert run_key(videos=["a", "b"], max_results=100, limit=1) != base
+    assert run_key(videos=["a", "b"], max_results=100, include_replies=True) != base
+    assert run_key(channels=["a", "b"], max_results=100) != base
@@ -0,0 +1,113 @@
+# ==============================
+# RuleMatcher ↔ 예전 로컬 필터 3종 동치 확인
+# ==============================
+# 예전 구현(정규식 / 단어 목록을 하나씩 검사)을 그대로 옮겨 두고
+# 같은 댓글에 대해 카테고리 / 이유가 같은지 비교 ("rule" 키는 새로 생긴 필드라 제외)
+import re
+
+import pytest
+
+from backend.filter_engine import KIND_AD, KIND_BADWORD, KIND_POSITIVE, RULES_PATH, RuleMatcher, load_rules
+from bench import fixtures
+
+BAD_WORD_PATTERNS = [
+    r"씨\s*발", r"ㅅ\s*ㅂ", r"병\s*신", r"ㅂ\s*ㅅ",
+    r"좆", r"미\s*친", r"지\s*랄", r"개\s*새끼", r"염병",
+    r"꺼\s*져", r"죽\s*어"
+]
+AD_PATTERNS = [
+    r"http[s]?://[^\s]+", r"www\.[^\s]+",
+    r"\d{2,4}-\d{3,4}-\d{4}", r"010-?\d{4}-?\d{4}",
+    r"카톡\s*문의", r"텔레그램", r"인스타\s*@"
+]
+POSITIVE_WORDS = ["ㅋㅋㅋ", "ㅎㅎㅎ", "좋아", "귀여워", "최고", "감사", "응원", "👍", "❤️"]
+NEGATIVE_WORDS = ["죽", "꺼져", "싫어", "최악", "쓰레기", "혐오", "무식"]
+
+
+def legacy_badword_filter(text: str):
+    for pattern in BAD_WORD_PATTERNS:
+        if re.search(pattern, text):
+            return {"category": "위험", "reason": "욕설 패턴 감지"}
+    return None
+
+
+def legacy_ad_filter(text: str):
+    for pattern in AD_PATTERNS:
+        if re.search(pattern, text):
+            return {"category": "스팸", "reason": "광고/홍보 의심"}
+    return None
+
+
+def legacy_fast_filter(text: str):
+    stripped = text.strip()
+    if len(stripped) <= 3 and not any(char.isalnum() for char in stripped):
+        return {"category": "정상", "reason": "이모티콘 반응"}
+    if any(word in stripped for word in NEGATIVE_WORDS):
+        return None
+    if any(word in stripped for word in POSITIVE_WORDS) and len(stripped) >= 5:
+        return {"category": "정상", "reason": "긍정적 반응"}
+    return None
+
+
+def legacy_filter(text: str):
+    return legacy_badword_filter(text) or legacy_ad_filter(text) or legacy_fast_filter(text)
+
+
+def _without_rule(result):
+    return None if result is None else {k: v for k, v in result.items() if k != "rule"}
+
+
+EDGE_CASES = [
+    "", "   ", "ㅋ", "👍", "👍👍👍", "❤️", " ❤️ ", "!!!", "a", "굿",
+    "씨발", "씨   발", "개새끼야", "미친 거 아냐?", "이거 진짜 미친 영상 최고 👍",
+    "꺼져", "꺼 져", "죽어라", "죽이는 노래 최고 ㅋㅋㅋ", "너무 좋아요 감사합니다",
+    "좋아", "좋아요!", "최악이지만 감사", "https://spam.example/x", "www.example.com 방문",
+    "문의 010-1234-5678", "01012345678 연락", "02-123-4567", "카톡 문의 주세요", "카톡문의",
+    "텔레그램 @abc", "인스타 @abc", "인스타@abc 최고", "병신 http://x.y",
+    "ㅋㅋㅋㅋㅋㅋㅋ", "ㅎㅎㅎ 귀여워", "응원합니다!!", "혐오스럽다", "무식하네 ㅋㅋㅋ",
+    "쓰레기 같은 영상 최고", "ㅅㅂ", "ㅂ ㅅ", "지랄하네", "염병", "좆같네",
+    "Great video 👍", "1000000원", "2024-01-01 최고", "010-12-3456",
+]
+
+
+def _corpus():
+    texts = list(EDGE_CASES)
+    for video in fixtures.synthetic_videos(2, 500, seed=3, replies=True):
+        for thread in video["threads"]:
+            texts.append(thread["snippet"]["topLevelComment"]["snippet"]["textOriginal"])
+        for replies in video["replies"].values():
+            texts.extend(reply["snippet"]["textOriginal"] for reply in replies)
+    return texts
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return RuleMatcher(BAD_WORD_PATTERNS, AD_PATTERNS, POSITIVE_WORDS, NEGATIVE_WORDS, version="test")
+
+
+@pytest.mark.parametrize("text", EDGE_CASES)
+def test_match_equals_legacy_filters_on_edge_cases(matcher, text):
+    assert _without_rule(matcher.match(text)) == legacy_filter(text)
+
+
+def test_match_equals_legacy_filters_on_synthetic_comments(matcher):
+    mismatches = [
+        (text, matcher.match(text), legacy_filter(text))
+        for text in _corpus()
+        if _without_rule(matcher.match(text)) != legacy_filter(text)
+    ]
+    assert mismatches == []
+
+
+def test_rules_file_matches_legacy_lists():
+    # filter_rules.json은 예전 하드코딩 목록을 그대로 옮긴 것 (판정이 바뀌면 버전을 올려야 함)
+    shipped = load_rules(RULES_PATH)
+    legacy = RuleMatcher(BAD_WORD_PATTERNS, AD_PATTERNS, POSITIVE_WORDS, NEGATIVE_WORDS)
+    assert shipped.rules == legacy.rules
+
+
+def test_scan_reports_first_rule_per_kind(matcher):
+    found = matcher.scan("씨발 카톡 문의 최고")
+    assert found[KIND_BADWORD] == "badword:씨\\s*발"
+    assert found[KIND_AD] == "ad:카톡\\s*문의"
+    assert found[KIND_POSITIVE] == "positive:최고"
@@ -0,0 +1,96 @@
+# ==============================
+# 스캔 작업 중복 실행 방지 (ScanManager.submit)
+# ==============================
+import threading
+
+import pytest
+
+from backend import scan_jobs
+from backend.scan_jobs import ScanManager, ScanQueueFull
+from backend.youtube_api import YT_INCLUDE_REPLIES
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    """get_comments가 gate.set() 전까지 멈춰 있음 (작업이 '진행 중'으로 남도록)"""
+    event = threading.Event()
+    calls = []
+
+    def fake_get_comments(video_id, max_results, on_page=None, include_replies=None):
+        calls.append((video_id, max_results, include_replies))
+        event.wait(5)
+        return {"video_info": {"video_id": video_id}, "comments": []}
+
+    monkeypatch.setattr(scan_jobs, "get_comments", fake_get_comments)
+    event.calls = calls
+    event.managers = []
+    yield event
+    # 남은 작업을 가짜 get_comments로 모두 끝낸 뒤 monkeypatch 해제
+    event.set()
+    for manager in event.managers:
+        manager._queue.join()
+
+
+def _manager(gate, queue_size: int = 10) -> ScanManager:
+    manager = ScanManager(workers=1, queue_size=queue_size)
+    gate.managers.append(manager)
+    return manager
+
+
+def _wait_finished(job):
+    for _ in range(500):
+        if not job.active:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f"작업이 끝나지 않음: {job.status}")
+
+
+def test_same_request_returns_active_job(gate):
+    manager = _manager(gate)
+    job, created = manager.submit("v1", 100, True)
+    again, created_again = manager.submit("v1", 100, True)
+    assert created and not created_again
+    assert again is job
+
+
+def test_different_settings_create_new_jobs(gate):
+    manager = _manager(gate)
+    base, _ = manager.submit("v1", 100, False)
+    more, created_more = manager.submit("v1", 500, False)
+    replies, created_replies = manager.submit("v1", 100, True)
+    other, created_other = manager.submit("v2", 100, False)
+    assert created_more and created_replies and created_other
+    assert len({base.job_id, more.job_id, replies.job_id, other.job_id}) == 4
+
+
+def test_default_replies_flag_matches_server_default(gate):
+    manager = _manager(gate)
+    job, _ = manager.submit("v1", 100)
+    same, created = manager.submit("v1", 100, YT_INCLUDE_REPLIES)
+    assert same is job and not created
+
+
+def test_finished_job_is_not_reused(gate):
+    manager = _manager(gate)
+    job, _ = manager.submit("v1", 100, False)
+    gate.set()
+    _wait_finished(job)
+    assert job.status == "done"
+    again, created = manager.submit("v1", 100, False)
+    assert created and again is not job
+    _wait_finished(again)
+    assert gate.calls == [("v1", 100, False), ("v1", 100, False)]
+
+
+def test_full_queue_rejects_new_scans(gate):
+    manager = _manager(gate, queue_size=1)
+    first, _ = manager.submit("v1", 100, False)
+    for _ in range(500):        # 워커가 첫 작업을 꺼내 갈 때까지 대기
+        if first.status == "running":
+            break
+        threading.Event().wait(0.01)
+    manager.submit("v2", 100, False)
+    with pytest.raises(ScanQueueFull):
+        manager.submit("v3", 100, False)
+    # 대기 중인 같은 요청은 대기열이 가득 차도 기존 작업을 돌려줌
+    assert manager.submit("v2", 100, False)[1] is False
@@ -0,0 +1,54 @@
+# ==============================
+# text_normalizer 정규화 결과
+# ==============================
+import pytest
+
+from backend.filter_engine import KIND_AD, KIND_BADWORD, load_rules, RULES_PATH
+from backend.text_normalizer import REGRESSION_CASES, normalize_text
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return load_rules(RULES_PATH)
+
+
+@pytest.mark.parametrize("text, expected, is_ad", REGRESSION_CASES)
+def test_regression_cases(matcher, text, expected, is_ad):
+    normalized = normalize_text(text)
+    assert normalized == expected
+    assert (KIND_AD in matcher.scan(normalized)) == is_ad
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", ""),
+    ("hello world", "hello world"),
+    ("씨​발", "씨발"),                   # 폭 없는 공백
+    ("씨ㅤ발", "씨발"),                   # 한글 채움 문자
+    ("씨...발", "씨발"),                      # 구두점 3글자까지
+    ("씨-_-발", "씨발"),
+    ("씨....발", "씨...발"),                  # 4글자 이상은 제거 안 함 (반복만 3개로 줄임)
+    ("ㅂㅕㅇㅅㅣㄴ", "병신"),                 # 낱자 조합 (받침 포함)
+    ("ｗｗｗ．ｓｐａｍ", "www.spam"),         # 전각 → 반각
+    ("ＨＥＬＬＯ", "hello"),
+    ("ㅋㅋㅋㅋㅋㅋㅋㅋ", "ㅋㅋㅋ"),
+    ("와아아아아아", "와아아아"),             # 같은 글자 4번 이상만 3번으로
+    ("n00b", "noob"),
+    ("h77p", "http"),
+    ("1000000", "1000000"),                   # 숫자 반복은 유지
+    ("a 2024 b", "a 2024 b"),
+    ("😂😂😂😂😂", "😂😂😂"),
+])
+def test_normalize_text(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize("text", ["ㅆㅣㅂㅏㄹ", "씨.발", "씨​발", "ㅆ ㅣ ㅂ ㅏ ㄹ 아니고 씨 발"])
+def test_obfuscated_badwords_hit_rules(matcher, text):
+    assert KIND_BADWORD in matcher.scan(normalize_text(text))
+
+
+def test_normalize_text_is_idempotent():
+    samples = [text for text, _, _ in REGRESSION_CASES] + ["ｗｗｗ．ｓｐａｍ ㅋㅋㅋㅋ", "ㅂㅕㅇㅅㅣㄴ n00b"]
+    for text in samples:
+        once = normalize_text(text)
+        assert normalize_text(once) == once
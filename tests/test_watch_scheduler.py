@@ -0,0 +1,58 @@
+# ==============================
+# 감시 영상 확인 간격 (next_interval / _poll)
+# ==============================
+import pytest
+
+from backend import watch_scheduler as ws
+from backend.watch_scheduler import (
+    WATCH_BACKOFF, WATCH_MAX_INTERVAL, WATCH_MIN_INTERVAL, WATCH_TARGET_NEW, WatchScheduler, next_interval
+)
+
+
+def test_interval_targets_new_comments_per_poll():
+    # 1000초에 100개 → 초당 0.1개 → TARGET_NEW개가 쌓이는 간격
+    expected = int(WATCH_TARGET_NEW / 0.1)
+    assert WATCH_MIN_INTERVAL <= expected <= WATCH_MAX_INTERVAL
+    assert next_interval(1800, 100, 1000) == expected
+
+
+def test_interval_backs_off_without_new_comments():
+    assert next_interval(1000, 0, 1000) == int(1000 * WATCH_BACKOFF)
+
+
+def test_interval_is_clamped():
+    assert next_interval(1800, 10 ** 6, 1) == WATCH_MIN_INTERVAL
+    assert next_interval(1800, 1, 10 ** 7) == WATCH_MAX_INTERVAL
+    assert next_interval(WATCH_MAX_INTERVAL, 0, 10) == WATCH_MAX_INTERVAL
+    assert next_interval(0, 0, 0) == WATCH_MIN_INTERVAL
+
+
+def test_interval_without_elapsed_backs_off():
+    # 걸린 시간을 모르면 속도를 계산하지 않음 (0으로 나누지 않음)
+    assert next_interval(1000, 5, 0) == int(1000 * WATCH_BACKOFF)
+
+
+def test_interval_is_int():
+    assert isinstance(next_interval(1234.5, 3, 777.7), int)
+
+
+@pytest.mark.parametrize("since_last_poll, expected_elapsed", [
+    (1000, 1000),       # DB가 계산한 TIMESTAMPDIFF
+    (-5, 0),            # 시계가 어긋나도 음수가 되지 않음
+    (None, 1800),       # 처음 확인하는 영상 → 직전 간격
+])
+def test_poll_uses_elapsed_from_db(monkeypatch, since_last_poll, expected_elapsed):
+    calls, updates = [], []
+    monkeypatch.setattr(ws, "poll_new_comments", lambda video_id, since, limit: {
+        "comments": [{"publishedAt": "2026-01-01T00:00:01Z"}] * 100,
+        "high_water_mark": "2026-01-01T00:00:01Z"
+    })
+    monkeypatch.setattr(ws, "next_interval", lambda interval, new_count, elapsed: calls.append(elapsed) or 600)
+    monkeypatch.setattr(ws, "update_watch", lambda *args: updates.append(args))
+
+    scheduler = WatchScheduler(tick=1, workers=1)
+    scheduler._poll({"video_id": "v1", "high_water_mark": None, "poll_interval": 1800,
+                     "since_last_poll": since_last_poll})
+    assert calls == [expected_elapsed]
+    assert updates == [("v1", "2026-01-01T00:00:01Z", 600, 100)]
+    assert scheduler.new_comments == 100